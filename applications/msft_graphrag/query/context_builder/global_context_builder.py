@@ -5,12 +5,19 @@
 # Permission is granted to use, copy, modify, and distribute this software
 # under the License. The software is provided "AS IS", without warranty.
 
+import json
+import logging
 import tiktoken
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
+import numpy as np
+import pandas as pd
 
-from tigergraphx.graphrag import BaseContextBuilder
+from tigergraphx.graphrag import BaseContextBuilder, ContextCache
 
 from tigergraphx.core import Graph
+from tigergraphx.vector_search import BaseSearchEngine
+
+logger = logging.getLogger(__name__)
 
 
 class GlobalContextBuilder(BaseContextBuilder):
@@ -18,24 +25,46 @@ class GlobalContextBuilder(BaseContextBuilder):
         self,
         graph: Graph,
         token_encoder: Optional[tiktoken.Encoding] = None,
+        context_cache: Optional[ContextCache] = None,
+        data_version: Optional[str] = None,
+        search_engine: Optional[BaseSearchEngine] = None,
     ):
-        """Initialize LocalContextBuilder with graph config and token encoder."""
+        """
+        Initialize GlobalContextBuilder with graph config and token encoder.
+
+        The community batches only change when the graph is reindexed, so they
+        are built once and kept in the context cache until the data version
+        changes or `invalidate_context` is called. The embedding model of the
+        search engine is used for dynamic community selection.
+        """
         super().__init__(
             graph=graph,
             single_batch=False,
+            search_engine=search_engine,
             token_encoder=token_encoder,
         )
+        self.context_cache = context_cache or ContextCache()
+        self.data_version = data_version
+        self._communities: Optional[
+            Tuple[Optional[str], pd.DataFrame, Dict[str, List[str]]]
+        ] = None
+        self._summary_embeddings: Dict[str, np.ndarray] = {}
+
+    def invalidate_context(self) -> None:
+        """Drop the cached community batches, e.g. after the graph data changed."""
+        self.context_cache.invalidate(self._cache_key())
+        self._communities = None
+        self._summary_embeddings.clear()
 
     async def build_context(self) -> str | List[str]:
-        """Build local context."""
-        context: List[str] = []
+        """Build global context from the cached community batches."""
+        cache_key = self._cache_key()
+        cached_context = self.context_cache.get(cache_key, self.data_version)
+        if cached_context is not None:
+            return cached_context
 
-        config = {
-            "max_tokens": 12000,
-            "section_name": "Communities",
-            "return_attributes": ["id", "rank", "title", "full_content"],
-            "limit": 1000,
-        }
+        context: List[str] = []
+        config = self._config()
         df = self.graph.get_nodes(
             node_type="Community",
             return_attributes=config["return_attributes"],
@@ -51,5 +80,220 @@ class GlobalContextBuilder(BaseContextBuilder):
             context.extend(
                 text_context if isinstance(text_context, list) else [text_context]
             )
+            # Failed queries return None and are never cached
+            self.context_cache.set(cache_key, context, self.data_version)
 
         return context
+
+    async def build_dynamic_context(
+        self,
+        query: str,
+        relevance_threshold: float = 0.25,
+        max_communities: int = 50,
+        keep_parents: bool = False,
+    ) -> List[str]:
+        """
+        Build global context from the communities relevant to the query only.
+
+        The community hierarchy is walked top-down, from the lowest level. The
+        communities of a level are rated by the similarity of their summary
+        embeddings to the query embedding, and only the children of relevant
+        communities are rated on the next level. A child belongs to a parent if
+        they share entities; the memberships are fetched once with the
+        communities.
+
+        Args:
+            query: The query string.
+            relevance_threshold: Minimum cosine similarity of a relevant community.
+            max_communities: Maximum number of communities in the context.
+            keep_parents: Whether to keep relevant communities whose children are
+                relevant too.
+
+        Returns:
+            The context batches of the selected communities.
+
+        Raises:
+            ValueError: If the search engine is not initialized.
+        """
+        if not self.search_engine:
+            raise ValueError("Search engine is not initialized.")
+        communities, children = self._get_communities()
+        if communities.empty or not query:
+            return []
+
+        embedding_model = self.search_engine.embedding_model
+        query_embedding = np.asarray(
+            await embedding_model.generate_embedding(query), dtype=np.float32
+        )
+        top_level = communities["level"].min()
+        # Candidates of a level, mapped to their relevant parents
+        candidates: Dict[str, List[str]] = {
+            community_id: []
+            for community_id in communities.loc[
+                communities["level"] == top_level, "id"
+            ]
+        }
+        similarities: Dict[str, float] = {}
+        parents_with_relevant_children = set()
+        while candidates:
+            rated = await self._rate_communities(
+                communities, list(candidates), query_embedding
+            )
+            relevant = [
+                community_id
+                for community_id, similarity in rated.items()
+                if similarity >= relevance_threshold
+            ]
+            logger.info(
+                f"{len(relevant)} of {len(candidates)} communities are relevant."
+            )
+            next_candidates: Dict[str, List[str]] = {}
+            for community_id in relevant:
+                similarities[community_id] = rated[community_id]
+                parents_with_relevant_children.update(candidates[community_id])
+                for child_id in children.get(community_id, []):
+                    next_candidates.setdefault(child_id, []).append(community_id)
+            candidates = next_candidates
+
+        if not keep_parents:
+            for parent_id in parents_with_relevant_children:
+                similarities.pop(parent_id, None)
+        if not similarities:
+            return []
+        selected_ids = sorted(similarities, key=similarities.__getitem__, reverse=True)[
+            :max_communities
+        ]
+        config = self._config()
+        selected = communities[communities["id"].isin(selected_ids)].sort_values(
+            "rank", ascending=False
+        )
+        batches = self.batch_and_convert_to_text(
+            graph_data=selected[config["return_attributes"]],
+            max_tokens=config["max_tokens"],
+            single_batch=False,
+            section_name=config["section_name"],
+        )
+        return batches if isinstance(batches, list) else [batches]
+
+    def _get_communities(self) -> Tuple[pd.DataFrame, Dict[str, List[str]]]:
+        """
+        Return the communities with their level and summary, and the children of
+        every community, cached until the data version changes.
+        """
+        if self._communities is not None and self._communities[0] == self.data_version:
+            return self._communities[1], self._communities[2]
+        config = self._config()
+        df = self.graph.get_nodes(
+            node_type="Community",
+            return_attributes=[*config["return_attributes"], "level", "summary"],
+            limit=config["limit"],
+        )
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            return pd.DataFrame(), {}
+        # All community memberships are fetched at once, instead of walking the
+        # edges of every relevant community during the search
+        memberships = self.graph.get_edges(
+            source_node_types="Community",
+            edge_types="community_contains_entity",
+            target_node_types="Entity",
+        )
+        if not isinstance(memberships, pd.DataFrame) or memberships.empty:
+            memberships = pd.DataFrame(columns=["s", "t"])
+        children = self._get_community_children(
+            df, memberships.rename(columns={"s": "community", "t": "entity"})
+        )
+        self._communities = (self.data_version, df, children)
+        self._summary_embeddings.clear()
+        return df, children
+
+    @staticmethod
+    def _get_community_children(
+        communities: pd.DataFrame, memberships: pd.DataFrame
+    ) -> Dict[str, List[str]]:
+        """
+        Map every community to the communities of the next level that share
+        entities with it. The imported schema has no edges between the levels,
+        and a child community contains a subset of the entities of its parent.
+
+        Args:
+            communities: The communities, with the columns `id` and `level`.
+            memberships: The entities of the communities, with the columns
+                `community` and `entity`.
+
+        Returns:
+            The IDs of the children of every community that has children.
+        """
+        levels = communities.set_index("id")["level"]
+        memberships = memberships[memberships["community"].isin(levels.index)]
+        memberships = memberships.assign(
+            level=memberships["community"].map(levels).astype(int)
+        )
+        parents = memberships.assign(level=memberships["level"] + 1)
+        links = parents.merge(
+            memberships, on=["entity", "level"], suffixes=("_parent", "_child")
+        )[["community_parent", "community_child"]].drop_duplicates()
+        children: Dict[str, List[str]] = {}
+        for parent_id, child_id in links.itertuples(index=False):
+            children.setdefault(parent_id, []).append(child_id)
+        return children
+
+    async def _rate_communities(
+        self,
+        communities: pd.DataFrame,
+        community_ids: List[str],
+        query_embedding: np.ndarray,
+    ) -> Dict[str, float]:
+        """
+        Return the cosine similarity of the summary of every community to the
+        query. Summary embeddings are generated once and cached.
+        """
+        missing_ids = [
+            community_id
+            for community_id in community_ids
+            if community_id not in self._summary_embeddings
+        ]
+        if missing_ids and self.search_engine:
+            summaries = communities.set_index("id").loc[missing_ids, "summary"]
+            embeddings = await self.search_engine.embedding_model.generate_embeddings(
+                summaries.fillna("").astype(str).tolist()
+            )
+            for community_id, embedding in zip(missing_ids, embeddings):
+                if embedding.size > 0 and np.all(np.isfinite(embedding)):
+                    self._summary_embeddings[community_id] = embedding
+
+        rated_ids = [
+            community_id
+            for community_id in community_ids
+            if community_id in self._summary_embeddings
+        ]
+        if not rated_ids:
+            return {}
+        matrix = np.stack([self._summary_embeddings[i] for i in rated_ids])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            similarities = (matrix @ query_embedding) / (
+                np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_embedding)
+            )
+        return dict(zip(rated_ids, np.nan_to_num(similarities, nan=-1.0).tolist()))
+
+    @staticmethod
+    def _config() -> dict:
+        return {
+            "max_tokens": 12000,
+            "section_name": "Communities",
+            "return_attributes": ["id", "rank", "title", "full_content"],
+            "limit": 1000,
+        }
+
+    def _cache_key(self) -> str:
+        """
+        Key the batches by the graph and by everything that shapes them.
+        """
+        return json.dumps(
+            {
+                "graph": self.graph.name,
+                "context": "global_communities",
+                "encoding": self.token_encoder.name,
+                **self._config(),
+            },
+            sort_keys=True,
+        )
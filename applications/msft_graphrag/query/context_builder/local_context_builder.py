@@ -13,6 +13,10 @@ from tigergraphx.graphrag import BaseContextBuilder
 from tigergraphx.core import Graph
 from tigergraphx.vector_search import BaseSearchEngine
 
+# Lower bound on the tokens of a row, used to cap the number of nodes fetched for
+# sections without stored token counts
+_MIN_ROW_TOKENS = 30
+
 
 class LocalContextBuilder(BaseContextBuilder):
     def __init__(
@@ -33,11 +37,6 @@ class LocalContextBuilder(BaseContextBuilder):
         """Build local context."""
         context: List[str] = []
 
-        # Retrieve top-k objects
-        top_k_objects: List[str] = await self.retrieve_top_k_objects(query, k=k)
-        if not top_k_objects:
-            return ""  # Return early if no objects are retrieved
-
         # Define neighbor types with their attributes
         neighbor_types = [
             {
@@ -45,6 +44,8 @@ class LocalContextBuilder(BaseContextBuilder):
                 "max_tokens": 1200,
                 "section_name": "Communities",
                 "return_attributes": ["id", "title", "full_content"],
+                "order_by": "rank",
+                "limit": 1200 // _MIN_ROW_TOKENS,
             },
             {
                 "target_node_types": "Relationship",
@@ -56,29 +57,56 @@ class LocalContextBuilder(BaseContextBuilder):
                     "weight",
                     "rank",
                 ],
+                "order_by": "rank",
+                "limit": 4800 // _MIN_ROW_TOKENS,
             },
             {
                 "target_node_types": "TextUnit",
                 "max_tokens": 6000,
                 "section_name": "Text Units",
-                "return_attributes": ["id", "text"],
+                "return_attributes": ["id", "text", "n_tokens"],
+                # Token counts of the texts precomputed at ingest time. Text units
+                # have no ranking attribute, so the server fills the budget with
+                # the reached text units in an arbitrary order
+                "token_count_columns": {"text": "n_tokens"},
+                "token_count_attribute": "n_tokens",
             },
         ]
 
+        # Retrieve the neighbors of the top-k objects in one round trip, ranked
+        # and cut off at the limit or token budget of their section on the server
+        neighborhoods = await self.retrieve_top_k_neighborhoods(
+            query,
+            expansions=[
+                {
+                    "name": neighbor["section_name"],
+                    "target_node_type_set": {neighbor["target_node_types"]},
+                    "return_attributes": neighbor["return_attributes"],
+                    "order_by": neighbor.get("order_by"),
+                    "limit": neighbor.get("limit"),
+                    "token_count_attribute": neighbor.get("token_count_attribute"),
+                    "max_tokens": (
+                        neighbor["max_tokens"]
+                        if "token_count_attribute" in neighbor
+                        else None
+                    ),
+                }
+                for neighbor in neighbor_types
+            ],
+            start_node_type="Entity",
+            k=k,
+        )
+
         # Iterate over different neighbor types
         for neighbor in neighbor_types:
-            df = self.graph.get_neighbors(
-                start_nodes=top_k_objects,
-                start_node_type="Entity",
-                target_node_types=neighbor["target_node_types"],
-                return_attributes=neighbor["return_attributes"],
-            )
-            if df is not None:
+            df = neighborhoods.get(neighbor["section_name"])
+            if df is not None and not df.empty:
                 text_context = self.batch_and_convert_to_text(
                     graph_data=df,
                     max_tokens=neighbor["max_tokens"],
                     single_batch=self.single_batch,
                     section_name=neighbor["section_name"],
+                    token_count_columns=neighbor.get("token_count_columns"),
                 )
                 context.extend(
                     text_context if isinstance(text_context, list) else [text_context]
@@ -7,7 +7,7 @@
 
 import logging
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, Optional
 import asyncio
 import json
 
@@ -19,6 +19,8 @@ from .context_builder import (
 
 from tigergraphx import Graph
 from tigergraphx.factories import create_openai_components
+from tigergraphx.graphrag import ContextCache
+from tigergraphx.llm import BaseChat, CachedChat
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,10 @@ class QueryParam:
     only_need_context: bool = False
     response_type: str = "Multiple Paragraphs"
     top_k: int = 20
+    # Only map-reduce the communities relevant to the query in global search
+    dynamic_community_selection: bool = False
+    relevance_threshold: float = 0.25
+    max_communities: int = 50
 
 
 @dataclass
@@ -39,6 +45,13 @@ class GraphRAG:
     )
     settings_path: str = "applications/msft_graphrag/query/resources/settings.yaml"
     to_load_data: bool = True
+    # Directory to persist the global search context batches in across restarts.
+    # Loading data clears the persisted batches unless a data_version is given:
+    # the batches are then kept for that version, and a new version rebuilds them.
+    context_cache_dir: Optional[str] = None
+    data_version: Optional[str] = None
+    # Directory to cache chat responses in, so repeated prompts skip the API
+    chat_cache_dir: Optional[str] = None
 
     def __post_init__(self):
         logger.info(
@@ -60,11 +73,23 @@ class GraphRAG:
             )
             graph.load_data(loading_job_config=self.loading_job_path)
         # Create Context Builders
-        (self.openai_chat, search_engine) = create_openai_components(self.settings_path, graph)
+        (openai_chat, search_engine) = create_openai_components(self.settings_path, graph)
+        self.openai_chat: BaseChat = openai_chat
+        if self.chat_cache_dir is not None:
+            self.openai_chat = CachedChat(openai_chat, cache_dir=self.chat_cache_dir)
         self.local_context_builder = LocalContextBuilder(
             graph=graph, search_engine=search_engine
         )
-        self.global_context_builder = GlobalContextBuilder(graph=graph)
+        self.global_context_builder = GlobalContextBuilder(
+            graph=graph,
+            context_cache=ContextCache(self.context_cache_dir),
+            data_version=self.data_version,
+            search_engine=search_engine,
+        )
+        if self.to_load_data and self.data_version is None:
+            # Without a data version, the loaded data may differ from the data the
+            # cached community batches were built from
+            self.global_context_builder.invalidate_context()
 
     def query(self, query: str, param: QueryParam = QueryParam()):
         logger.info("Executing query with parameters: %s", param)
@@ -140,7 +165,14 @@ class GraphRAG:
 
         logger.info("Performing global query.")
         # Retrieve context using the global context builder
-        context_list = await self.global_context_builder.build_context()
+        if query_param.dynamic_community_selection:
+            context_list = await self.global_context_builder.build_dynamic_context(
+                query,
+                relevance_threshold=query_param.relevance_threshold,
+                max_communities=query_param.max_communities,
+            )
+        else:
+            context_list = await self.global_context_builder.build_context()
 
         # Handle case where only the context is needed
         if query_param.only_need_context:
@@ -0,0 +1,222 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+import numpy as np
+import pandas as pd
+
+from tigergraphx.graphrag import ContextCache
+
+from applications.msft_graphrag.query.context_builder import GlobalContextBuilder
+
+
+class FakeEncoding:
+    """A token encoder with one token per character."""
+
+    name = "fake"
+
+    def encode(self, text, **kwargs):
+        return list(text.encode("utf-8"))
+
+    def encode_batch(self, texts, **kwargs):
+        return [self.encode(text) for text in texts]
+
+    def decode(self, tokens):
+        return bytes(tokens).decode("utf-8")
+
+
+# Level 0: a, b; level 1: a1 and a2 below a, b1 below b; level 2: a1x below a1
+COMMUNITIES = pd.DataFrame(
+    {
+        "id": ["a", "b", "a1", "a2", "b1", "a1x"],
+        "rank": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        "title": ["A", "B", "A1", "A2", "B1", "A1X"],
+        "full_content": ["content"] * 6,
+        "level": [0, 0, 1, 1, 1, 2],
+        "summary": ["sa", "sb", "sa1", "sa2", "sb1", "sa1x"],
+    }
+)
+MEMBERSHIPS = pd.DataFrame(
+    [
+        ("a", "e1"),
+        ("a", "e2"),
+        ("a", "e3"),
+        ("b", "e4"),
+        ("a1", "e1"),
+        ("a1", "e2"),
+        ("a2", "e3"),
+        ("b1", "e4"),
+        ("a1x", "e1"),
+    ],
+    columns=["s", "t"],
+)
+# The query is embedded as [1, 0]
+EMBEDDINGS = {
+    "query": [1.0, 0.0],
+    "sa": [1.0, 0.0],
+    "sb": [0.0, 1.0],
+    "sa1": [1.0, 1.0],
+    "sa2": [0.0, 1.0],
+    "sb1": [1.0, 0.0],
+    "sa1x": [-1.0, 0.0],
+}
+
+
+def selected_ids(batches):
+    rows = [line for batch in batches for line in batch.splitlines()[2:]]
+    return [row.split("|")[0] for row in rows]
+
+
+class TestGlobalContextBuilderDynamicSelection:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.graph = MagicMock()
+        self.graph.name = "GraphRAG"
+        self.graph.get_nodes.side_effect = lambda **kwargs: COMMUNITIES[
+            kwargs["return_attributes"]
+        ]
+        self.graph.get_edges.return_value = MEMBERSHIPS
+
+        self.embedding_model = MagicMock()
+        self.embedding_model.generate_embedding = AsyncMock(
+            side_effect=lambda text: EMBEDDINGS[text]
+        )
+        self.embedding_model.generate_embeddings = AsyncMock(
+            side_effect=lambda texts: np.array(
+                [EMBEDDINGS[text] for text in texts], dtype=np.float32
+            )
+        )
+        search_engine = MagicMock()
+        search_engine.embedding_model = self.embedding_model
+        self.builder = GlobalContextBuilder(
+            graph=self.graph, token_encoder=FakeEncoding(), search_engine=search_engine
+        )
+
+    def embedded_summaries(self):
+        return [
+            text
+            for call in self.embedding_model.generate_embeddings.call_args_list
+            for text in call[0][0]
+        ]
+
+    def test_get_community_children(self):
+        children = GlobalContextBuilder._get_community_children(
+            COMMUNITIES,
+            MEMBERSHIPS.rename(columns={"s": "community", "t": "entity"}),
+        )
+        assert {parent: sorted(ids) for parent, ids in children.items()} == {
+            "a": ["a1", "a2"],
+            "b": ["b1"],
+            "a1": ["a1x"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_threshold_pruning_and_parent_replacement(self):
+        batches = await self.builder.build_dynamic_context("query")
+        # a is replaced by its relevant child a1, whose child a1x is irrelevant
+        assert selected_ids(batches) == ["a1"]
+        # The children of the irrelevant community b are never rated
+        assert "sb1" not in self.embedded_summaries()
+        assert sorted(self.embedded_summaries()) == ["sa", "sa1", "sa1x", "sa2", "sb"]
+
+    @pytest.mark.asyncio
+    async def test_keep_parents(self):
+        batches = await self.builder.build_dynamic_context("query", keep_parents=True)
+        # The selection is ordered by rank
+        assert selected_ids(batches) == ["a1", "a"]
+
+    @pytest.mark.asyncio
+    async def test_max_communities(self):
+        batches = await self.builder.build_dynamic_context(
+            "query", keep_parents=True, max_communities=1
+        )
+        # The cap keeps the most similar communities
+        assert selected_ids(batches) == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_no_relevant_communities(self):
+        assert (
+            await self.builder.build_dynamic_context("query", relevance_threshold=1.5)
+            == []
+        )
+
+    @pytest.mark.asyncio
+    async def test_no_communities(self):
+        self.graph.get_nodes.side_effect = None
+        self.graph.get_nodes.return_value = None
+        assert await self.builder.build_dynamic_context("query") == []
+        self.graph.get_edges.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_no_search_engine(self):
+        builder = GlobalContextBuilder(graph=self.graph, token_encoder=FakeEncoding())
+        with pytest.raises(ValueError):
+            await builder.build_dynamic_context("query")
+
+    @pytest.mark.asyncio
+    async def test_communities_and_embeddings_are_cached(self):
+        await self.builder.build_dynamic_context("query")
+        await self.builder.build_dynamic_context("query")
+        self.graph.get_nodes.assert_called_once()
+        self.graph.get_edges.assert_called_once()
+        assert self.embedding_model.generate_embeddings.call_count == 3
+
+        # A new data version refetches the communities
+        self.builder.data_version = "v2"
+        await self.builder.build_dynamic_context("query")
+        assert self.graph.get_nodes.call_count == 2
+        assert self.graph.get_edges.call_count == 2
+
+
+class TestGlobalContextBuilderCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.cache_dir = tmp_path / "cache"
+        self.graph = MagicMock()
+        self.graph.name = "GraphRAG"
+        self.graph.get_nodes.side_effect = lambda **kwargs: COMMUNITIES[
+            kwargs["return_attributes"]
+        ]
+
+    def create_builder(self, data_version=None):
+        return GlobalContextBuilder(
+            graph=self.graph,
+            token_encoder=FakeEncoding(),
+            context_cache=ContextCache(self.cache_dir),
+            data_version=data_version,
+        )
+
+    @pytest.mark.asyncio
+    async def test_hit_and_miss(self):
+        builder = self.create_builder()
+        context = await builder.build_context()
+        assert selected_ids(context) == ["a", "b", "a1", "a2", "b1", "a1x"]
+        assert await builder.build_context() == context
+        self.graph.get_nodes.assert_called_once()
+
+        # The batches persist across builders
+        assert await self.create_builder().build_context() == context
+        self.graph.get_nodes.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_version_mismatch(self):
+        await self.create_builder(data_version="v1").build_context()
+        await self.create_builder(data_version="v2").build_context()
+        assert self.graph.get_nodes.call_count == 2
+        await self.create_builder(data_version="v2").build_context()
+        assert self.graph.get_nodes.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        builder = self.create_builder()
+        await builder.build_context()
+        builder.invalidate_context()
+        await self.create_builder().build_context()
+        assert self.graph.get_nodes.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_query_is_not_cached(self):
+        self.graph.get_nodes.side_effect = None
+        self.graph.get_nodes.return_value = None
+        builder = self.create_builder()
+        assert await builder.build_context() == []
+        await builder.build_context()
+        assert self.graph.get_nodes.call_count == 2
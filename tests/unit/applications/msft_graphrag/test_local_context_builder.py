@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+import pandas as pd
+
+from applications.msft_graphrag.query.context_builder import LocalContextBuilder
+
+
+class FakeEncoding:
+    """A token encoder with one token per character."""
+
+    name = "fake"
+
+    def encode_batch(self, texts, **kwargs):
+        return [list(text) for text in texts]
+
+
+class TestLocalContextBuilder:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.builder = LocalContextBuilder(
+            graph=MagicMock(), search_engine=MagicMock(), token_encoder=FakeEncoding()
+        )
+        self.builder.retrieve_top_k_neighborhoods = AsyncMock(
+            return_value={
+                "Relationships": pd.DataFrame(
+                    {"id": ["r1"], "description": ["d"], "weight": [1.0], "rank": [2]}
+                ),
+                "Text Units": pd.DataFrame(
+                    {"id": ["t1"], "text": ["text"], "n_tokens": [1]}
+                ),
+            }
+        )
+
+    @pytest.mark.asyncio
+    async def test_build_context(self):
+        context = await self.builder.build_context("query", k=5)
+        assert context == (
+            "-----Relationships-----\nid|description|weight|rank\nr1|d|1.0|2"
+            "\n\n-----Text Units-----\nid|text\nt1|text"
+        )
+        kwargs = self.builder.retrieve_top_k_neighborhoods.call_args.kwargs
+        assert kwargs["start_node_type"] == "Entity"
+        assert kwargs["k"] == 5
+
+    @pytest.mark.asyncio
+    async def test_every_section_is_bounded(self):
+        await self.builder.build_context("query")
+        expansions = self.builder.retrieve_top_k_neighborhoods.call_args.kwargs[
+            "expansions"
+        ]
+        # Sections without stored token counts are capped by a limit
+        assert {
+            expansion["name"]: (expansion["limit"], expansion["max_tokens"])
+            for expansion in expansions
+        } == {
+            "Communities": (40, None),
+            "Relationships": (160, None),
+            "Text Units": (None, 6000),
+        }
@@ -44,7 +44,7 @@ class TestSettings:
         assert isinstance(settings.llm, OpenAIConfig)
         assert settings.llm.api_key == "test_api_key"  # from environment
         assert settings.llm.base_url == "https://api.openai.com"
-        assert settings.llm.max_retries == 10
+        assert settings.llm.max_retries == 0
 
         # Validate embedding configuration
         assert settings.embedding.type == "OpenAI"
@@ -74,7 +74,7 @@ class TestSettings:
         assert isinstance(settings.llm, OpenAIConfig)
         assert settings.llm.api_key == "test_api_key"  # from environment
         assert settings.llm.base_url is None
-        assert settings.llm.max_retries == 10
+        assert settings.llm.max_retries == 0
 
         # Validate embedding configuration
         assert settings.embedding.type == "OpenAI"
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch
 
+from tigergraphx.config import ExpansionSpec
 from tigergraphx.core.graph import Graph
 
 
@@ -197,3 +198,37 @@ class TestGraph:
             Graph._normalize_edges_for_adding(edges_with_attrs, **common_attr)
             == expected_with_attrs
         )
+
+    def test_validate_expansion_ranking(self):
+        schema = {
+            "graph_name": "RankedGraph",
+            "nodes": {
+                "Entity": {"primary_key": "id", "attributes": {"id": "STRING"}},
+                "TextUnit": {
+                    "primary_key": "id",
+                    "attributes": {"id": "STRING", "n_tokens": "UINT"},
+                },
+            },
+            "edges": {},
+        }
+        graph = Graph(graph_schema=schema, mode="lazy")
+        graph._validate_expansion_ranking(
+            ExpansionSpec(
+                name="text_units",
+                target_node_type_set={"TextUnit"},
+                token_count_attribute="n_tokens",
+                max_tokens=100,
+            )
+        )
+        with pytest.raises(ValueError, match="target_node_type_set"):
+            graph._validate_expansion_ranking(
+                ExpansionSpec(name="nodes", order_by="n_tokens")
+            )
+        with pytest.raises(ValueError, match="no attribute 'n_tokens'"):
+            graph._validate_expansion_ranking(
+                ExpansionSpec(
+                    name="nodes",
+                    target_node_type_set={"TextUnit", "Entity"},
+                    order_by="n_tokens",
+                )
+            )
@@ -1,7 +1,8 @@
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+import pandas as pd
 
-from tigergraphx.config import LoadingJobConfig, GraphSchema
+from tigergraphx.config import CsvParsingOptions, LoadingJobConfig, GraphSchema
 from tigergraphx.core.managers.data_manager import DataManager
 
 
@@ -18,25 +19,241 @@ class TestDataManager:
         )
         self.data_manager = DataManager(mock_context)
 
-    def test_load_data_success(self):
-        loading_job_config = LoadingJobConfig(loading_job_name="test_job", files=[])
-        # Mock the gsql return value to simulate a successful load process
-        self.mock_tigergraph_api.gsql.return_value = (
-            "Using graph 'MyGraph'...\n"
-            "Successfully created loading jobs:\n"
-            "LOAD SUCCESSFUL for loading jobid\n"
-            "Successfully dropped jobs"
+    def _create_local_loading_job_config(self):
+        self.data_manager._graph_schema = GraphSchema.ensure_config(
+            {
+                "graph_name": "MyGraph",
+                "nodes": {
+                    "Person": {
+                        "primary_key": "name",
+                        "attributes": {"name": "STRING", "age": "UINT"},
+                    }
+                },
+                "edges": {},
+            }
+        )
+        return LoadingJobConfig.ensure_config(
+            {
+                "loading_job_name": "local_job",
+                "files": [
+                    {
+                        "file_alias": "f_person",
+                        "file_path": "/server/person.csv",
+                        "node_mappings": [
+                            {
+                                "target_name": "Person",
+                                "attribute_column_mappings": {
+                                    "name": "name",
+                                    "age": "age",
+                                },
+                            }
+                        ],
+                    }
+                ],
+            }
         )
-        self.data_manager.load_data(loading_job_config)
 
-        # Assert the gsql method was called once
-        self.mock_tigergraph_api.gsql.assert_called_once()
+    def test_load_data_success(self):
+        loading_job_config = self._create_local_loading_job_config()
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "Loading job not found.",
+            "Successfully created loading jobs: [local_job].",
+        ]
+        self.mock_tigergraph_api.run_loading_job.return_value = "MyGraph.local_job.1"
+        self.mock_tigergraph_api.get_loading_job_status.side_effect = [
+            {"status": "RUNNING", "overall": {"loadedLines": 50, "progress": 0.5}},
+            {
+                "status": "FINISHED",
+                "overall": {"loadedLines": 100, "errorLines": 2, "duration": 2000},
+            },
+        ]
+
+        with patch("tigergraphx.core.managers.data_manager.time.sleep") as mock_sleep:
+            result = self.data_manager.load_data(loading_job_config)
+
+        mock_sleep.assert_called_once()
+        assert result == {
+            "job_id": "MyGraph.local_job.1",
+            "status": "FINISHED",
+            "progress": None,
+            "loaded_lines": 100,
+            "rejected_lines": 2,
+            "duration_seconds": 2.0,
+            "throughput": 50.0,
+        }
+        graph_name, job_name, data_sources, _, _ = (
+            self.mock_tigergraph_api.run_loading_job.call_args[0]
+        )
+        assert graph_name == "MyGraph"
+        assert job_name.startswith("local_job_")
+        assert data_sources == {"f_person": "/server/person.csv"}
+        create_script = self.mock_tigergraph_api.gsql.call_args_list[1][0][0]
+        assert f"CREATE LOADING JOB {job_name} FOR GRAPH MyGraph" in create_script
+        assert "DEFINE FILENAME f_person;" in create_script
 
     def test_load_data_failure(self):
-        loading_job_config = LoadingJobConfig(loading_job_name="test_job", files=[])
-        # Mock the gsql return value for failure
-        self.mock_tigergraph_api.gsql.return_value = "LOAD FAILED"
+        loading_job_config = self._create_local_loading_job_config()
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "Loading job not found.",
+            "Successfully created loading jobs: [local_job].",
+        ]
+        self.mock_tigergraph_api.run_loading_job.return_value = "MyGraph.local_job.1"
+        self.mock_tigergraph_api.get_loading_job_status.return_value = {
+            "status": "FAILED"
+        }
 
         # Assert that RuntimeError is raised on failure
         with pytest.raises(RuntimeError):
             self.data_manager.load_data(loading_job_config)
+
+    def test_load_data_job_creation_failure(self):
+        loading_job_config = self._create_local_loading_job_config()
+        self.mock_tigergraph_api.gsql.return_value = "Semantic Check Fails"
+
+        with pytest.raises(RuntimeError):
+            self.data_manager.load_data(loading_job_config)
+        self.mock_tigergraph_api.run_loading_job.assert_not_called()
+
+    def test_create_loading_job_reuses_existing_job(self):
+        loading_job_config = self._create_local_loading_job_config()
+        job_name = self.data_manager._get_loading_job_name(loading_job_config)
+        self.mock_tigergraph_api.gsql.return_value = (
+            f"CREATE LOADING JOB {job_name} FOR GRAPH MyGraph {{ ... }}"
+        )
+
+        assert self.data_manager.create_loading_job(loading_job_config) == job_name
+        assert self.data_manager.create_loading_job(loading_job_config) == job_name
+
+        # The existence check runs once, and the job is never recreated
+        self.mock_tigergraph_api.gsql.assert_called_once()
+
+    def test_create_loading_job_drops_superseded_jobs(self):
+        loading_job_config = self._create_local_loading_job_config()
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "CREATE LOADING JOB local_job_0123456789ab FOR GRAPH MyGraph { ... }\n"
+            "CREATE LOADING JOB local_job_other FOR GRAPH MyGraph { ... }\n"
+            "CREATE LOADING JOB other_job_0123456789ab FOR GRAPH MyGraph { ... }",
+            "Successfully created loading jobs: [local_job].",
+            "Successfully dropped jobs",
+        ]
+
+        job_name = self.data_manager.create_loading_job(loading_job_config)
+        assert self.mock_tigergraph_api.gsql.call_count == 3
+        # Only the jobs of earlier definitions of the same job are dropped
+        drop_script = self.mock_tigergraph_api.gsql.call_args_list[2][0][0]
+        assert drop_script == "USE GRAPH MyGraph\nDROP JOB local_job_0123456789ab"
+        assert job_name != "local_job_0123456789ab"
+
+    def test_loading_job_name_changes_with_definition(self):
+        loading_job_config = self._create_local_loading_job_config()
+        job_name = self.data_manager._get_loading_job_name(loading_job_config)
+        loading_job_config.files[0].node_mappings[0].attribute_column_mappings.pop(
+            "age"
+        )
+        assert self.data_manager._get_loading_job_name(loading_job_config) != job_name
+
+    def test_run_loading_job_missing_file_path(self):
+        loading_job_config = self._create_local_loading_job_config()
+        loading_job_config.files[0].file_path = None
+        with pytest.raises(ValueError, match="No file path provided"):
+            self.data_manager.run_loading_job(loading_job_config)
+
+    def test_wait_for_loading_job_timeout(self):
+        self.mock_tigergraph_api.get_loading_job_status.return_value = {
+            "status": "RUNNING"
+        }
+        with patch("tigergraphx.core.managers.data_manager.time.sleep"):
+            with pytest.raises(TimeoutError):
+                self.data_manager.wait_for_loading_job("job_1", timeout=-1)
+
+    def test_wait_for_loading_job_unrecognized_status(self):
+        self.mock_tigergraph_api.get_loading_job_status.return_value = {}
+        with patch("tigergraphx.core.managers.data_manager.time.sleep") as mock_sleep:
+            with pytest.raises(RuntimeError, match="UNKNOWN"):
+                self.data_manager.wait_for_loading_job("job_1")
+        mock_sleep.assert_not_called()
+
+    def test_wait_for_loading_job_paused(self):
+        self.mock_tigergraph_api.get_loading_job_status.side_effect = [
+            {"status": "PAUSING"},
+            {"status": "PAUSED"},
+        ]
+        with patch("tigergraphx.core.managers.data_manager.time.sleep") as mock_sleep:
+            with pytest.raises(RuntimeError, match="PAUSED"):
+                self.data_manager.wait_for_loading_job("job_1")
+        mock_sleep.assert_called_once()
+
+    def test_iter_csv_chunks_without_quotes(self):
+        csv_options = CsvParsingOptions(quote=None)
+        df = pd.DataFrame({"name": ['a\\b', 'c"d'], "age": [1, 2]})
+        chunks = list(DataManager._iter_csv_chunks(df, csv_options, chunk_size=10))
+        # Values are written as they are, since the loader does not unescape them
+        assert chunks == [b'name,age\na\\b,1\nc"d,2\n']
+
+        for value in ["a,b", "a\nb", "a\rb"]:
+            df = pd.DataFrame({"name": [value], "age": [1]})
+            with pytest.raises(ValueError, match="Column 'name'"):
+                list(DataManager._iter_csv_chunks(df, csv_options, chunk_size=10))
+
+    def test_load_local_data_from_dataframe(self):
+        loading_job_config = self._create_local_loading_job_config()
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "Loading job not found.",
+            "Successfully created loading jobs: [local_job].",
+        ]
+        self.mock_tigergraph_api.run_loading_job_with_data.return_value = [
+            {"statistics": {"validLine": 2, "rejectLine": 0, "notEnoughToken": 1}}
+        ]
+        df = pd.DataFrame({"name": ["a", "b", "c", "d", "e"], "age": [1, 2, 3, 4, 5]})
+
+        result = self.data_manager.load_local_data(
+            loading_job_config, {"f_person": df}, chunk_size=2
+        )
+
+        assert result == {"f_person": {"valid_lines": 6, "rejected_lines": 3}}
+        job_name = self.data_manager._get_loading_job_name(loading_job_config)
+        create_script = self.mock_tigergraph_api.gsql.call_args_list[1][0][0]
+        assert "DEFINE FILENAME f_person;" in create_script
+        assert "/server/person.csv" not in create_script
+        calls = self.mock_tigergraph_api.run_loading_job_with_data.call_args_list
+        assert len(calls) == 3
+        assert calls[0][0] == (
+            "MyGraph",
+            job_name,
+            "f_person",
+            b"name,age\na,1\nb,2\n",
+            ",",
+            "\n",
+        )
+        assert calls[2][0][3] == b"name,age\ne,5\n"
+
+    def test_load_local_data_from_file(self, tmp_path):
+        loading_job_config = self._create_local_loading_job_config()
+        file_path = tmp_path / "person.csv"
+        file_path.write_text("name,age\na,1\nb,2\nc,3\n")
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "Loading job not found.",
+            "Successfully created loading jobs: [local_job].",
+        ]
+        self.mock_tigergraph_api.run_loading_job_with_data.return_value = [
+            {"statistics": {"parsingStatistics": {"fileLevel": {"validLine": 2}}}}
+        ]
+
+        result = self.data_manager.load_local_data(
+            loading_job_config, {"f_person": str(file_path)}, chunk_size=2
+        )
+
+        assert result == {"f_person": {"valid_lines": 4, "rejected_lines": 0}}
+        chunks = [
+            call[0][3]
+            for call in self.mock_tigergraph_api.run_loading_job_with_data.call_args_list
+        ]
+        assert chunks == [b"name,age\na,1\nb,2\n", b"name,age\nc,3\n"]
+
+    def test_load_local_data_unknown_alias(self):
+        loading_job_config = self._create_local_loading_job_config()
+        with pytest.raises(ValueError, match="not defined in the loading job"):
+            self.data_manager.load_local_data(
+                loading_job_config, {"f_person": "a.csv", "f_other": "b.csv"}
+            )
+        self.mock_tigergraph_api.gsql.assert_not_called()
@@ -1,5 +1,7 @@
+import json
 import pytest
 from unittest.mock import MagicMock
+import pandas as pd
 
 from tigergraphx.core.managers.edge_manager import EdgeManager
 
@@ -328,3 +330,80 @@ class TestEdgeManager:
         )
 
         assert result is None  # Should return None on exception
+
+    def test_add_edges_from_dataframe(self):
+        """Test that edges are grouped by source node in the upsert payload."""
+        self.edge_manager._graph_schema.edges["MyEdge"] = EdgeSchema(
+            from_node_type="MyNode",
+            to_node_type="MyNode",
+            attributes={"weight": AttributeSchema(data_type=DataType.DOUBLE)},
+        )
+        self.mock_tigergraph_api.upsert_graph_data.return_value = [
+            {"accepted_vertices": 0, "accepted_edges": 3}
+        ]
+        df = pd.DataFrame(
+            {
+                "src": ["A", "A", "B"],
+                "tgt": ["B", "C", "C"],
+                "weight": [1.0, 2.5, 3.0],
+            }
+        )
+        result = self.edge_manager.add_edges_from_dataframe(
+            df, "src", "tgt", "MyNode", "MyEdge", "MyNode"
+        )
+        assert result == 3
+        _, payload = self.mock_tigergraph_api.upsert_graph_data.call_args[0]
+        assert json.loads(payload) == {
+            "edges": {
+                "MyNode": {
+                    "A": {
+                        "MyEdge": {
+                            "MyNode": {
+                                "B": {"weight": {"value": 1.0}},
+                                "C": {"weight": {"value": 2.5}},
+                            }
+                        }
+                    },
+                    "B": {"MyEdge": {"MyNode": {"C": {"weight": {"value": 3.0}}}}},
+                }
+            }
+        }
+
+    def test_add_edges_from_dataframe_multi_edge(self):
+        """Test that parallel edges are sent as a list per target node."""
+        self.edge_manager._graph_schema.edges["MyEdge"] = EdgeSchema(
+            from_node_type="MyNode",
+            to_node_type="MyNode",
+            discriminator="ts",
+            attributes={"ts": AttributeSchema(data_type=DataType.INT)},
+        )
+        self.mock_tigergraph_api.upsert_graph_data.return_value = [
+            {"accepted_vertices": 0, "accepted_edges": 2}
+        ]
+        df = pd.DataFrame({"src": [1, 1], "tgt": [2, 2], "ts": [10, 20]})
+        result = self.edge_manager.add_edges_from_dataframe(
+            df, "src", "tgt", "MyNode", "MyEdge", "MyNode"
+        )
+        assert result == 2
+        _, payload = self.mock_tigergraph_api.upsert_graph_data.call_args[0]
+        assert json.loads(payload) == {
+            "edges": {
+                "MyNode": {
+                    "1": {
+                        "MyEdge": {
+                            "MyNode": {
+                                "2": [{"ts": {"value": 10}}, {"ts": {"value": 20}}]
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+    def test_add_edges_from_dataframe_missing_column(self):
+        """Test that a missing ID column raises a ValueError."""
+        df = pd.DataFrame({"src": ["A"]})
+        with pytest.raises(ValueError, match="does not exist"):
+            self.edge_manager.add_edges_from_dataframe(
+                df, "src", "tgt", "MyNode", "MyEdge", "MyNode"
+            )
@@ -1,5 +1,7 @@
+import json
 import pytest
 from unittest.mock import MagicMock
+import pandas as pd
 
 from tigergraphx.core.managers.node_manager import NodeManager
 
@@ -8,6 +10,7 @@ from tigergraphx.config import (
     NodeSchema,
     AttributeSchema,
     DataType,
+    VectorAttributeSchema,
 )
 
 
@@ -202,3 +205,113 @@ class TestNodeManager:
 
         self.mock_tigergraph_api.delete_nodes.assert_any_call("MyGraph", "MyNode")
         assert self.mock_tigergraph_api.delete_nodes.call_count == 1
+
+    def test_add_nodes_from_dataframe(self):
+        """Test that DataFrame columns are serialized into the upsert payload."""
+        self.node_manager._graph_schema = GraphSchema(
+            graph_name="MyGraph",
+            nodes={
+                "Person": NodeSchema(
+                    primary_key="name",
+                    attributes={
+                        "name": AttributeSchema(data_type=DataType.STRING),
+                        "age": AttributeSchema(data_type=DataType.UINT),
+                        "score": AttributeSchema(data_type=DataType.DOUBLE),
+                        "active": AttributeSchema(data_type=DataType.BOOL),
+                    },
+                    vector_attributes={"emb": VectorAttributeSchema(dimension=2)},
+                ),
+            },
+            edges={},
+        )
+        self.mock_tigergraph_api.upsert_graph_data.return_value = [
+            {"accepted_vertices": 2, "accepted_edges": 0}
+        ]
+        df = pd.DataFrame(
+            {
+                "name": ["Alice", "Bob"],
+                "age": [30, 25],
+                "score": [1.5, None],
+                "active": [True, False],
+                "embedding": [[0.1, 0.2], [0.3, 0.4]],
+                "ignored": ["x", "y"],
+            }
+        )
+        result = self.node_manager.add_nodes_from_dataframe(
+            df,
+            "Person",
+            attribute_column_mappings={
+                "age": "age",
+                "score": "score",
+                "active": "active",
+                "emb": "embedding",
+            },
+        )
+        assert result == 2
+        graph_name, payload = self.mock_tigergraph_api.upsert_graph_data.call_args[0]
+        assert graph_name == "MyGraph"
+        assert json.loads(payload) == {
+            "vertices": {
+                "Person": {
+                    "Alice": {
+                        "age": {"value": 30},
+                        "score": {"value": 1.5},
+                        "active": {"value": True},
+                        "emb": {"value": [0.1, 0.2]},
+                    },
+                    "Bob": {
+                        "age": {"value": 25},
+                        "active": {"value": False},
+                        "emb": {"value": [0.3, 0.4]},
+                    },
+                }
+            }
+        }
+
+    def test_add_nodes_from_dataframe_batches(self):
+        """Test that large DataFrames are split into several requests."""
+        self.mock_tigergraph_api.upsert_graph_data.return_value = [
+            {"accepted_vertices": 2, "accepted_edges": 0}
+        ]
+        df = pd.DataFrame({"name": ["a", "b", "c", "d"], "value": [True] * 4})
+        result = self.node_manager.add_nodes_from_dataframe(df, "MyNode", batch_size=2)
+        assert result == 4
+        assert self.mock_tigergraph_api.upsert_graph_data.call_count == 2
+        _, payload = self.mock_tigergraph_api.upsert_graph_data.call_args[0]
+        assert json.loads(payload) == {
+            "vertices": {
+                "MyNode": {"c": {"value": {"value": True}}, "d": {"value": {"value": True}}}
+            }
+        }
+
+    def test_add_nodes_from_dataframe_type_mismatch(self):
+        """Test that incompatible columns are rejected before sending anything."""
+        df = pd.DataFrame({"name": ["a"], "value": ["not a bool"]})
+        with pytest.raises(ValueError, match="incompatible with BOOL"):
+            self.node_manager.add_nodes_from_dataframe(df, "MyNode")
+        self.mock_tigergraph_api.upsert_graph_data.assert_not_called()
+
+    def test_add_nodes_from_dataframe_unknown_attribute(self):
+        """Test that mappings to unknown attributes are rejected."""
+        df = pd.DataFrame({"name": ["a"], "size": [1]})
+        with pytest.raises(ValueError, match="not defined in the graph schema"):
+            self.node_manager.add_nodes_from_dataframe(
+                df, "MyNode", attribute_column_mappings={"size": "size"}
+            )
+
+    def test_add_nodes_from_dataframe_float_ids(self):
+        """Test that integral float IDs are encoded as integers."""
+        self.mock_tigergraph_api.upsert_graph_data.return_value = [
+            {"accepted_vertices": 2, "accepted_edges": 0}
+        ]
+        df = pd.DataFrame({"name": [1.0, 2.0], "value": [True, False]})
+        self.node_manager.add_nodes_from_dataframe(df, "MyNode")
+        _, payload = self.mock_tigergraph_api.upsert_graph_data.call_args[0]
+        assert list(json.loads(payload)["vertices"]["MyNode"]) == ["1", "2"]
+
+    def test_add_nodes_from_dataframe_non_integral_float_ids(self):
+        """Test that non-integral float IDs are rejected."""
+        df = pd.DataFrame({"name": [1.0, 2.5], "value": [True, False]})
+        with pytest.raises(ValueError, match="non-integral floats"):
+            self.node_manager.add_nodes_from_dataframe(df, "MyNode")
+        self.mock_tigergraph_api.upsert_graph_data.assert_not_called()
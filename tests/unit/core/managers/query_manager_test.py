@@ -25,6 +25,65 @@ class TestQueryManager:
         mock_context.graph_schema = self.mock_graph_schema
         self.query_manager = QueryManager(mock_context)
 
+    def test_install_queries_success(self):
+        self.mock_tigergraph_api.install_query.return_value = (
+            "Query installed successfully"
+        )
+        installation_id = self.query_manager.install_queries(["query_a", "query_b"])
+        status = self.query_manager.wait_for_query_installation(
+            installation_id, poll_interval=0.01
+        )
+        self.mock_tigergraph_api.install_query.assert_called_once_with(
+            "MyGraph", ["query_a", "query_b"]
+        )
+        assert status["status"] == "SUCCESS"
+        assert status["query_names"] == ["query_a", "query_b"]
+
+    def test_install_queries_failure(self):
+        self.mock_tigergraph_api.install_query.side_effect = Exception("Timeout")
+        installation_id = self.query_manager.install_queries(["query_a"])
+        # The final status is part of the error
+        with pytest.raises(RuntimeError, match="'message': 'Timeout'"):
+            self.query_manager.wait_for_query_installation(
+                installation_id, poll_interval=0.01
+            )
+
+    def test_finished_installation_is_forgotten(self):
+        self.mock_tigergraph_api.install_query.return_value = (
+            "Query installed successfully"
+        )
+        installation_id = self.query_manager.install_queries(["query_a"])
+        self.query_manager._installations[installation_id][1].result()
+        status = self.query_manager.get_query_installation_status(installation_id)
+        assert status["status"] == "SUCCESS"
+        assert self.query_manager._installations == {}
+        with pytest.raises(ValueError):
+            self.query_manager.get_query_installation_status(installation_id)
+
+    def test_close(self):
+        self.mock_tigergraph_api.install_query.return_value = (
+            "Query installed successfully"
+        )
+        self.query_manager.install_queries(["query_a"])
+        executor = self.query_manager._installation_executor
+        self.query_manager.close()
+        assert executor._shutdown
+        assert self.query_manager._installation_executor is None
+        assert self.query_manager._installations == {}
+        # A new executor is created for later installations
+        installation_id = self.query_manager.install_queries(["query_b"])
+        status = self.query_manager.wait_for_query_installation(
+            installation_id, poll_interval=0.01
+        )
+        assert status["status"] == "SUCCESS"
+        self.query_manager.close()
+
+    def test_install_queries_invalid(self):
+        with pytest.raises(ValueError):
+            self.query_manager.install_queries([])
+        with pytest.raises(ValueError):
+            self.query_manager.get_query_installation_status("unknown")
+
     def test_run_query_success(self):
         query_name = "test_query"
         params = {"param1": "value1"}
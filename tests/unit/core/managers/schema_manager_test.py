@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock
 from tigergraphx.core.managers.schema_manager import SchemaManager
-from tigergraphx.config import GraphSchema
+from tigergraphx.config import AttributeSchema, DataType, GraphSchema, NodeSchema
 
 
 class TestSchemaManager:
@@ -38,12 +38,429 @@ Successfully created schema change jobs
 Local schema change succeeded
 Successfully dropped jobs
 """,  # Second call for creating
+            "- gds.util.foo() (installed)",  # Third call for checking GDS
         ]
         self.schema_manager.create_schema(drop_existing_graph=True)
-        assert self.mock_tigergraph_api.gsql.call_count == 2
+        assert self.mock_tigergraph_api.gsql.call_count == 3
 
     def test_create_schema_failure(self):
         # Mock the gsql method to simulate a failure in schema creation
         self.mock_tigergraph_api.gsql.return_value = "Failed to create schema change jobs"
         with pytest.raises(RuntimeError):
             self.schema_manager.create_schema(drop_existing_graph=False)
+
+    def _create_schema_manager(self, nodes, edges):
+        mock_context = MagicMock()
+        mock_context.tigergraph_api = self.mock_tigergraph_api
+        mock_context.graph_schema = GraphSchema.ensure_config(
+            {"graph_name": "TestGraph", "nodes": nodes, "edges": edges}
+        )
+        return SchemaManager(mock_context)
+
+    @staticmethod
+    def _raw_vertex(name, attributes, vector_attributes=None):
+        return {
+            "Name": name,
+            "PrimaryId": {
+                "AttributeName": "id",
+                "AttributeType": {"Name": "STRING"},
+                "PrimaryIdAsAttribute": True,
+            },
+            "Attributes": [
+                {"AttributeName": attr, "AttributeType": {"Name": data_type}}
+                for attr, data_type in attributes.items()
+            ],
+            "EmbeddingAttributes": [
+                {
+                    "Name": attr,
+                    "Dimension": dimension,
+                    "IndexType": "HNSW",
+                    "DataType": "FLOAT",
+                    "Metric": "COSINE",
+                }
+                for attr, dimension in (vector_attributes or {}).items()
+            ],
+        }
+
+    @staticmethod
+    def _raw_edge(name, from_node_type, to_node_type, attributes=None):
+        return {
+            "Name": name,
+            "IsDirected": True,
+            "FromVertexTypeName": from_node_type,
+            "ToVertexTypeName": to_node_type,
+            "Attributes": [
+                {"AttributeName": attr, "AttributeType": {"Name": data_type}}
+                for attr, data_type in (attributes or {}).items()
+            ],
+        }
+
+    def test_update_schema_up_to_date(self):
+        schema_manager = self._create_schema_manager(
+            nodes={"Person": {"primary_key": "id", "attributes": {"id": "STRING"}}},
+            edges={},
+        )
+        self.mock_tigergraph_api.gsql.return_value = "Using graph 'TestGraph'"
+        self.mock_tigergraph_api.get_schema.return_value = {
+            "VertexTypes": [self._raw_vertex("Person", {})],
+            "EdgeTypes": [],
+        }
+        assert schema_manager.update_schema() is False
+        self.mock_tigergraph_api.gsql.assert_called_once()
+
+    def test_update_schema_creates_missing_graph(self):
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "Graph TestGraph does not exist",
+            "Graph TestGraph does not exist",
+            """
+The graph TestGraph is created
+Successfully created schema change jobs
+Local schema change succeeded
+Successfully dropped jobs
+""",
+            "- gds.util.foo() (installed)",
+        ]
+        assert self.schema_manager.update_schema() is True
+        self.mock_tigergraph_api.get_schema.assert_not_called()
+
+    def test_update_schema_applies_differences(self):
+        schema_manager = self._create_schema_manager(
+            nodes={
+                "Person": {
+                    "primary_key": "id",
+                    "attributes": {"id": "STRING", "age": "INT", "city": "STRING"},
+                    "vector_attributes": {"emb": 3},
+                },
+                "Company": {"primary_key": "id", "attributes": {"id": "STRING"}},
+            },
+            edges={
+                "knows": {
+                    "is_directed_edge": True,
+                    "from_node_type": "Person",
+                    "to_node_type": "Person",
+                    "attributes": {"weight": "DOUBLE"},
+                },
+                "works_at": {
+                    "is_directed_edge": True,
+                    "from_node_type": "Person",
+                    "to_node_type": "Company",
+                },
+            },
+        )
+        self.mock_tigergraph_api.get_schema.return_value = {
+            "VertexTypes": [
+                self._raw_vertex("Person", {"age": "INT", "nickname": "STRING"}),
+                self._raw_vertex("Account", {}, {"emb": 3}),
+            ],
+            "EdgeTypes": [
+                self._raw_edge("knows", "Person", "Person"),
+                self._raw_edge("owns", "Person", "Account"),
+            ],
+        }
+        success = """
+Successfully created schema change jobs
+Local schema change succeeded
+Successfully dropped jobs
+Query installation finished
+"""
+        existing_queries = """
+  - api_search_Account_emb(...) (installed v2)
+  - api_search_batch_Account_emb(...) (installed v2)
+  - api_similar_Account_emb(...) (installed v2)
+  - api_fetch_Account_emb(...) (installed v2)
+  - api_search_filter_Person_emb_0123456789ab(...) (installed v2)
+  - api_fetch(...) (installed v2)
+"""
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "Using graph 'TestGraph'",
+            existing_queries,
+            success,
+            success,
+            "",  # No installed queries
+            success,
+        ]
+
+        assert schema_manager.update_schema() is True
+        assert self.mock_tigergraph_api.gsql.call_count == 6
+
+        # Every existing query of the dropped node type is dropped, and so are the
+        # queries installed on demand
+        gsql_schema_change = self.mock_tigergraph_api.gsql.call_args_list[2][0][0]
+        drop_queries = [
+            line for line in gsql_schema_change.splitlines() if "DROP QUERY" in line
+        ]
+        assert drop_queries == [
+            "DROP QUERY api_fetch_Account_emb",
+            "DROP QUERY api_search_Account_emb",
+            "DROP QUERY api_search_batch_Account_emb",
+            "DROP QUERY api_search_filter_Person_emb_0123456789ab",
+            "DROP QUERY api_similar_Account_emb",
+        ]
+        job = gsql_schema_change.split("{", 1)[1].split("}", 1)[0].strip()
+        assert [line.strip() for line in job.splitlines()] == [
+            "DROP EDGE owns;",
+            "ALTER VERTEX Person DROP ATTRIBUTE (nickname);",
+            "DROP VERTEX Account;",
+            'ADD VERTEX Company(PRIMARY_ID id STRING) WITH PRIMARY_ID_AS_ATTRIBUTE="true";',
+            "ALTER VERTEX Person ADD ATTRIBUTE (city STRING);",
+            "ALTER EDGE knows ADD ATTRIBUTE (weight DOUBLE);",
+            "ADD DIRECTED EDGE works_at(FROM Person, TO Company) "
+            'WITH REVERSE_EDGE="reverse_works_at";',
+        ]
+
+        gsql_vector_change = self.mock_tigergraph_api.gsql.call_args_list[3][0][0]
+        assert "DROP QUERY" not in gsql_vector_change
+        assert (
+            'ALTER VERTEX Person ADD VECTOR ATTRIBUTE emb(DIMENSION=3, INDEXTYPE="HNSW", '
+            'DATATYPE="FLOAT", METRIC="COSINE");'
+        ) in gsql_vector_change
+
+        gsql_queries = self.mock_tigergraph_api.gsql.call_args_list[5][0][0]
+        assert "CREATE OR REPLACE QUERY api_search_Person_emb" in gsql_queries
+        assert 'IF return_attributes.contains("city")' in gsql_queries
+        assert "PRINT Nodes[Nodes.emb] WITH VECTOR;" in gsql_queries
+        assert (
+            "INSTALL QUERY api_search_Person_emb, api_search_batch_Person_emb, "
+            "api_similar_Person_emb, api_similar_batch_Person_emb, "
+            "api_fetch_Person_emb, api_fetch"
+        ) in gsql_queries
+
+    def test_update_schema_keeps_removed_without_drop(self):
+        schema_manager = self._create_schema_manager(
+            nodes={
+                "Person": {
+                    "primary_key": "id",
+                    "attributes": {"id": "STRING", "age": "INT"},
+                }
+            },
+            edges={},
+        )
+        self.mock_tigergraph_api.get_schema.return_value = {
+            "VertexTypes": [
+                self._raw_vertex("Person", {"nickname": "STRING"}),
+                self._raw_vertex("Account", {}),
+            ],
+            "EdgeTypes": [self._raw_edge("owns", "Person", "Account")],
+        }
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "Using graph 'TestGraph'",
+            """
+Successfully created schema change jobs
+Local schema change succeeded
+Successfully dropped jobs
+""",
+        ]
+
+        assert schema_manager.update_schema(drop_removed=False) is True
+        gsql_schema_change = self.mock_tigergraph_api.gsql.call_args_list[1][0][0]
+        assert "ALTER VERTEX Person ADD ATTRIBUTE (age INT);" in gsql_schema_change
+        job = gsql_schema_change.split("{", 1)[1].split("}", 1)[0]
+        assert "DROP" not in job
+
+    def test_update_schema_reinstalls_queries_after_attribute_change(self):
+        schema_manager = self._create_schema_manager(
+            nodes={
+                "Person": {
+                    "primary_key": "id",
+                    "attributes": {"id": "STRING", "age": "INT"},
+                    "vector_attributes": {"emb": 3},
+                }
+            },
+            edges={},
+        )
+        self.mock_tigergraph_api.get_schema.return_value = {
+            "VertexTypes": [
+                self._raw_vertex("Person", {"nickname": "STRING"}, {"emb": 3})
+            ],
+            "EdgeTypes": [],
+        }
+        success = """
+Successfully created schema change jobs
+Local schema change succeeded
+Successfully dropped jobs
+Query installation finished
+"""
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "Using graph 'TestGraph'",
+            "  - api_search_Person_emb(...) (installed v2)",
+            success,
+            "",  # No installed queries
+            success,
+        ]
+
+        # Only regular attributes changed, but the search queries project them
+        assert schema_manager.update_schema() is True
+        assert self.mock_tigergraph_api.gsql.call_count == 5
+        gsql_schema_change = self.mock_tigergraph_api.gsql.call_args_list[2][0][0]
+        assert "DROP QUERY api_search_Person_emb" in gsql_schema_change
+        gsql_queries = self.mock_tigergraph_api.gsql.call_args_list[4][0][0]
+        assert 'IF return_attributes.contains("age")' in gsql_queries
+        assert "nickname" not in gsql_queries
+        assert "INSTALL QUERY api_search_Person_emb" in gsql_queries
+
+    def test_update_schema_drops_queries_of_changed_vector_attribute(self):
+        schema_manager = self._create_schema_manager(
+            nodes={
+                "Person": {
+                    "primary_key": "id",
+                    "attributes": {"id": "STRING"},
+                    "vector_attributes": {"emb": 4},
+                }
+            },
+            edges={},
+        )
+        self.mock_tigergraph_api.get_schema.return_value = {
+            "VertexTypes": [self._raw_vertex("Person", {}, {"emb": 3})],
+            "EdgeTypes": [],
+        }
+        existing_queries = "\n".join(
+            f"  - {query_name}(...) (installed v2)"
+            for query_name in [
+                *SchemaManager._get_vector_query_names("Person", "emb"),
+                "api_search_expand_Person_emb_0123456789ab",
+                "api_fetch",
+            ]
+        )
+        success = """
+Successfully created schema change jobs
+Local schema change succeeded
+Successfully dropped jobs
+Query installation finished
+"""
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "Using graph 'TestGraph'",
+            existing_queries,
+            success,
+            "",  # No installed queries
+            success,
+        ]
+
+        assert schema_manager.update_schema() is True
+        gsql_vector_change = self.mock_tigergraph_api.gsql.call_args_list[2][0][0]
+        drop_queries = [
+            line for line in gsql_vector_change.splitlines() if "DROP QUERY" in line
+        ]
+        assert drop_queries == [
+            "DROP QUERY api_fetch_Person_emb",
+            "DROP QUERY api_search_Person_emb",
+            "DROP QUERY api_search_batch_Person_emb",
+            "DROP QUERY api_search_expand_Person_emb_0123456789ab",
+            "DROP QUERY api_similar_Person_emb",
+            "DROP QUERY api_similar_batch_Person_emb",
+        ]
+        assert "ALTER VERTEX Person DROP VECTOR ATTRIBUTE emb;" in gsql_vector_change
+
+    def test_update_schema_type_change_without_drop(self):
+        schema_manager = self._create_schema_manager(
+            nodes={
+                "Person": {
+                    "primary_key": "id",
+                    "attributes": {"id": "STRING", "age": "INT"},
+                }
+            },
+            edges={},
+        )
+        self.mock_tigergraph_api.gsql.return_value = "Using graph 'TestGraph'"
+        self.mock_tigergraph_api.get_schema.return_value = {
+            "VertexTypes": [self._raw_vertex("Person", {"age": "STRING"})],
+            "EdgeTypes": [],
+        }
+        with pytest.raises(ValueError, match="Person.age"):
+            schema_manager.update_schema(drop_removed=False)
+
+    def test_update_schema_primary_key_change(self):
+        schema_manager = self._create_schema_manager(
+            nodes={"Person": {"primary_key": "id", "attributes": {"id": "INT"}}},
+            edges={},
+        )
+        self.mock_tigergraph_api.gsql.return_value = "Using graph 'TestGraph'"
+        self.mock_tigergraph_api.get_schema.return_value = {
+            "VertexTypes": [self._raw_vertex("Person", {})],
+            "EdgeTypes": [],
+        }
+        with pytest.raises(ValueError, match="primary key"):
+            schema_manager.update_schema()
+
+    def test_create_schema_installs_missing_gds(self):
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "Graph TestGraph does not exist",
+            """
+The graph TestGraph is created
+Successfully created schema change jobs
+Local schema change succeeded
+Successfully dropped jobs
+""",
+            "Package GDS does not exist",
+            "Successfully installed functions",
+        ]
+        self.schema_manager.create_schema()
+        install_script = self.mock_tigergraph_api.gsql.call_args_list[3][0][0]
+        assert "IMPORT PACKAGE GDS" in install_script
+        assert "INSTALL FUNCTION GDS.**" in install_script
+
+    def test_install_changed_queries(self):
+        queries = {
+            "query_a": "CREATE OR REPLACE QUERY query_a() {\n  PRINT 1;\n}",
+            "query_b": "CREATE OR REPLACE QUERY query_b() {\n  PRINT 2;\n}",
+        }
+        self.mock_tigergraph_api.gsql.return_value = "Query installation finished"
+        assert self.schema_manager.install_changed_queries(queries) == [
+            "query_a",
+            "query_b",
+        ]
+        gsql_script = self.mock_tigergraph_api.gsql.call_args_list[1][0][0]
+        assert "INSTALL QUERY query_a, query_b" in gsql_script
+
+        # Report what was just installed as the state of the database
+        installed = (
+            gsql_script
+            + "\nQueries:\n  - query_a() (installed v2)\n  - query_b() (installed v2)"
+        )
+        self.mock_tigergraph_api.gsql.reset_mock()
+        self.mock_tigergraph_api.gsql.return_value = installed
+        assert self.schema_manager.install_changed_queries(queries) == []
+        self.mock_tigergraph_api.gsql.assert_called_once()
+
+        # Only the query whose definition changed is reinstalled
+        queries["query_b"] = "CREATE OR REPLACE QUERY query_b() {\n  PRINT 3;\n}"
+        self.mock_tigergraph_api.gsql.side_effect = [
+            installed,
+            "Query installation finished",
+        ]
+        assert self.schema_manager.install_changed_queries(queries) == ["query_b"]
+        gsql_script = self.mock_tigergraph_api.gsql.call_args_list[-1][0][0]
+        assert "QUERY query_a" not in gsql_script
+        assert "INSTALL QUERY query_b" in gsql_script
+
+    def test_install_changed_queries_failure(self):
+        self.mock_tigergraph_api.gsql.return_value = "Failed to install queries"
+        with pytest.raises(RuntimeError):
+            self.schema_manager.install_changed_queries(
+                {"query_a": "CREATE OR REPLACE QUERY query_a() {\n  PRINT 1;\n}"}
+            )
+
+    def test_create_gsql_attribute_projection(self):
+        node_schema = NodeSchema(
+            primary_key="name",
+            attributes={
+                "name": AttributeSchema(data_type=DataType.STRING),
+                "age": AttributeSchema(data_type=DataType.UINT),
+                "score": AttributeSchema(data_type=DataType.DOUBLE),
+                "active": AttributeSchema(data_type=DataType.BOOL),
+                "created": AttributeSchema(data_type=DataType.DATETIME),
+            },
+        )
+        projection = SchemaManager._create_gsql_attribute_projection(node_schema)
+        assert 's.@map_attribute += ("name" -> s.name)' in projection
+        assert 's.@map_attribute += ("age" -> to_string(s.age))' in projection
+        assert 's.@map_double_attribute += ("score" -> s.score)' in projection
+        assert (
+            'IF s.active THEN s.@map_attribute += ("active" -> "true") '
+            'ELSE s.@map_attribute += ("active" -> "false") END'
+        ) in projection
+        assert (
+            's.@map_attribute += ("created" -> '
+            'datetime_format(s.created, "%Y-%m-%d %H:%M:%S"))'
+        ) in projection
+        # Only numeric values are converted with to_string
+        assert projection.count("to_string") == 1
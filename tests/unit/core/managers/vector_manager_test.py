@@ -1,5 +1,7 @@
+import json
 import pytest
 from unittest.mock import MagicMock
+import numpy as np
 
 from tigergraphx.config import (
     GraphSchema,
@@ -7,6 +9,7 @@ from tigergraphx.config import (
     AttributeSchema,
     VectorAttributeSchema,
     DataType,
+    ExpansionSpec,
 )
 from tigergraphx.core.managers.vector_manager import VectorManager
 
@@ -454,6 +457,38 @@ class TestVectorManager:
         assert "value" not in result[0]
         assert "isBlocked" not in result[1]
 
+    def test_search_multi_vector_attributes_rrf(self):
+        def mock_run_installed_query(graph_name, query_name, params):
+            if "emb1" in query_name:
+                distances = {"Account1": 0.1, "Account2": 0.2}
+            else:
+                distances = {"Account2": 0.3, "Account3": 0.05}
+            return [
+                {"map_node_distance": distances},
+                {
+                    "Nodes": [
+                        {"v_id": node_id, "attributes": {"name": node_id}}
+                        for node_id in distances
+                    ]
+                },
+            ]
+
+        self.mock_tigergraph_api.run_installed_query_post.side_effect = (
+            mock_run_installed_query
+        )
+        result = self.vector_manager.search_multi_vector_attributes(
+            data=[-0.0177, -0.0101, -0.0165],
+            vector_attribute_names=["emb1", "emb2"],
+            node_types=["Account", "Account"],
+            limit=3,
+            fusion="rrf",
+        )
+
+        # Account2 is found by both searches, so it ranks first despite its distances
+        assert [item["id"] for item in result] == ["Account2", "Account3", "Account1"]
+        assert result[0]["score"] == pytest.approx(1 / 62 + 1 / 62)
+        assert result[1]["score"] == pytest.approx(1 / 61)
+
     def test_search_multi_vector_attributes_all_attributes(self):
         """
         Test case where all attributes are returned for each node.
@@ -1145,6 +1180,599 @@ class TestVectorManager:
         # Assert that the result is empty
         assert result == []
 
+    def test_search_batch(self):
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [
+            {
+                "map_query_node_distance": {
+                    "0": {"Account2": 0.2, "Account1": 0.1},
+                    "1": {"Account3": 0.3},
+                }
+            },
+            {
+                "Nodes": [
+                    {"v_id": "Account1", "attributes": {"name": "Scott", "value": True}},
+                    {"v_id": "Account2", "attributes": {"name": "Jenny", "value": False}},
+                    {"v_id": "Account3", "attributes": {"name": "Steven", "value": True}},
+                ]
+            },
+        ]
+        results = self.vector_manager.search_batch(
+            data=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]],
+            vector_attribute_name="emb1",
+            node_type="Account",
+            limit=2,
+            return_attributes=["name"],
+        )
+        self.mock_tigergraph_api.run_installed_query_post.assert_called_once_with(
+            "MyGraph",
+            "api_search_batch_Account_emb1",
+            {
+                "k": 2,
+                "dimension": 3,
+                "query_vectors": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+                "set_candidate": [],
+                "return_attributes": ["name"],
+                "project_attributes": True,
+            },
+        )
+        assert results == [
+            [
+                {"id": "Account1", "distance": 0.1, "name": "Scott"},
+                {"id": "Account2", "distance": 0.2, "name": "Jenny"},
+            ],
+            [{"id": "Account3", "distance": 0.3, "name": "Steven"}],
+        ]
+
+    def test_search_with_projected_attributes(self):
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [
+            {"map_node_distance": {"Account1": 0.1}},
+            {
+                "Nodes": [
+                    {
+                        "v_id": "Account1",
+                        "attributes": {
+                            "projected_attributes": {"name": "Scott", "value": "true"}
+                        },
+                    }
+                ]
+            },
+        ]
+        result = self.vector_manager.search(
+            data=[0.1, 0.2, 0.3],
+            vector_attribute_name="emb1",
+            node_type="Account",
+            return_attributes=["name", "value"],
+        )
+        params = self.mock_tigergraph_api.run_installed_query_post.call_args[0][2]
+        assert params["return_attributes"] == ["name", "value"]
+        assert params["project_attributes"] is True
+        assert result == [
+            {"id": "Account1", "distance": 0.1, "name": "Scott", "value": True}
+        ]
+
+    def test_search_with_projected_datetime_and_double_attributes(self):
+        self.vector_manager._graph_schema.nodes["Event"] = NodeSchema(
+            primary_key="id",
+            attributes={
+                "id": AttributeSchema(data_type=DataType.STRING),
+                "score": AttributeSchema(data_type=DataType.DOUBLE),
+                "created": AttributeSchema(data_type=DataType.DATETIME),
+            },
+            vector_attributes={"emb": VectorAttributeSchema(dimension=3)},
+        )
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [
+            {"map_node_distance": {"Event1": 0.1}},
+            {
+                "Nodes": [
+                    {
+                        "v_id": "Event1",
+                        "attributes": {
+                            "projected_attributes": {"created": "2024-01-02 03:04:05"},
+                            "projected_double_attributes": {
+                                "score": 0.12345678901234
+                            },
+                        },
+                    }
+                ]
+            },
+        ]
+        result = self.vector_manager.search(
+            data=[0.1, 0.2, 0.3],
+            vector_attribute_name="emb",
+            node_type="Event",
+            return_attributes=["created", "score"],
+        )
+        assert result == [
+            {
+                "id": "Event1",
+                "distance": 0.1,
+                "created": "2024-01-02 03:04:05",
+                "score": 0.12345678901234,
+            }
+        ]
+
+    def test_search_with_filter_expression(self):
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "",  # No installed queries
+            "Query installation finished",
+        ]
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [
+            {"map_node_distance": {"Account1": 0.1}},
+            {"Nodes": [{"v_id": "Account1", "attributes": {"name": "Scott"}}]},
+        ]
+        result = self.vector_manager.search(
+            data=[0.1, 0.2, 0.3],
+            vector_attribute_name="emb1",
+            node_type="Account",
+            filter_expression='s.name == "Scott" AND s.value == true',
+        )
+        assert result == [{"id": "Account1", "distance": 0.1, "name": "Scott"}]
+
+        gsql_script = self.mock_tigergraph_api.gsql.call_args_list[1][0][0]
+        assert "STRING filter_param_0," in gsql_script
+        assert (
+            "Candidates = SELECT s FROM Candidates:s "
+            "WHERE s.name == filter_param_0 AND s.value == true;"
+        ) in gsql_script
+        # No search is run when the filter matches no nodes
+        assert "Nodes (Account) = {};" in gsql_script
+        assert "IF Candidates.size() > 0 THEN" in gsql_script
+        _, query_name, params = (
+            self.mock_tigergraph_api.run_installed_query_post.call_args[0]
+        )
+        assert query_name.startswith("api_search_filter_Account_emb1_")
+        assert params["filter_param_0"] == "Scott"
+
+        # A filter of the same shape reuses the installed query
+        self.vector_manager.search(
+            data=[0.1, 0.2, 0.3],
+            vector_attribute_name="emb1",
+            node_type="Account",
+            filter_expression='s.name == "Jenny" AND s.value == true',
+        )
+        assert self.mock_tigergraph_api.gsql.call_count == 2
+        _, reused_query_name, params = (
+            self.mock_tigergraph_api.run_installed_query_post.call_args[0]
+        )
+        assert reused_query_name == query_name
+        assert params["filter_param_0"] == "Jenny"
+
+        # After a schema change, the query is checked and installed again
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "",  # No installed queries
+            "Query installation finished",
+        ]
+        self.vector_manager.reset_installed_queries()
+        self.vector_manager.search(
+            data=[0.1, 0.2, 0.3],
+            vector_attribute_name="emb1",
+            node_type="Account",
+            filter_expression='s.name == "Jenny" AND s.value == true',
+        )
+        assert self.mock_tigergraph_api.gsql.call_count == 4
+
+    def test_search_and_expand(self):
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "",  # No installed queries
+            "Query installation finished",
+        ]
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [
+            {"map_node_distance": {"Account1": 0.2, "Account2": 0.1}},
+            {
+                "Nodes": [
+                    {"v_id": "Account1", "attributes": {"name": "Scott"}},
+                    {"v_id": "Account2", "attributes": {"name": "Jenny"}},
+                ]
+            },
+            {
+                "Expansion_0": [
+                    {"v_id": "Phone1", "attributes": {"number": "123", "isBlocked": False}}
+                ]
+            },
+            {"Expansion_1": []},
+        ]
+        expansions = [
+            ExpansionSpec(
+                name="phones",
+                edge_type_set={"hasPhone"},
+                target_node_type_set={"Phone"},
+                return_attributes=["number", "isBlocked"],
+                limit=5,
+            ),
+            ExpansionSpec(name="accounts", target_node_type_set={"Account"}, max_hops=2),
+        ]
+        result = self.vector_manager.search_and_expand(
+            data=[0.1, 0.2, 0.3],
+            vector_attribute_name="emb1",
+            node_type="Account",
+            expansions=expansions,
+            limit=2,
+        )
+        assert result == {
+            "seeds": [
+                {"id": "Account2", "distance": 0.1, "name": "Jenny"},
+                {"id": "Account1", "distance": 0.2, "name": "Scott"},
+            ],
+            "phones": [{"number": "123", "isBlocked": False}],
+            "accounts": [],
+        }
+
+        gsql_script = self.mock_tigergraph_api.gsql.call_args_list[1][0][0]
+        assert "OrAccum @visited_0;" in gsql_script
+        assert "FROM Frontier_0:s -(hasPhone:e)- Phone:t" in gsql_script
+        assert "Expansion_0 = SELECT t FROM Reached_0:t LIMIT 5;" in gsql_script
+        assert (
+            "PRINT Expansion_0[Expansion_0.number AS number, "
+            "Expansion_0.isBlocked AS isBlocked];"
+        ) in gsql_script
+        # Intermediate hops may pass through any node type
+        assert "FROM Frontier_1:s -(:e)- :t" in gsql_script
+        assert "FROM Frontier_1:s -(:e)- Account:t" in gsql_script
+        assert (
+            'Expansion_1 = SELECT t FROM Reached_1:t WHERE t.type IN ("Account");'
+        ) in gsql_script
+        _, query_name, params = (
+            self.mock_tigergraph_api.run_installed_query_post.call_args[0]
+        )
+        assert query_name.startswith("api_search_expand_Account_emb1_")
+        assert params == {"k": 2, "query_vector": [0.1, 0.2, 0.3], "set_candidate": []}
+
+        # Expansions of the same shape reuse the installed query
+        self.vector_manager.search_and_expand(
+            data=[0.3, 0.2, 0.1],
+            vector_attribute_name="emb1",
+            node_type="Account",
+            expansions=expansions,
+        )
+        assert self.mock_tigergraph_api.gsql.call_count == 2
+        assert (
+            self.mock_tigergraph_api.run_installed_query_post.call_args[0][1]
+            == query_name
+        )
+
+    def test_search_and_expand_ranked(self):
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "",  # No installed queries
+            "Query installation finished",
+        ]
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [
+            {"map_node_distance": {"Account1": 0.2}},
+            {"Nodes": [{"v_id": "Account1", "attributes": {"name": "Scott"}}]},
+            {
+                "Expansion_0": [
+                    {"v_id": "Phone2", "attributes": {"number": "2", "score": 0.5}},
+                    {"v_id": "Phone1", "attributes": {"number": "1", "score": 0.9}},
+                ]
+            },
+        ]
+        expansions = [
+            ExpansionSpec(
+                name="phones",
+                target_node_type_set={"Phone"},
+                return_attributes=["number"],
+                order_by="score",
+                token_count_attribute="n_tokens",
+                max_tokens=100,
+            )
+        ]
+        result = self.vector_manager.search_and_expand(
+            data=[0.1, 0.2, 0.3],
+            vector_attribute_name="emb1",
+            node_type="Account",
+            expansions=expansions,
+        )
+        # The nodes are sorted by the ranking attribute, which is not returned
+        assert result["phones"] == [{"number": "1"}, {"number": "2"}]
+
+        gsql_script = self.mock_tigergraph_api.gsql.call_args_list[1][0][0]
+        assert (
+            "TYPEDEF TUPLE<VERTEX v, DOUBLE score, INT tokens> Ranked_0;" in gsql_script
+        )
+        assert "HeapAccum<Ranked_0>(1, score DESC) @@ranked_0;" in gsql_script
+        assert (
+            "IF Reached_0.size() > 0 THEN @@ranked_0.resize(Reached_0.size()); END;"
+        ) in gsql_script
+        assert (
+            "POST-ACCUM @@ranked_0 += Ranked_0(t, t.score, t.n_tokens);" in gsql_script
+        )
+        assert "IF @@used_tokens_0 + item.tokens > 100 THEN" in gsql_script
+        assert "Expansion_0 = {@@selected_0};" in gsql_script
+        assert (
+            "PRINT Expansion_0[Expansion_0.number AS number, "
+            "Expansion_0.score AS score];"
+        ) in gsql_script
+
+    def test_search_with_filter_expression_no_matches(self):
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "",  # No installed queries
+            "Query installation finished",
+        ]
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [
+            {"map_node_distance": {}},
+            {"Nodes": []},
+        ]
+        result = self.vector_manager.search(
+            data=[0.1, 0.2, 0.3],
+            vector_attribute_name="emb1",
+            node_type="Account",
+            filter_expression='s.name == "Nobody"',
+        )
+        assert result == []
+
+    def test_search_and_expand_multiple_edge_types(self):
+        spec = ExpansionSpec(
+            name="contacts",
+            edge_type_set={"hasPhone", "hasEmail"},
+            target_node_type_set={"Phone", "Email"},
+        )
+        statements = VectorManager._create_gsql_expansion(0, spec)
+        assert (
+            "FROM Frontier_0:s -((hasEmail|hasPhone):e)- (Email|Phone):t" in statements
+        )
+
+    def test_expansion_spec_requires_token_count_attribute(self):
+        with pytest.raises(ValueError):
+            ExpansionSpec(name="phones", max_tokens=100)
+
+    def test_search_and_expand_error(self):
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "",  # No installed queries
+            "Query installation finished",
+        ]
+        self.mock_tigergraph_api.run_installed_query_post.side_effect = Exception(
+            "Query failed"
+        )
+        result = self.vector_manager.search_and_expand(
+            data=[0.1, 0.2, 0.3],
+            vector_attribute_name="emb1",
+            node_type="Account",
+            expansions=[ExpansionSpec(name="phones")],
+        )
+        assert result == {"seeds": [], "phones": []}
+
+    def test_parameterize_filter_expression(self):
+        filter_shape, parameter_types, filter_params = (
+            VectorManager._parameterize_filter_expression(
+                's.category == "x" AND s.price < 50 and (s.score >= 0.5 OR '
+                "NOT s.attr2 > -1) AND s.active == TRUE",
+                {"category", "price", "score", "attr2", "active"},
+            )
+        )
+        assert filter_shape == (
+            "s.category == filter_param_0 AND s.price < filter_param_1 "
+            "AND (s.score >= filter_param_2 OR NOT s.attr2 > filter_param_3) "
+            "AND s.active == true"
+        )
+        assert parameter_types == ["STRING", "INT", "DOUBLE", "INT"]
+        assert filter_params == {
+            "filter_param_0": "x",
+            "filter_param_1": 50,
+            "filter_param_2": 0.5,
+            "filter_param_3": -1,
+        }
+
+    @pytest.mark.parametrize(
+        "filter_expression",
+        [
+            "s.year > 2000 } ; DROP ALL //",
+            "s.year > 2000; DROP ALL",
+            "s.year > 2000 /* comment */",
+            "s.missing > 1",
+            "t.year > 1",
+            "s.year > 1 AND",
+            "(s.year > 1",
+            "s.year > 1)",
+            "s.year > > 1",
+            "1 == 1",
+            "s.year IN (1, 2)",
+            "s.year > 1 s.year < 3",
+            's.name == "unterminated',
+            "",
+        ],
+    )
+    def test_parameterize_filter_expression_rejects_invalid(self, filter_expression):
+        with pytest.raises(ValueError):
+            VectorManager._parameterize_filter_expression(
+                filter_expression, {"year", "name"}
+            )
+
+    def test_search_with_invalid_filter_expression(self):
+        with pytest.raises(ValueError, match="Unknown attribute"):
+            self.vector_manager.search(
+                data=[0.1, 0.2, 0.3],
+                vector_attribute_name="emb1",
+                node_type="Account",
+                filter_expression="s.year > 2000 } ; DROP ALL //",
+            )
+        self.mock_tigergraph_api.gsql.assert_not_called()
+
+    def test_search_with_filter_expression_install_failure(self):
+        self.mock_tigergraph_api.gsql.side_effect = [
+            "",  # No installed queries
+            "Semantic Check Fails",
+        ]
+        with pytest.raises(RuntimeError, match="Query installation failed"):
+            self.vector_manager.search(
+                data=[0.1, 0.2, 0.3],
+                vector_attribute_name="emb1",
+                node_type="Account",
+                filter_expression='s.name == "Scott"',
+            )
+        self.mock_tigergraph_api.run_installed_query_post.assert_not_called()
+
+    def test_search_top_k_similar_nodes(self):
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [
+            {"map_node_distance": {"Account3": 0.3, "Account2": 0.2}},
+            {
+                "Nodes": [
+                    {"v_id": "Account3", "attributes": {"name": "Steven"}},
+                    {"v_id": "Account2", "attributes": {"name": "Jenny"}},
+                ]
+            },
+        ]
+        result = self.vector_manager.search_top_k_similar_nodes(
+            node_id="Account1",
+            vector_attribute_name="emb1",
+            node_type="Account",
+            limit=2,
+        )
+        self.mock_tigergraph_api.run_installed_query_post.assert_called_once_with(
+            "MyGraph",
+            "api_similar_Account_emb1",
+            {"source": {"id": "Account1", "type": "Account"}, "k": 2},
+        )
+        self.mock_tigergraph_api.run_installed_query_get.assert_not_called()
+        assert result == [
+            {"id": "Account2", "distance": 0.2, "name": "Jenny"},
+            {"id": "Account3", "distance": 0.3, "name": "Steven"},
+        ]
+
+    def test_search_top_k_similar_nodes_batch(self):
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [
+            {
+                "map_source_node_distance": {
+                    "Account1": {"Account2": 0.2, "Account3": 0.3},
+                    "Account2": {"Account1": 0.2},
+                }
+            },
+            {
+                "Nodes": [
+                    {"v_id": "Account1", "attributes": {"name": "Scott"}},
+                    {"v_id": "Account2", "attributes": {"name": "Jenny"}},
+                    {"v_id": "Account3", "attributes": {"name": "Steven"}},
+                ]
+            },
+        ]
+        result = self.vector_manager.search_top_k_similar_nodes_batch(
+            node_ids=["Account1", "Account2", "Account4"],
+            vector_attribute_name="emb1",
+            node_type="Account",
+            limit=1,
+        )
+        _, query_name, params = (
+            self.mock_tigergraph_api.run_installed_query_post.call_args[0]
+        )
+        assert query_name == "api_similar_batch_Account_emb1"
+        assert params["sources"][0] == {"id": "Account1", "type": "Account"}
+        assert result == {
+            "Account1": [{"id": "Account2", "distance": 0.2, "name": "Jenny"}],
+            "Account2": [{"id": "Account1", "distance": 0.2, "name": "Scott"}],
+            "Account4": [],
+        }
+
+    def test_upsert_vectors(self):
+        self.mock_tigergraph_api.upsert_graph_data.return_value = [
+            {"accepted_vertices": 2}
+        ]
+        matrix = np.array([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6], [0.7, 0.8, 0.9]])
+        result = self.vector_manager.upsert_vectors(
+            ["Scott", "Jenny", "Steven"], matrix, "emb1", "Account", batch_size=2
+        )
+        assert result == 4
+        payloads = [
+            json.loads(call[0][1])
+            for call in self.mock_tigergraph_api.upsert_graph_data.call_args_list
+        ]
+        vertices = {}
+        for payload in payloads:
+            vertices.update(payload["vertices"]["Account"])
+        assert vertices == {
+            "Scott": {"emb1": {"value": [0.1, 0.2, 0.3]}},
+            "Jenny": {"emb1": {"value": [0.4, 0.5, 0.6]}},
+            "Steven": {"emb1": {"value": [0.7, 0.8, 0.9]}},
+        }
+
+    def test_upsert_vectors_invalid_matrix(self):
+        with pytest.raises(ValueError):
+            self.vector_manager.upsert_vectors(
+                ["Scott"], np.array([[0.1, 0.2]]), "emb1", "Account"
+            )
+        with pytest.raises(ValueError):
+            self.vector_manager.upsert_vectors(
+                ["Scott"], np.array([[0.1, np.nan, 0.3]]), "emb1", "Account"
+            )
+        with pytest.raises(ValueError):
+            self.vector_manager.upsert_vectors(
+                ["Scott", "Jenny"], np.array([[0.1, 0.2, 0.3]]), "emb1", "Account"
+            )
+        self.mock_tigergraph_api.upsert_graph_data.assert_not_called()
+
+    def test_fetch_vectors(self):
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [
+            {
+                "Nodes": [
+                    {"v_id": "Jenny", "Embeddings": {"emb1": [0.4, 0.5, 0.6]}},
+                    {"v_id": "Scott", "Embeddings": {"emb1": [0.1, 0.2, 0.3]}},
+                ]
+            }
+        ]
+        node_ids, matrix = self.vector_manager.fetch_vectors(
+            ["Scott", "Unknown", "Jenny"], "emb1", "Account"
+        )
+        # The IDs are sent in the body of a POST request
+        self.mock_tigergraph_api.run_installed_query_get.assert_not_called()
+        self.mock_tigergraph_api.run_installed_query_post.assert_called_once_with(
+            "MyGraph",
+            "api_fetch_Account_emb1",
+            {
+                "input": [
+                    {"id": "Scott", "type": "Account"},
+                    {"id": "Unknown", "type": "Account"},
+                    {"id": "Jenny", "type": "Account"},
+                ]
+            },
+        )
+        assert node_ids == ["Scott", "Jenny"]
+        assert matrix.dtype == np.float32
+        assert matrix.flags["C_CONTIGUOUS"]
+        np.testing.assert_allclose(matrix, [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
+
+    def test_fetch_vectors_not_found(self):
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [{"Nodes": []}]
+        node_ids, matrix = self.vector_manager.fetch_vectors(["Unknown"], "emb1", "Account")
+        assert node_ids == []
+        assert matrix.shape == (0, 3)
+
+        self.mock_tigergraph_api.run_installed_query_post.side_effect = Exception("err")
+        node_ids, matrix = self.vector_manager.fetch_vectors(["Scott"], "emb1", "Account")
+        assert node_ids == []
+        assert matrix.shape == (0, 3)
+
+    def test_fetch_vectors_invalid_format(self):
+        self.mock_tigergraph_api.run_installed_query_post.return_value = [
+            {
+                "Nodes": [
+                    {"v_id": "Scott", "Embeddings": {"emb1": [0.1, 0.2, 0.3]}},
+                    {"v_id": "Jenny", "Embeddings": {"emb1": [0.4, 0.5]}},
+                ]
+            }
+        ]
+        with pytest.raises(ValueError):
+            self.vector_manager.fetch_vectors(["Scott", "Jenny"], "emb1", "Account")
+
+    def test_search_batch_invalid_input(self):
+        with pytest.raises(ValueError):
+            self.vector_manager.search_batch(
+                data=[[0.1, 0.2, 0.3], [0.4, 0.5]],
+                vector_attribute_name="emb1",
+                node_type="Account",
+            )
+        assert (
+            self.vector_manager.search_batch(
+                data=[], vector_attribute_name="emb1", node_type="Account"
+            )
+            == []
+        )
+
+    def test_search_batch_invalid_result(self):
+        self.mock_tigergraph_api.run_installed_query_post.return_value = []
+        results = self.vector_manager.search_batch(
+            data=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]],
+            vector_attribute_name="emb1",
+            node_type="Account",
+        )
+        assert results == [[], []]
+
     def test_version_check_fails_below_4_2(self):
         """
         Ensure that using VectorManager methods on versions below 4.2.0 raises an error.
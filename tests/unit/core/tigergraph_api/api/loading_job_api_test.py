@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import MagicMock
+
+from tigergraphx.core.tigergraph_api.api import LoadingJobAPI
+from tigergraphx.config import TigerGraphConnectionConfig
+
+
+class TestLoadingJobAPI:
+    @pytest.fixture
+    def loading_job_api(self):
+        """Fixture for initializing LoadingJobAPI with mocked dependencies."""
+        api = LoadingJobAPI(
+            config=TigerGraphConnectionConfig(),
+            endpoint_registry=MagicMock(),
+            session=MagicMock(),
+        )
+        api._request = MagicMock()
+        return api
+
+    def test_run_loading_job(self, loading_job_api):
+        loading_job_api._request.return_value = {
+            "jobIds": {"job_1": "MyGraph.job_1.file.m1.1"}
+        }
+        job_id = loading_job_api.run_loading_job(
+            "MyGraph",
+            "job_1",
+            {"f1": "/data/a.csv", "f2": "$s3_source:s3://bucket/b.csv"},
+            max_num_error=10,
+        )
+        assert job_id == "MyGraph.job_1.file.m1.1"
+        loading_job_api._request.assert_called_once_with(
+            endpoint_name="run_loading_job",
+            json=[
+                {
+                    "name": "job_1",
+                    "dataSources": [
+                        {"filename": "f1", "name": "file", "path": "/data/a.csv"},
+                        {
+                            "filename": "f2",
+                            "name": "s3_source",
+                            "path": "s3://bucket/b.csv",
+                        },
+                    ],
+                    "maxNumError": 10,
+                }
+            ],
+            graph_name="MyGraph",
+        )
+
+    def test_run_loading_job_unexpected_response(self, loading_job_api):
+        loading_job_api._request.return_value = "Unexpected message"
+        with pytest.raises(TypeError):
+            loading_job_api.run_loading_job("MyGraph", "job_1", {"f1": "/a.csv"})
+
+    def test_run_loading_job_with_data(self, loading_job_api):
+        loading_job_api._request.return_value = [{"statistics": {"validLine": 1}}]
+        result = loading_job_api.run_loading_job_with_data(
+            "MyGraph", "job_1", "f1", "name\nAlice\n"
+        )
+        assert result == [{"statistics": {"validLine": 1}}]
+        loading_job_api._request.assert_called_once_with(
+            endpoint_name="run_loading_job_with_data",
+            params={"tag": "job_1", "filename": "f1", "sep": ",", "eol": "\n"},
+            data=b"name\nAlice\n",
+            graph_name="MyGraph",
+        )
+
+    def test_get_loading_job_status(self, loading_job_api):
+        loading_job_api._request.return_value = [{"status": "RUNNING"}]
+        assert loading_job_api.get_loading_job_status("MyGraph", "job_id") == {
+            "status": "RUNNING"
+        }
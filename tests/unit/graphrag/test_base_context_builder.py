@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+
+from tigergraphx.graphrag import BaseContextBuilder
+
+
+class CharEncoding:
+    """A token encoder with one token per character."""
+
+    name = "chars"
+
+    def encode_batch(self, texts, **kwargs):
+        return [list(text) for text in texts]
+
+
+class ContextBuilder(BaseContextBuilder):
+    async def build_context(self, *args, **kwargs):
+        return ""
+
+
+# The header "-----S-----\nid|text\n" counts 20 tokens
+HEADER = "-----S-----\nid|text\n"
+
+
+class TestBatchAndConvertToText:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.builder = ContextBuilder(graph=MagicMock(), token_encoder=CharEncoding())
+        # Rows of 6, 4, 8 and 3 tokens
+        self.data = pd.DataFrame(
+            {"id": [1, 2, 3, 4], "text": ["aaaa", "bb", "cccccc", "d"]}
+        )
+
+    def test_all_rows_fit(self):
+        batches = self.builder.batch_and_convert_to_text(self.data, "S")
+        assert batches == [HEADER + "1|aaaa\n2|bb\n3|cccccc\n4|d"]
+
+    def test_budget_overflow(self):
+        # 10 tokens are left for the rows of every batch
+        batches = self.builder.batch_and_convert_to_text(
+            self.data, "S", max_tokens=len(HEADER) + 10
+        )
+        assert batches == [
+            HEADER + "1|aaaa\n2|bb",
+            HEADER + "3|cccccc",
+            HEADER + "4|d",
+        ]
+
+    def test_first_row_exceeds_budget(self):
+        data = pd.DataFrame({"id": [1, 2], "text": ["x" * 20, "y"]})
+        batches = self.builder.batch_and_convert_to_text(
+            data, "S", max_tokens=len(HEADER) + 10
+        )
+        # The first batch stays empty, and the oversized row gets a batch of its own
+        assert batches == [
+            HEADER.strip(),
+            HEADER + "1|" + "x" * 20,
+            HEADER + "2|y",
+        ]
+        single_batch = self.builder.batch_and_convert_to_text(
+            data, "S", single_batch=True, max_tokens=len(HEADER) + 10
+        )
+        assert single_batch == HEADER.strip()
+
+    def test_single_batch(self):
+        batch = self.builder.batch_and_convert_to_text(
+            self.data, "S", single_batch=True, max_tokens=len(HEADER) + 10
+        )
+        assert batch == HEADER + "1|aaaa\n2|bb"
+
+    def test_single_batch_with_many_rows(self):
+        # Rows are tokenized in growing chunks, beyond the first chunk of 64 rows
+        data = pd.DataFrame({"id": range(1000, 1300), "text": ["x"] * 300})
+        batch = self.builder.batch_and_convert_to_text(
+            data, "S", single_batch=True, max_tokens=len(HEADER) + 6 * 100
+        )
+        rows = batch.splitlines()[2:]
+        assert len(rows) == 100
+        assert rows[-1] == "1099|x"
+
+    def test_token_count_columns(self):
+        data = pd.DataFrame(
+            {
+                "id": [1, 2, 3],
+                "text": ["a" * 50, "b" * 50, "cc"],
+                "n_tokens": [1, 1, np.nan],
+            }
+        )
+        batches = self.builder.batch_and_convert_to_text(
+            data,
+            "S",
+            max_tokens=len(HEADER) + 8,
+            token_count_columns={"text": "n_tokens"},
+        )
+        # Rows with counts take 2 + 1 tokens, the row without is tokenized (4)
+        assert batches == [
+            HEADER + f"1|{'a' * 50}\n2|{'b' * 50}",
+            HEADER + "3|cc",
+        ]
@@ -0,0 +1,46 @@
+from tigergraphx.graphrag import ContextCache
+
+
+class TestContextCache:
+    def test_memory_cache(self):
+        cache = ContextCache()
+        assert cache.get("key") is None
+        cache.set("key", ["batch 1", "batch 2"], version="v1")
+        assert cache.get("key", version="v1") == ["batch 1", "batch 2"]
+        # Batches built from another version are a miss
+        assert cache.get("key", version="v2") is None
+        assert cache.get("key") is None
+
+    def test_returned_batches_are_copies(self):
+        cache = ContextCache()
+        cache.set("key", ["batch"])
+        cache.get("key").append("other")
+        assert cache.get("key") == ["batch"]
+
+    def test_persistence(self, tmp_path):
+        ContextCache(tmp_path).set("key", ["batch"], version="v1")
+        reopened = ContextCache(tmp_path)
+        assert reopened.get("key", version="v1") == ["batch"]
+        assert reopened.get("other") is None
+        # No temporary files are left behind
+        assert [path.suffix for path in tmp_path.iterdir()] == [".json"]
+
+    def test_invalidate(self, tmp_path):
+        cache = ContextCache(tmp_path)
+        cache.set("key_1", ["batch 1"])
+        cache.set("key_2", ["batch 2"])
+        cache.invalidate("key_1")
+        assert cache.get("key_1") is None
+        assert ContextCache(tmp_path).get("key_1") is None
+        assert ContextCache(tmp_path).get("key_2") == ["batch 2"]
+
+        cache.invalidate()
+        assert cache.get("key_2") is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unreadable_file(self, tmp_path):
+        cache = ContextCache(tmp_path)
+        cache.set("key", ["batch"])
+        for path in tmp_path.iterdir():
+            path.write_text("not json")
+        assert ContextCache(tmp_path).get("key") is None
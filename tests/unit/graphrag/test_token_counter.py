@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from tigergraphx.graphrag import TokenCounter, get_token_counter
+
+
+class FakeEncoding:
+    """A token encoder with one token per character, counting encoded texts."""
+
+    def __init__(self, name="fake"):
+        self.name = name
+        self.encoded_texts = []
+
+    def encode_batch(self, texts, **kwargs):
+        self.encoded_texts.extend(texts)
+        return [list(text) for text in texts]
+
+
+class TestTokenCounter:
+    def test_count(self):
+        encoding = FakeEncoding()
+        counter = TokenCounter(encoding)
+        assert counter.count("abc") == 3
+        assert counter.count("abc") == 3
+        assert encoding.encoded_texts == ["abc"]
+        assert counter.get_stats() == {"hits": 1, "misses": 1}
+
+    def test_count_batch_deduplicates_texts(self):
+        encoding = FakeEncoding()
+        counter = TokenCounter(encoding)
+        counts = counter.count_batch(["ab", "cde", "ab", "", "cde"])
+        assert counts.dtype == np.int64
+        assert counts.tolist() == [2, 3, 2, 0, 3]
+        # Repeated texts are encoded once, in a single call
+        assert encoding.encoded_texts == ["ab", "cde", ""]
+        assert counter.get_stats() == {"hits": 0, "misses": 5}
+
+    def test_lru_eviction(self):
+        encoding = FakeEncoding()
+        counter = TokenCounter(encoding, max_items=2)
+        counter.count_batch(["a", "bb"])
+        counter.count("a")
+        counter.count("ccc")
+        # "bb" was the least recently used
+        counter.count_batch(["a", "ccc", "bb"])
+        assert encoding.encoded_texts == ["a", "bb", "ccc", "bb"]
+
+    def test_add_token_counts(self):
+        counter = TokenCounter(FakeEncoding())
+        data = pd.DataFrame({"id": [1, 2, 3], "text": ["abc", None, np.nan]})
+        result = counter.add_token_counts(data, "text", "tokens")
+        assert result["tokens"].tolist() == [3, 0, 0]
+        # The input is not modified
+        assert "tokens" not in data.columns
+
+    def test_get_token_counter(self):
+        encoding = FakeEncoding("shared")
+        counter = get_token_counter(encoding)
+        assert get_token_counter(FakeEncoding("shared")) is counter
+        assert counter.token_encoder is encoding
+        assert get_token_counter(FakeEncoding("other")) is not counter
@@ -0,0 +1,138 @@
+import pytest
+
+from tigergraphx.config import OpenAIChatConfig
+from tigergraphx.llm import BaseChat, CachedChat
+
+
+class CountingChat(BaseChat):
+    """A chat model that echoes the last message and counts calls."""
+
+    def __init__(self, model="gpt-4o-mini"):
+        super().__init__(OpenAIChatConfig(model=model))
+        self.requests = []
+
+    async def chat(self, messages):
+        self.requests.append(messages)
+        return f"re: {messages[-1]['content']}" if messages[-1]["content"] else ""
+
+
+def user(content):
+    return [{"role": "user", "content": content}]
+
+
+class TestCachedChat:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.cache_dir = tmp_path / "cache"
+        self.model = CountingChat()
+        self.chat = CachedChat(self.model, cache_dir=self.cache_dir)
+
+    @pytest.mark.asyncio
+    async def test_chat(self):
+        assert await self.chat.chat(user("hi")) == "re: hi"
+        assert await self.chat.chat(user("hi")) == "re: hi"
+        assert await self.chat.chat(user("ho")) == "re: ho"
+        assert self.model.requests == [user("hi"), user("ho")]
+        assert self.chat.get_stats() == {
+            "memory_hits": 1,
+            "disk_hits": 0,
+            "misses": 2,
+            "hit_rate": 1 / 3,
+        }
+
+    @pytest.mark.asyncio
+    async def test_empty_responses_are_not_cached(self):
+        await self.chat.chat(user(""))
+        await self.chat.chat(user(""))
+        assert len(self.model.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_persistence(self):
+        await self.chat.chat(user("hi"))
+        self.chat.close()
+
+        model = CountingChat()
+        reopened = CachedChat(model, cache_dir=self.cache_dir)
+        assert await reopened.chat(user("hi")) == "re: hi"
+        assert model.requests == []
+        assert reopened.get_stats()["disk_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_key_includes_model(self):
+        await self.chat.chat(user("hi"))
+        self.chat.close()
+
+        model = CountingChat(model="gpt-4o")
+        other = CachedChat(model, cache_dir=self.cache_dir)
+        await other.chat(user("hi"))
+        assert model.requests == [user("hi")]
+
+    @pytest.mark.asyncio
+    async def test_ttl(self, monkeypatch):
+        now = 1000.0
+        monkeypatch.setattr("tigergraphx.llm.chat.cached_chat.time.time", lambda: now)
+        chat = CachedChat(self.model, cache_dir=self.cache_dir, ttl=60)
+        await chat.chat(user("hi"))
+        now += 30
+        await chat.chat(user("hi"))
+        assert len(self.model.requests) == 1
+        # Expired responses are requested again from both tiers
+        now += 31
+        await chat.chat(user("hi"))
+        assert len(self.model.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_size_bounds(self):
+        chat = CachedChat(
+            self.model, cache_dir=self.cache_dir, max_memory_items=1, max_disk_items=2
+        )
+        for content in ["a", "b", "c"]:
+            await chat.chat(user(content))
+        # "a" was evicted from both tiers, "b" is served from disk
+        await chat.chat(user("b"))
+        await chat.chat(user("a"))
+        assert self.model.requests == [user("a"), user("b"), user("c"), user("a")]
+        assert chat.get_stats()["disk_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_memory_hits_refresh_disk_entries(self, monkeypatch):
+        now = 1000.0
+        monkeypatch.setattr("tigergraphx.llm.chat.cached_chat.time.time", lambda: now)
+        chat = CachedChat(
+            self.model, cache_dir=self.cache_dir, max_memory_items=2, max_disk_items=2
+        )
+        for content in ["a", "b", "a", "c"]:
+            now += 1
+            await chat.chat(user(content))
+        assert chat.get_stats()["memory_hits"] == 1
+        chat.close()
+
+        # "a" was used after "b", so "b" was evicted from disk instead
+        model = CountingChat()
+        reopened = CachedChat(model, cache_dir=self.cache_dir)
+        for content in ["a", "b", "c"]:
+            await reopened.chat(user(content))
+        assert model.requests == [user("b")]
+
+    def test_accessed_at_index(self):
+        indexes = self.chat._connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'responses' AND sql LIKE '%accessed_at%'"
+        ).fetchall()
+        assert indexes == [("responses_accessed_at",)]
+
+    @pytest.mark.asyncio
+    async def test_disk_count(self):
+        chat = CachedChat(self.model, cache_dir=self.cache_dir, max_disk_items=2)
+        for content in ["a", "b", "a", "c", "d"]:
+            await chat.chat(user(content))
+        assert chat._disk_count == 2
+        assert chat._count_disk_items() == 2
+        chat.clear()
+        assert chat._disk_count == 0
+
+    def test_invalid_bounds(self):
+        with pytest.raises(ValueError):
+            CachedChat(self.model, max_memory_items=0)
+        with pytest.raises(ValueError):
+            CachedChat(self.model, ttl=-1)
@@ -5,6 +5,7 @@ from tigergraphx.config import OpenAIChatConfig
 from tigergraphx.llm import (
     OpenAIManager,
     OpenAIChat,
+    RateLimiter,
 )
 
 
@@ -17,6 +18,7 @@ class TestOpenAIChat:
         manager = MagicMock(spec=OpenAIManager)
         mock_llm = MagicMock()
         manager.get_llm.return_value = mock_llm
+        manager.get_rate_limiter.return_value = RateLimiter()
         return manager
 
     @pytest.fixture
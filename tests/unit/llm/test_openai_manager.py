@@ -4,6 +4,7 @@ from openai import AsyncOpenAI
 from pydantic import ValidationError
 
 from tigergraphx.llm.openai_manager import OpenAIManager
+from tigergraphx.llm.rate_limiter import RateLimiter
 from tigergraphx.config import OpenAIConfig
 
 
@@ -86,6 +87,13 @@ class TestOpenAIManager:
         # Assert that the manager's LLM is set
         assert manager.get_llm() == mock_async_openai.return_value
 
+    def test_client_retries_default_to_zero(self, valid_config_dict, mock_async_openai):
+        """Test that the client leaves retries to the shared rate limiter by default."""
+        valid_config_dict.pop("max_retries")
+        OpenAIManager(valid_config_dict)
+
+        assert mock_async_openai.call_args.kwargs["max_retries"] == 0
+
     def test_init_without_api_key_raises_error(self, valid_config_dict, monkeypatch):
         """Test initialization without an API key raises a ValidationError."""
         # Remove the OPENAI_API_KEY from the environment
@@ -104,3 +112,19 @@ class TestOpenAIManager:
 
         # Assert that get_llm returns the correct AsyncOpenAI instance
         assert manager.get_llm() == mock_async_openai.return_value
+
+    def test_get_rate_limiter(self, valid_config_dict, mock_async_openai):
+        """Test that the rate limiter is configured from the settings."""
+        valid_config_dict.update(
+            {"requests_per_minute": 60, "tokens_per_minute": 1000, "max_concurrency": 4}
+        )
+        manager = OpenAIManager(valid_config_dict)
+
+        limiter = manager.get_rate_limiter()
+        assert isinstance(limiter, RateLimiter)
+        assert limiter.max_concurrency == 4
+        assert limiter.concurrency_limit == 4
+        assert limiter._request_bucket.capacity == 60
+        assert limiter._token_bucket.capacity == 1000
+        # The limiter is shared by all users of the manager
+        assert manager.get_rate_limiter() is limiter
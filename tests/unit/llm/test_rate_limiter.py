@@ -0,0 +1,138 @@
+import asyncio
+import httpx
+import pytest
+from openai import (
+    APIConnectionError,
+    AuthenticationError,
+    BadRequestError,
+    InternalServerError,
+    RateLimitError,
+)
+
+from tigergraphx.llm import RateLimiter
+from tigergraphx.utils import RetryMixin, get_retry_after, is_retryable_error
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def make_error(error_class, status_code, headers=None):
+    response = httpx.Response(status_code, headers=headers, request=REQUEST)
+    return error_class("error", response=response, body=None)
+
+
+class TestRetryPolicy:
+    def test_is_retryable_error(self):
+        assert is_retryable_error(make_error(RateLimitError, 429))
+        assert is_retryable_error(make_error(InternalServerError, 503))
+        assert is_retryable_error(APIConnectionError(request=REQUEST))
+        assert not is_retryable_error(make_error(BadRequestError, 400))
+        assert not is_retryable_error(make_error(AuthenticationError, 401))
+        assert not is_retryable_error(ValueError("bug"))
+
+    def test_get_retry_after(self):
+        assert get_retry_after(make_error(RateLimitError, 429)) is None
+        error = make_error(RateLimitError, 429, {"retry-after": "2"})
+        assert get_retry_after(error) == 2.0
+        error = make_error(RateLimitError, 429, {"retry-after-ms": "250"})
+        assert get_retry_after(error) == 0.25
+        error = make_error(RateLimitError, 429, {"retry-after": "soon"})
+        assert get_retry_after(error) is None
+
+    @pytest.mark.asyncio
+    async def test_retryer_only_retries_retryable_errors(self):
+        retryer = RetryMixin().initialize_retryer(max_retries=3, max_wait=0)
+        calls = []
+
+        async def call(error):
+            async for attempt in retryer.copy():
+                with attempt:
+                    calls.append(error)
+                    raise error
+
+        with pytest.raises(BadRequestError):
+            await call(make_error(BadRequestError, 400))
+        assert len(calls) == 1
+
+        calls.clear()
+        with pytest.raises(RateLimitError):
+            await call(make_error(RateLimitError, 429, {"retry-after": "0"}))
+        assert len(calls) == 3
+
+
+class TestRateLimiter:
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            RateLimiter(requests_per_minute=0)
+        with pytest.raises(ValueError):
+            RateLimiter(max_concurrency=2, min_concurrency=3)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        limiter = RateLimiter(max_concurrency=2)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with limiter.limit():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[request() for _ in range(10)])
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_aimd(self):
+        limiter = RateLimiter(max_concurrency=8)
+        with pytest.raises(RateLimitError):
+            async with limiter.limit():
+                raise make_error(RateLimitError, 429)
+        assert limiter.concurrency_limit == 4
+
+        # Errors of the same burst only decrease the limit once
+        limiter.on_rate_limited()
+        assert limiter.concurrency_limit == 4
+
+        # The limit grows by about one per round of successful requests
+        for _ in range(5):
+            async with limiter.limit():
+                pass
+        assert limiter.concurrency_limit == 5
+
+        # Other errors do not change the limit
+        with pytest.raises(ValueError):
+            async with limiter.limit():
+                raise ValueError("bug")
+        assert limiter.concurrency_limit == 5
+        assert limiter.in_flight == 0
+
+    def test_request_budget(self):
+        limiter = RateLimiter(requests_per_minute=60)
+        for _ in range(60):
+            assert limiter._reserve(0) == 0
+        # The budget refills at one request per second
+        assert 0 < limiter._reserve(0) <= 1.0
+
+    def test_token_budget(self):
+        limiter = RateLimiter(tokens_per_minute=600)
+        assert limiter._reserve(500) == 0
+        assert limiter._reserve(50) == 0
+        # 100 more tokens need 50 tokens of refill at 10 tokens per second
+        assert limiter._reserve(100) == pytest.approx(5.0, abs=0.1)
+
+    @pytest.mark.asyncio
+    async def test_record_usage(self):
+        limiter = RateLimiter(tokens_per_minute=600)
+        async with limiter.limit(100) as lease:
+            lease.record_usage(400)
+        # 400 tokens were used in total
+        assert limiter._reserve(200) == 0
+        assert limiter._reserve(10) > 0
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_requests(self):
+        limiter = RateLimiter()
+        with pytest.raises(RateLimitError):
+            async with limiter.limit():
+                raise make_error(RateLimitError, 429, {"retry-after": "30"})
+        assert limiter._reserve(0) == pytest.approx(30.0, abs=0.1)
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from tigergraphx.config import OpenAIEmbeddingConfig
+from tigergraphx.vector_search import BaseEmbedding, CachedEmbedding
+
+
+class CountingEmbedding(BaseEmbedding):
+    """An embedding model that embeds a text as [length, 1] and counts calls."""
+
+    def __init__(self, model="text-embedding-3-small", **config):
+        super().__init__(OpenAIEmbeddingConfig(model=model, **config))
+        self.embedded_texts = []
+
+    async def generate_embedding(self, text):
+        self.embedded_texts.append(text)
+        return [float(len(text)), 1.0] if text else []
+
+
+class TestCachedEmbedding:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.cache_dir = tmp_path / "cache"
+        self.model = CountingEmbedding()
+        self.embedding = CachedEmbedding(self.model, cache_dir=self.cache_dir)
+
+    @pytest.mark.asyncio
+    async def test_generate_embedding(self):
+        assert await self.embedding.generate_embedding("abc") == [3.0, 1.0]
+        assert await self.embedding.generate_embedding("abc") == [3.0, 1.0]
+        assert self.model.embedded_texts == ["abc"]
+        assert self.embedding.get_stats() == {
+            "memory_hits": 1,
+            "disk_hits": 0,
+            "misses": 1,
+            "hit_rate": 0.5,
+        }
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings(self):
+        await self.embedding.generate_embedding("abc")
+        result = await self.embedding.generate_embeddings(["abc", "de", "", "de"])
+        assert result.dtype == np.float32
+        np.testing.assert_allclose(result[[0, 1, 3]], [[3, 1], [2, 1], [2, 1]])
+        assert np.isnan(result[2]).all()
+        # Misses are generated once, and failed embeddings are not cached
+        assert self.model.embedded_texts == ["abc", "de", ""]
+        await self.embedding.generate_embeddings(["de", ""])
+        assert self.model.embedded_texts == ["abc", "de", "", ""]
+
+    @pytest.mark.asyncio
+    async def test_persistence(self):
+        await self.embedding.generate_embeddings(["abc", "de"])
+        self.embedding.close()
+
+        model = CountingEmbedding()
+        reopened = CachedEmbedding(model, cache_dir=self.cache_dir)
+        result = await reopened.generate_embeddings(["abc", "de", "f"])
+        np.testing.assert_allclose(result, [[3, 1], [2, 1], [1, 1]])
+        assert model.embedded_texts == ["f"]
+        assert reopened.get_stats()["disk_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_key_includes_model(self):
+        await self.embedding.generate_embedding("abc")
+        self.embedding.close()
+
+        model = CountingEmbedding(model="text-embedding-3-large")
+        other = CachedEmbedding(model, cache_dir=self.cache_dir)
+        await other.generate_embedding("abc")
+        assert model.embedded_texts == ["abc"]
+
+    @pytest.mark.asyncio
+    async def test_key_includes_generation_config(self):
+        await self.embedding.generate_embedding("abc")
+        self.embedding.close()
+
+        # Truncating inputs differently changes the embeddings
+        model = CountingEmbedding(max_tokens=100)
+        other = CachedEmbedding(model, cache_dir=self.cache_dir)
+        await other.generate_embedding("abc")
+        assert model.embedded_texts == ["abc"]
+        other.close()
+
+        # Retries and request batching do not
+        model = CountingEmbedding(max_retries=1, max_inputs_per_request=10)
+        other = CachedEmbedding(model, cache_dir=self.cache_dir)
+        await other.generate_embedding("abc")
+        assert model.embedded_texts == []
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        embedding = CachedEmbedding(self.model, max_memory_items=2)
+        await embedding.generate_embeddings(["a", "bb", "ccc"])
+        await embedding.generate_embedding("a")
+        # Without an on-disk store, the evicted embedding is generated again
+        assert self.model.embedded_texts == ["a", "bb", "ccc", "a"]
+        assert embedding.hit_rate == 0.0
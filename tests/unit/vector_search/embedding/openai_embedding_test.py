@@ -1,10 +1,13 @@
-from unittest.mock import AsyncMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+import numpy as np
 import pytest
 
 from tigergraphx.config import (
     OpenAIEmbeddingConfig,
     OpenAIConfig,
 )
+from tigergraphx.llm import RateLimiter
 from tigergraphx.vector_search import OpenAIEmbedding
 
 
@@ -38,3 +41,113 @@ class TestOpenAIEmbedding:
                     isinstance(value, float) for value in result
                 )  # Check data type
                 mock_generate_with_retry.assert_called_once()  # Ensure the mock was called
+
+
+class FakeEncoding:
+    """A character-level stand-in for a tiktoken encoding."""
+
+    def encode(self, text):
+        return [ord(char) for char in text]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+    def encode_batch(self, texts):
+        return [self.encode(text) for text in texts]
+
+
+class TestOpenAIEmbeddingBatch:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.mock_llm = MagicMock()
+        self.mock_llm.embeddings.create = AsyncMock(side_effect=self.create_embeddings)
+        mock_manager = MagicMock()
+        mock_manager.get_llm.return_value = self.mock_llm
+        mock_manager.get_rate_limiter.return_value = RateLimiter()
+        with patch("tiktoken.get_encoding", return_value=FakeEncoding()):
+            self.embedding = OpenAIEmbedding(
+                mock_manager,
+                OpenAIEmbeddingConfig(
+                    max_tokens=4,
+                    max_inputs_per_request=3,
+                    max_tokens_per_request=10,
+                    max_retries=1,
+                ),
+            )
+
+    @staticmethod
+    async def create_embeddings(input, model):
+        # Embed every chunk as [number of "a", number of "b"], in reverse order
+        input = [
+            chunk if isinstance(chunk, str) else FakeEncoding().decode(chunk)
+            for chunk in input
+        ]
+        data = [
+            SimpleNamespace(index=i, embedding=[chunk.count("a"), chunk.count("b")])
+            for i, chunk in enumerate(input)
+        ]
+        return SimpleNamespace(data=data[::-1])
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings(self):
+        result = await self.embedding.generate_embeddings(
+            ["aaaabb", "", "b", "aaaa"]
+        )
+        assert result.dtype == np.float32
+        assert result.shape == (4, 2)
+        # "aaaabb" is split into "aaaa" and "bb", weighted by their lengths
+        expected = np.array([4 * 4, 2 * 2], dtype=np.float32)
+        np.testing.assert_allclose(result[0], expected / np.linalg.norm(expected))
+        assert np.isnan(result[1]).all()
+        np.testing.assert_allclose(result[2], [0, 1])
+        np.testing.assert_allclose(result[3], [1, 0])
+
+        # 4 chunks of 4 + 2 + 1 + 4 tokens fit into 2 requests of token IDs
+        a, b = ord("a"), ord("b")
+        calls = self.mock_llm.embeddings.create.call_args_list
+        assert [call.kwargs["input"] for call in calls] == [
+            [[a] * 4, [b] * 2, [b]],
+            [[a] * 4],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_with_text_inputs(self):
+        self.embedding.config.send_token_ids = False
+        result = await self.embedding.generate_embeddings(["aaaabb", "b"])
+        calls = self.mock_llm.embeddings.create.call_args_list
+        assert [call.kwargs["input"] for call in calls] == [["aaaa", "bb", "b"]]
+        np.testing.assert_allclose(result[1], [0, 1])
+
+    @pytest.mark.asyncio
+    async def test_generate_embedding_weights_by_token_count(self):
+        with patch.object(
+            self.embedding,
+            "_generate_with_retry",
+            new=AsyncMock(side_effect=[([1.0, 0.0], 4), ([0.0, 1.0], 2)]),
+        ) as mock_generate:
+            result = await self.embedding.generate_embedding("aaaabb")
+        a, b = ord("a"), ord("b")
+        assert [call.args for call in mock_generate.call_args_list] == [
+            ([a] * 4, 4),
+            ([b] * 2, 2),
+        ]
+        expected = np.array([4.0, 2.0])
+        np.testing.assert_allclose(result, expected / np.linalg.norm(expected))
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_failed_request(self):
+        self.mock_llm.embeddings.create.side_effect = [
+            Exception("Server error"),
+            await self.create_embeddings(["aaaa"], "model"),
+        ]
+        result = await self.embedding.generate_embeddings(["aaaabb", "b", "aaaa"])
+        assert np.isnan(result[:2]).all()
+        np.testing.assert_allclose(result[2], [1, 0])
+
+    def test_pack_requests(self):
+        assert self.embedding._pack_requests([4, 4, 4, 1, 1, 1, 1]) == [
+            (0, 2),
+            (2, 5),
+            (5, 7),
+        ]
+        assert self.embedding._pack_requests([]) == []
@@ -0,0 +1,52 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+import numpy as np
+
+from tigergraphx.vector_search import BaseEmbedding, BaseSearchEngine, BaseVectorDB
+
+
+class TestBaseSearchEngine:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.mock_embedding_model = MagicMock(spec=BaseEmbedding)
+        self.mock_vector_db = MagicMock(spec=BaseVectorDB)
+        self.search_engine = BaseSearchEngine(
+            self.mock_embedding_model, self.mock_vector_db
+        )
+
+    @pytest.mark.asyncio
+    async def test_search(self):
+        self.mock_embedding_model.generate_embedding = AsyncMock(
+            return_value=[0.1, 0.2]
+        )
+        self.mock_vector_db.aquery = AsyncMock(return_value=["id1", "id2"])
+
+        result = await self.search_engine.search("text", k=2)
+
+        assert result == ["id1", "id2"]
+        self.mock_vector_db.aquery.assert_awaited_once_with(
+            query_embedding=[0.1, 0.2], k=2
+        )
+
+    @pytest.mark.asyncio
+    async def test_search_many(self):
+        self.mock_embedding_model.generate_embeddings = AsyncMock(
+            return_value=np.array(
+                [[0.1, 0.2], [np.nan, np.nan], [0.3, 0.4]], dtype=np.float32
+            )
+        )
+        self.mock_vector_db.aquery_batch = AsyncMock(return_value=[["id1"], ["id3"]])
+
+        result = await self.search_engine.search_many(["a", "b", "c"], k=1)
+
+        # Texts without an embedding are not searched
+        assert result == [["id1"], [], ["id3"]]
+        self.mock_embedding_model.generate_embeddings.assert_awaited_once_with(
+            ["a", "b", "c"]
+        )
+        query_embeddings = self.mock_vector_db.aquery_batch.call_args[0][0]
+        np.testing.assert_allclose(query_embeddings, [[0.1, 0.2], [0.3, 0.4]])
+
+    @pytest.mark.asyncio
+    async def test_search_many_empty(self):
+        assert await self.search_engine.search_many([]) == []
@@ -0,0 +1,149 @@
+import pytest
+import pandas as pd
+import numpy as np
+from tigergraphx.vector_search.vector_db.mmap_vectordb_manager import (
+    MmapVectorDBManager,
+)
+from tigergraphx.config import MmapVectorDBConfig
+
+
+def make_data(ids, vectors):
+    return pd.DataFrame({"__id__": ids, "__vector__": list(vectors)})
+
+
+def brute_force(vectors, ids, query, k):
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = vectors @ (query / np.linalg.norm(query))
+    return [ids[i] for i in np.argsort(-scores)[:k]]
+
+
+class TestMmapVectorDBManager:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.storage_dir = tmp_path / "vectordb"
+        rng = np.random.default_rng(42)
+        self.vectors = rng.normal(size=(500, 8)).astype(np.float32)
+        self.ids = [f"id{i}" for i in range(500)]
+        self.queries = rng.normal(size=(5, 8)).astype(np.float32)
+
+    def create_manager(self, **kwargs):
+        config = MmapVectorDBConfig(
+            storage_dir=self.storage_dir, embedding_dim=8, block_size=64, **kwargs
+        )
+        return MmapVectorDBManager(config=config)
+
+    def test_query_flat(self):
+        manager = self.create_manager()
+        manager.insert_data(make_data(self.ids, self.vectors))
+        assert len(manager) == 500
+        for query in self.queries:
+            assert manager.query(query.tolist(), k=7) == brute_force(
+                self.vectors, self.ids, query, 7
+            )
+
+    def test_query_batch(self):
+        manager = self.create_manager()
+        manager.insert_data(make_data(self.ids, self.vectors))
+        results = manager.query_batch(self.queries, k=3)
+        assert results == [
+            brute_force(self.vectors, self.ids, query, 3) for query in self.queries
+        ]
+        assert manager.query_batch([], k=3) == []
+        with pytest.raises(ValueError):
+            manager.query_batch([[0.1, 0.2]], k=3)
+
+    def test_incremental_append_and_upsert(self):
+        manager = self.create_manager()
+        manager.insert_data(make_data(self.ids[:300], self.vectors[:300]))
+        manager.insert_data(make_data(self.ids[300:], self.vectors[300:]))
+        assert len(manager) == 500
+
+        # Re-inserting an ID replaces its vector
+        query = self.queries[0]
+        manager.insert_data(make_data(["id0"], [query]))
+        assert len(manager) == 500
+        assert manager.query(query.tolist(), k=1) == ["id0"]
+        assert manager.query(query.tolist(), k=500).count("id0") == 1
+
+    def test_persistence(self):
+        manager = self.create_manager()
+        manager.insert_data(make_data(self.ids, self.vectors))
+        reopened = self.create_manager()
+        assert len(reopened) == 500
+        assert reopened.query(self.queries[0].tolist(), k=5) == manager.query(
+            self.queries[0].tolist(), k=5
+        )
+
+    def test_refresh_picks_up_appended_rows(self):
+        writer = self.create_manager()
+        reader = self.create_manager()
+        writer.insert_data(make_data(self.ids, self.vectors))
+        assert reader.query(self.queries[0].tolist(), k=5) == []
+        reader.refresh()
+        assert len(reader.query(self.queries[0].tolist(), k=5)) == 5
+
+    def test_mismatched_configuration(self):
+        self.create_manager()
+        with pytest.raises(ValueError):
+            MmapVectorDBManager(
+                config=MmapVectorDBConfig(storage_dir=self.storage_dir, embedding_dim=4)
+            )
+
+    def test_insert_invalid_vectors(self):
+        manager = self.create_manager()
+        with pytest.raises(ValueError):
+            manager.insert_data(make_data(["a"], [np.zeros(4)]))
+        with pytest.raises(ValueError):
+            manager.insert_data(make_data(["a"], [np.full(8, np.nan)]))
+        assert len(manager) == 0
+
+    def test_ivf_index(self):
+        manager = self.create_manager(index_type="ivf", nlist=4, nprobe=4)
+        manager.insert_data(make_data(self.ids, self.vectors))
+        # 500 vectors are enough to train 4 partitions automatically
+        assert manager._centroids is not None
+        # Probing all partitions is exact
+        for query in self.queries:
+            assert manager.query(query.tolist(), k=7) == brute_force(
+                self.vectors, self.ids, query, 7
+            )
+
+        # Appended rows are assigned to partitions and found
+        manager.insert_data(make_data(["new"], [self.queries[0]]))
+        assert manager.query(self.queries[0].tolist(), k=1) == ["new"]
+
+    def test_ivf_reader_does_not_write_assignments(self):
+        ivf_writer = self.create_manager(index_type="ivf", nlist=4, nprobe=4)
+        ivf_writer.insert_data(make_data(self.ids, self.vectors))
+        assignments_path = self.storage_dir / "ivf_assignments.i32"
+        assert assignments_path.stat().st_size == 500 * 4
+
+        # Rows appended without the index have no stored partition
+        flat_writer = self.create_manager()
+        flat_writer.insert_data(make_data(["new"], [self.queries[0]]))
+        reader = self.create_manager(index_type="ivf", nlist=4, nprobe=4)
+        assert reader.query(self.queries[0].tolist(), k=1) == ["new"]
+        assert assignments_path.stat().st_size == 500 * 4
+
+        # The next insert of an IVF writer stores the missing partitions
+        ivf_writer.refresh()
+        ivf_writer.insert_data(make_data(["other"], [self.queries[1]]))
+        assert assignments_path.stat().st_size == 502 * 4
+        np.testing.assert_array_equal(
+            np.fromfile(assignments_path, dtype=np.int32)[500:],
+            ivf_writer._assign(ivf_writer._vectors[500:], ivf_writer._centroids),
+        )
+
+    def test_ivf_nprobe(self):
+        manager = self.create_manager(index_type="ivf", nlist=4, nprobe=1)
+        manager.insert_data(make_data(self.ids, self.vectors))
+        results = manager.query(self.queries[0].tolist(), k=500)
+        # Only the nearest partition is searched
+        assert 0 < len(results) < 500
+        assert len(set(results)) == len(results)
+
+    def test_build_index_requires_enough_vectors(self):
+        manager = self.create_manager(index_type="ivf", nlist=4)
+        manager.insert_data(make_data(self.ids[:3], self.vectors[:3]))
+        with pytest.raises(ValueError):
+            manager.build_index()
@@ -16,17 +16,104 @@ def mock_db():
     return manager
 
 
+@pytest.fixture
+def db():
+    config = NanoVectorDBConfig(embedding_dim=4, storage_file=":memory:")
+    return NanoVectorDBManager(config=config)
+
+
 class TestNanoVectorDBManager:
-    def test_insert_data(self, mock_db):
+    def test_insert_data(self, db):
         data = pd.DataFrame(
             {
                 "__id__": ["id1", "id2"],
-                "__vector__": [np.random.rand(128), np.random.rand(128)],
+                "__vector__": [np.array([3.0, 4.0, 0, 0]), np.array([0, 0, 1.0, 0])],
                 "attribute": ["value1", "value2"],
             }
         )
-        mock_db.insert_data(data)
-        mock_db._db.upsert.assert_called_once()
+        db.insert_data(data)
+        storage = db._storage
+        assert storage["data"] == [
+            {"__id__": "id1", "attribute": "value1"},
+            {"__id__": "id2", "attribute": "value2"},
+        ]
+        np.testing.assert_allclose(
+            storage["matrix"], [[0.6, 0.8, 0, 0], [0, 0, 1, 0]], rtol=1e-6
+        )
+
+        # Existing IDs are updated in place, new ones are appended
+        db.insert_data(
+            pd.DataFrame(
+                {
+                    "__id__": ["id3", "id1"],
+                    "__vector__": [np.array([0, 0, 0, 2.0]), np.array([0, 1.0, 0, 0])],
+                    "attribute": ["value3", "updated"],
+                }
+            )
+        )
+        assert len(db._db) == 3
+        assert storage["data"][0] == {"__id__": "id1", "attribute": "updated"}
+        assert storage["data"][2] == {"__id__": "id3", "attribute": "value3"}
+        np.testing.assert_allclose(storage["matrix"][0], [0, 1, 0, 0])
+        np.testing.assert_allclose(storage["matrix"][2], [0, 0, 0, 1])
+
+    def test_insert_data_after_delete(self, db):
+        ids = ["id1", "id2", "id3"]
+        db.insert_data(pd.DataFrame({"__id__": ids, "__vector__": list(np.eye(4)[:3])}))
+        db._db.delete(["id1"])
+        # The record count is unchanged, but the rows of the remaining IDs moved
+        db.insert_data(
+            pd.DataFrame(
+                {
+                    "__id__": ["id4", "id3"],
+                    "__vector__": [np.array([0, 0, 0, 1.0]), np.array([1.0, 0, 0, 0])],
+                }
+            )
+        )
+        assert [record["__id__"] for record in db._storage["data"]] == [
+            "id2",
+            "id3",
+            "id4",
+        ]
+        np.testing.assert_allclose(
+            db._storage["matrix"], [[0, 1, 0, 0], [1, 0, 0, 0], [0, 0, 0, 1]]
+        )
+
+    def test_insert_data_invalid_dimension(self, db):
+        data = pd.DataFrame({"__id__": ["id1"], "__vector__": [np.ones(3)]})
+        with pytest.raises(ValueError):
+            db.insert_data(data)
+
+    def test_query_batch(self, db):
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(50, 4))
+        ids = [f"id{i}" for i in range(50)]
+        db.insert_data(pd.DataFrame({"__id__": ids, "__vector__": list(vectors)}))
+        queries = rng.normal(size=(3, 4))
+        results = db.query_batch(queries, k=5)
+        assert results == [
+            [result["__id__"] for result in db._db.query(query, top_k=5)]
+            for query in queries
+        ]
+        assert db.query_batch(queries, k=100)[0][:5] == results[0]
+        assert db.query_batch([], k=5) == []
+
+    def test_query_batch_reads_storage(self, db, monkeypatch):
+        # query_batch reads the matrix from a private attribute of NanoVectorDB,
+        # so a version of it that stores the matrix elsewhere must fail here
+        # rather than silently fall back to per-query search
+        db.insert_data(pd.DataFrame({"__id__": ["id1"], "__vector__": [np.ones(4)]}))
+        assert db._storage is not None
+        monkeypatch.setattr(
+            db, "query", MagicMock(side_effect=AssertionError("fallback path taken"))
+        )
+        assert db.query_batch([np.ones(4)], k=1) == [["id1"]]
+
+    def test_query_batch_without_storage(self, mock_db):
+        mock_db._db.query.return_value = [{"__id__": "id1"}]
+        queries = np.random.rand(2, 128)
+        assert mock_db.query_batch(queries, k=1) == [["id1"], ["id1"]]
+        assert mock_db._db.query.call_count == 2
 
     def test_query(self, mock_db):
         query_embedding = np.random.rand(128).tolist()
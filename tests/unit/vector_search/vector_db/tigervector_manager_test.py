@@ -38,13 +38,12 @@ class TestTigerVectorManager:
         # Call the insert_data method
         self.manager.insert_data(data)
 
-        # Check if add_nodes_from was called with the correct arguments
-        expected_nodes = [
-            ("Entity_1", {"emb_description": [-0.01773, -0.01019, -0.01657]}),
-            ("Entity_2", {"emb_description": [-0.01926, 0.000496, 0.00671]}),
-        ]
-        self.mock_graph.add_nodes_from.assert_called_once_with(
-            nodes_for_adding=expected_nodes, node_type="Entity"
+        # Check if add_nodes_from_dataframe was called with the correct arguments
+        self.mock_graph.add_nodes_from_dataframe.assert_called_once_with(
+            data,
+            node_type="Entity",
+            id_column="__id__",
+            attribute_column_mappings={"emb_description": "__vector__"},
         )
 
     def test_query(self):
@@ -95,5 +94,61 @@ class TestTigerVectorManager:
         # Call insert_data with empty data
         self.manager.insert_data(data)
 
-        # Check that add_nodes_from was not called since there's no data
-        self.mock_graph.add_nodes_from.assert_not_called()
+        # Check that add_nodes_from_dataframe was not called since there's no data
+        self.mock_graph.add_nodes_from_dataframe.assert_not_called()
+
+    def test_query_and_expand(self):
+        """Test the query_and_expand method of TigerVectorManager."""
+        expected = {
+            "seeds": [{"id": "Entity_1", "distance": 0.1}],
+            "Text Units": [{"id": "TextUnit_1", "text": "..."}],
+        }
+        self.mock_graph.search_and_expand.return_value = expected
+        expansions = [
+            {
+                "name": "Text Units",
+                "target_node_type_set": {"TextUnit"},
+                "return_attributes": ["id", "text"],
+            }
+        ]
+
+        result = self.manager.query_and_expand(
+            [-0.01773, -0.01019, -0.01657], expansions, k=2
+        )
+
+        self.mock_graph.search_and_expand.assert_called_once_with(
+            data=[-0.01773, -0.01019, -0.01657],
+            vector_attribute_name="emb_description",
+            expansions=expansions,
+            node_type="Entity",
+            limit=2,
+        )
+        assert result == expected
+
+    def test_query_batch(self):
+        """Test the query_batch method of TigerVectorManager."""
+        self.mock_graph.search_batch.return_value = [
+            [{"id": "Entity_1", "distance": 0.1}],
+            [{"id": "Entity_2", "distance": 0.2}],
+        ]
+        query_embeddings = [[-0.01773, -0.01019], [-0.01926, 0.000496]]
+
+        result = self.manager.query_batch(query_embeddings, k=1)
+
+        self.mock_graph.search_batch.assert_called_once_with(
+            data=query_embeddings,
+            vector_attribute_name="emb_description",
+            node_type="Entity",
+            limit=1,
+        )
+        assert result == [["Entity_1"], ["Entity_2"]]
+
+    @pytest.mark.asyncio
+    async def test_aquery(self):
+        """Test that aquery runs the query method."""
+        self.mock_graph.search.return_value = [{"id": "Entity_1", "distance": 0.1}]
+
+        result = await self.manager.aquery([-0.01773, -0.01019, -0.01657], k=1)
+
+        assert result == ["Entity_1"]
+        self.mock_graph.search.assert_called_once()
@@ -32,6 +32,7 @@ from .query import (
     NodeSpec,
     EdgeSpec,
     NeighborSpec,
+    ExpansionSpec,
 )
 
 from .settings import (
@@ -43,6 +44,7 @@ from .settings import (
     BaseVectorDBConfig,
     TigerVectorConfig,
     NanoVectorDBConfig,
+    MmapVectorDBConfig,
     BaseChatConfig,
     OpenAIChatConfig,
 )
@@ -75,6 +77,7 @@ __all__ = [
     # configurations for queries
     "NodeSpec",
     "NeighborSpec",
+    "ExpansionSpec",
     # configurations for GraphRAG
     "Settings",
     "BaseLLMConfig",
@@ -84,6 +87,7 @@ __all__ = [
     "BaseVectorDBConfig",
     "TigerVectorConfig",
     "NanoVectorDBConfig",
+    "MmapVectorDBConfig",
     "BaseChatConfig",
     "OpenAIChatConfig",
 ]
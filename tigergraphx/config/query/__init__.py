@@ -8,9 +8,11 @@
 from .node_spec import NodeSpec
 from .edge_spec import EdgeSpec
 from .neighbor_spec import NeighborSpec
+from .expansion_spec import ExpansionSpec
 
 __all__ = [
     "NodeSpec",
     "EdgeSpec",
     "NeighborSpec",
+    "ExpansionSpec",
 ]
@@ -0,0 +1,76 @@
+# Copyright 2025 TigerGraph Inc.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file or https://www.apache.org/licenses/LICENSE-2.0
+#
+# Permission is granted to use, copy, modify, and distribute this software
+# under the License. The software is provided "AS IS", without warranty.
+
+from typing import List, Optional, Set
+from pydantic import Field, model_validator
+
+from ..base_config import BaseConfig
+
+
+class ExpansionSpec(BaseConfig):
+    """
+    Specification for expanding the neighborhood of vector search results.
+
+    Every node is returned at most once, even if it is reached from several
+    search results. The nodes can be ranked by a numeric attribute and cut off
+    at a token budget on the server, so that only the nodes that fit into a
+    context window are transferred.
+    """
+
+    name: str = Field(..., description="Key of the expansion in the result.")
+    edge_type_set: Optional[Set[str]] = Field(
+        None, description="Set of allowed edge types for traversal."
+    )
+    target_node_type_set: Optional[Set[str]] = Field(
+        None, description="Set of node types to return."
+    )
+    max_hops: int = Field(
+        1, ge=1, description="Maximum number of hops from the search results."
+    )
+    return_attributes: Optional[str | List[str]] = Field(
+        None, description="List of attributes to include in the results."
+    )
+    limit: Optional[int] = Field(
+        None, description="Maximum number of nodes to return."
+    )
+    order_by: Optional[str] = Field(
+        None,
+        description="Numeric attribute of the target nodes to rank them by, in "
+        "descending order. Nodes of equal rank, or all nodes if it is not set, are "
+        "selected in an arbitrary order.",
+    )
+    token_count_attribute: Optional[str] = Field(
+        None,
+        description="Attribute of the target nodes with their precomputed token "
+        "count, used for `max_tokens`.",
+    )
+    max_tokens: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Token budget of the expansion. Ranked nodes are returned until "
+        "the next node would exceed the budget.",
+    )
+
+    @model_validator(mode="after")
+    def validate_token_budget(self) -> "ExpansionSpec":
+        """
+        Ensure that a token budget comes with the attribute to count tokens with.
+
+        Returns:
+            The validated expansion specification.
+
+        Raises:
+            ValueError: If `max_tokens` is set without `token_count_attribute`.
+        """
+        if self.max_tokens is not None and self.token_count_attribute is None:
+            raise ValueError("max_tokens requires token_count_attribute to be set.")
+        return self
+
+    @property
+    def is_ranked(self) -> bool:
+        """Whether the nodes are ranked or cut off at a token budget."""
+        return self.order_by is not None or self.max_tokens is not None
@@ -8,7 +8,12 @@
 from .settings import Settings
 from .llm_settings import BaseLLMConfig, OpenAIConfig
 from .embedding_settings import BaseEmbeddingConfig, OpenAIEmbeddingConfig
-from .vector_db_settings import BaseVectorDBConfig, TigerVectorConfig, NanoVectorDBConfig
+from .vector_db_settings import (
+    BaseVectorDBConfig,
+    TigerVectorConfig,
+    NanoVectorDBConfig,
+    MmapVectorDBConfig,
+)
 from .chat_settings import BaseChatConfig, OpenAIChatConfig
 
 __all__ = [
@@ -20,6 +25,7 @@ __all__ = [
     "BaseVectorDBConfig",
     "TigerVectorConfig",
     "NanoVectorDBConfig",
+    "MmapVectorDBConfig",
     "BaseChatConfig",
     "OpenAIChatConfig",
 ]
@@ -29,6 +29,21 @@ class OpenAIEmbeddingConfig(BaseEmbeddingConfig):
     max_tokens: int = Field(
         default=8191, description="Maximum number of tokens supported."
     )
+    max_inputs_per_request: int = Field(
+        default=2048,
+        description="Maximum number of inputs per batched embedding request.",
+    )
+    max_tokens_per_request: int = Field(
+        default=300000,
+        description="Maximum total number of tokens per batched embedding request.",
+    )
+    send_token_ids: bool = Field(
+        default=True,
+        description=(
+            "Whether to send token IDs instead of text to the API. Disable it for "
+            "OpenAI-compatible APIs that only accept text inputs."
+        ),
+    )
     max_retries: int = Field(
         default=10, description="Maximum number of retries for API calls."
     )
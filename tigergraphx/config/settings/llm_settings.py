@@ -31,8 +31,32 @@ class OpenAIConfig(BaseLLMConfig):
         default=None, description="OpenAI organization ID (if applicable)."
     )
     max_retries: int = Field(
-        default=10, description="Maximum number of retries for failed API requests."
+        default=0,
+        ge=0,
+        description=(
+            "Maximum number of retries performed by the OpenAI client itself. "
+            "Defaults to 0, so that rate limit errors reach the shared rate limiter "
+            "and the chat and embedding models retry every request through it."
+        ),
     )
     request_timeout: float = Field(
         default=180.0, description="Request timeout in seconds."
     )
+    requests_per_minute: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of requests per minute, or None for no limit.",
+    )
+    tokens_per_minute: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of tokens per minute, or None for no limit.",
+    )
+    max_concurrency: int = Field(
+        default=16,
+        ge=1,
+        description=(
+            "Maximum number of concurrent requests. The actual limit adapts to "
+            "the rate limit errors returned by the API."
+        ),
+    )
@@ -6,6 +6,7 @@
 # under the License. The software is provided "AS IS", without warranty.
 
 from pathlib import Path
+from typing import Literal
 from pydantic import Field
 
 from ..base_config import BaseConfig
@@ -46,3 +47,41 @@ class NanoVectorDBConfig(BaseVectorDBConfig):
     embedding_dim: int = Field(
         default=1536, description="Default embedding dimension for NanoVectorDB."
     )
+
+
+class MmapVectorDBConfig(BaseVectorDBConfig):
+    """Configuration class for the memory-mapped vector database."""
+
+    type: str = Field(
+        default="MmapVectorDB", description="Default type for MmapVectorDBConfig."
+    )
+    storage_dir: str | Path = Field(
+        default="mmap-vectordb",
+        description="Directory holding the memory-mapped vector and ID files.",
+    )
+    embedding_dim: int = Field(
+        default=1536, description="Default embedding dimension for MmapVectorDB."
+    )
+    metric: Literal["cosine", "dot"] = Field(
+        default="cosine", description="Similarity metric used for search."
+    )
+    index_type: Literal["flat", "ivf"] = Field(
+        default="flat",
+        description="Exhaustive search, or search in the nearest k-means partitions.",
+    )
+    nlist: int = Field(
+        default=1024, ge=1, description="Number of k-means partitions of the IVF index."
+    )
+    nprobe: int = Field(
+        default=8, ge=1, description="Number of partitions searched per query."
+    )
+    train_size: int = Field(
+        default=100000,
+        ge=1,
+        description="Maximum number of vectors sampled to train the IVF index.",
+    )
+    block_size: int = Field(
+        default=65536,
+        ge=1,
+        description="Number of vectors scored per matrix multiplication.",
+    )
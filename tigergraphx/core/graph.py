@@ -8,12 +8,14 @@
 import logging
 from typing import Any, Dict, List, Literal, Optional, Sequence, Set, Tuple
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 from tigergraphx.config import (
     TigerGraphConnectionConfig,
     GraphSchema,
     LoadingJobConfig,
+    ExpansionSpec,
 )
 
 from tigergraphx.core.graph_context import GraphContext
@@ -26,6 +28,7 @@ from tigergraphx.core.managers import (
     StatisticsManager,
     VectorManager,
 )
+from tigergraphx.core.managers.upsert_payload import to_pandas_dataframe
 
 logger = logging.getLogger(__name__)
 
@@ -167,6 +170,33 @@ class Graph:
         """
         return self._schema_manager.create_schema(drop_existing_graph)
 
+    def update_schema(self, drop_removed: bool = True) -> bool:
+        """
+        Evolve the graph in TigerGraph into the configured schema in place.
+
+        Only the differences between the configured schema and the one in the database
+        are applied: node types, edge types, attributes and vector attributes are added
+        or dropped without reloading the remaining data. The graph is created if it
+        does not exist yet.
+
+        Args:
+            drop_removed: If True, types and attributes that are no longer configured are
+                dropped, and changed definitions are dropped and added again. If False,
+                they are kept, and changes that require dropping data raise an error.
+
+        Returns:
+            True if the schema was changed, False if it was already up to date.
+
+        Raises:
+            ValueError: If the primary key of an existing node type changed, or if
+                `drop_removed` is False and a change requires dropping data.
+        """
+        is_updated = self._schema_manager.update_schema(drop_removed)
+        if is_updated:
+            # The schema change may have dropped the search queries installed on demand
+            self._vector_manager.reset_installed_queries()
+        return is_updated
+
     def drop_graph(self) -> None:
         """
         Drop the graph from TigerGraph.
@@ -174,14 +204,167 @@ class Graph:
         return self._schema_manager.drop_graph()
 
     # ------------------------------ Data Loading Operations ------------------------------
-    def load_data(self, loading_job_config: LoadingJobConfig | Dict | str | Path):
+    def load_data(
+        self,
+        loading_job_config: LoadingJobConfig | Dict | str | Path,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
         """
         Load data into the graph using the provided loading job configuration.
 
+        The loading job is created on first use and reused afterwards as long as its
+        definition is unchanged. The job runs in non-blocking mode and is polled until
+        it finishes.
+
+        Args:
+            loading_job_config: Loading job config.
+            timeout: Maximum number of seconds to wait for the loading job to finish.
+                If None, wait indefinitely.
+
+        Returns:
+            The final status of the loading job, as returned by `get_loading_job_status`.
+
+        Raises:
+            RuntimeError: If the loading job cannot be created, does not finish
+                successfully, is paused or reports a status that is not recognized.
+            TimeoutError: If the loading job does not finish within the timeout.
+        """
+        return self._data_manager.load_data(loading_job_config, timeout)
+
+    def load_local_data(
+        self,
+        loading_job_config: LoadingJobConfig | Dict | str | Path,
+        sources: Dict[str, Any],
+        chunk_size: int = 100000,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Load data that lives on the client machine through a loading job.
+
+        Each source is streamed to the loading job as CSV chunks, so local files and
+        in-memory tables get loading-job throughput without being copied to the
+        TigerGraph server first.
+
+        Args:
+            loading_job_config: Loading job config. File paths in the config are ignored.
+            sources: Mapping from each file alias in the config to a local file path,
+                a pandas DataFrame, a pyarrow Table or a polars DataFrame.
+            chunk_size: The number of rows sent in a single request.
+
+        Returns:
+            The number of valid and rejected lines for each file alias.
+
+        Raises:
+            ValueError: If the sources do not match the file aliases of the config,
+                or if a table value contains the separator or a line break while
+                the CSV parsing options have no quote.
+            RuntimeError: If the loading job cannot be created.
+        """
+        return self._data_manager.load_local_data(
+            loading_job_config, sources, chunk_size
+        )
+
+    def create_loading_job(
+        self, loading_job_config: LoadingJobConfig | Dict | str | Path
+    ) -> str:
+        """
+        Create a loading job, or reuse it if a job with the same definition exists.
+
+        The name of the job on the server is the configured name suffixed with a hash
+        of the job definition. File paths are not part of the definition; they are
+        provided each time the job is run. Jobs created for earlier definitions of the
+        same job are dropped.
+
         Args:
             loading_job_config: Loading job config.
+
+        Returns:
+            The name of the loading job on the server.
+
+        Raises:
+            RuntimeError: If the loading job cannot be created.
+        """
+        return self._data_manager.create_loading_job(loading_job_config)
+
+    def drop_loading_job(
+        self, loading_job_config: LoadingJobConfig | Dict | str | Path
+    ) -> bool:
+        """
+        Drop the loading job created for the given loading job configuration.
+
+        Args:
+            loading_job_config: Loading job config.
+
+        Returns:
+            True if the loading job was dropped, False otherwise.
+        """
+        return self._data_manager.drop_loading_job(loading_job_config)
+
+    def run_loading_job(
+        self,
+        loading_job_config: LoadingJobConfig | Dict | str | Path,
+        file_paths: Optional[Dict[str, str]] = None,
+        max_num_error: Optional[int] = None,
+        max_percent_error: Optional[int] = None,
+    ) -> str:
+        """
+        Start a loading job in non-blocking mode.
+
+        All files of the job are loaded concurrently by the server, and several runs
+        can be started before any of them finishes.
+
+        Args:
+            loading_job_config: Loading job config.
+            file_paths: Mapping from file aliases to file paths on the server, overriding
+                the paths in the config.
+            max_num_error: Maximum number of error lines before the job is aborted.
+            max_percent_error: Maximum percentage of error lines before the job is aborted.
+
+        Returns:
+            The ID of the loading job run.
+
+        Raises:
+            ValueError: If a file alias has no file path.
+        """
+        return self._data_manager.run_loading_job(
+            loading_job_config, file_paths, max_num_error, max_percent_error
+        )
+
+    def get_loading_job_status(self, job_id: str) -> Dict[str, Any]:
+        """
+        Get the status and progress of a loading job run.
+
+        Args:
+            job_id: The ID returned by `run_loading_job`.
+
+        Returns:
+            A dictionary with the keys `job_id`, `status`, `progress`, `loaded_lines`,
+            `rejected_lines`, `duration_seconds` and `throughput` (lines per second).
+        """
+        return self._data_manager.get_loading_job_status(job_id)
+
+    def wait_for_loading_job(
+        self,
+        job_id: str,
+        poll_interval: float = 1.0,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
         """
-        return self._data_manager.load_data(loading_job_config)
+        Poll a loading job run until it finishes.
+
+        Args:
+            job_id: The ID returned by `run_loading_job`.
+            poll_interval: Number of seconds between status checks.
+            timeout: Maximum number of seconds to wait. If None, wait indefinitely.
+
+        Returns:
+            The final status of the loading job, as returned by `get_loading_job_status`.
+
+        Raises:
+            RuntimeError: If the loading job does not finish successfully, is paused
+                or reports a status that is not recognized.
+            TimeoutError: If the loading job does not finish within the timeout.
+        """
+        return self._data_manager.wait_for_loading_job(job_id, poll_interval, timeout)
 
     # ------------------------------ Node Operations ------------------------------
     def add_node(self, node_id: str | int, node_type: Optional[str] = None, **attr):
@@ -220,6 +403,41 @@ class Graph:
         node_type = self._validate_node_type(node_type)
         return self._node_manager.add_nodes_from(normalized_nodes, node_type)
 
+    def add_nodes_from_dataframe(
+        self,
+        data: Any,
+        node_type: Optional[str] = None,
+        id_column: Optional[str] = None,
+        attribute_column_mappings: Optional[Dict[str, str]] = None,
+        batch_size: int = 10000,
+    ) -> Optional[int]:
+        """
+        Add nodes from a DataFrame.
+
+        Columns are validated against the graph schema and serialized column by column,
+        which is much faster than building per-node dictionaries for large inputs.
+
+        Args:
+            data: A pandas DataFrame, a pyarrow Table or a polars DataFrame.
+            node_type: The type of the nodes.
+            id_column: The column holding node IDs. Defaults to the primary key name.
+            attribute_column_mappings: Mapping from attribute names (including vector
+                attributes) to column names. If None, every column whose name matches
+                an attribute of the node type is used.
+            batch_size: The maximum number of nodes sent in a single request.
+
+        Returns:
+            The number of nodes added.
+
+        Raises:
+            ValueError: If a column is missing or incompatible with the schema.
+        """
+        node_type = self._validate_node_type(node_type)
+        df = to_pandas_dataframe(data)
+        return self._node_manager.add_nodes_from_dataframe(
+            df, node_type, id_column, attribute_column_mappings, batch_size
+        )
+
     def remove_node(self, node_id: str | int, node_type: Optional[str] = None) -> bool:
         """
         Remove a node from the graph.
@@ -359,6 +577,56 @@ class Graph:
             normalized_edges, src_node_type, edge_type, tgt_node_type
         )
 
+    def add_edges_from_dataframe(
+        self,
+        data: Any,
+        source_id_column: str,
+        target_id_column: str,
+        src_node_type: Optional[str] = None,
+        edge_type: Optional[str] = None,
+        tgt_node_type: Optional[str] = None,
+        attribute_column_mappings: Optional[Dict[str, str]] = None,
+        batch_size: int = 10000,
+    ) -> Optional[int]:
+        """
+        Add edges from a DataFrame.
+
+        Columns are validated against the graph schema and serialized column by column,
+        which is much faster than building per-edge dictionaries for large inputs.
+
+        Args:
+            data: A pandas DataFrame, a pyarrow Table or a polars DataFrame.
+            source_id_column: The column holding source node IDs.
+            target_id_column: The column holding target node IDs.
+            src_node_type: Source node type.
+            edge_type: Edge type.
+            tgt_node_type: Target node type.
+            attribute_column_mappings: Mapping from edge attribute names to column names.
+                If None, every column whose name matches an attribute of the edge type
+                is used.
+            batch_size: The maximum number of edges sent in a single request.
+
+        Returns:
+            The number of edges added.
+
+        Raises:
+            ValueError: If a column is missing or incompatible with the schema.
+        """
+        src_node_type, edge_type, tgt_node_type = self._validate_edge_type(
+            src_node_type, edge_type, tgt_node_type
+        )
+        df = to_pandas_dataframe(data)
+        return self._edge_manager.add_edges_from_dataframe(
+            df,
+            source_id_column,
+            target_id_column,
+            src_node_type,
+            edge_type,
+            tgt_node_type,
+            attribute_column_mappings,
+            batch_size,
+        )
+
     def has_edge(
         self,
         src_node_id: str | int,
@@ -503,6 +771,79 @@ class Graph:
         """
         return self._query_manager.install_query(query_name)
 
+    def install_queries(self, query_names: List[str]) -> str:
+        """
+        Install several GSQL queries on the graph in one batch, in the background.
+
+        The queries are compiled together, which is much faster than installing them
+        one by one. Use `get_query_installation_status` to poll the progress, or
+        `wait_for_query_installation` to block until the installation finishes.
+
+        Args:
+            query_names: Names of the queries to install.
+
+        Returns:
+            The ID of the query installation.
+
+        Raises:
+            ValueError: If `query_names` is not a non-empty list.
+        """
+        return self._query_manager.install_queries(query_names)
+
+    def get_query_installation_status(self, installation_id: str) -> Dict[str, Any]:
+        """
+        Get the status of a query installation started by `install_queries`.
+
+        The final status of a finished installation is reported only once, after
+        which the installation ID is forgotten.
+
+        Args:
+            installation_id: The ID returned by `install_queries`.
+
+        Returns:
+            A dictionary with the installation ID, the query names, the status
+            ("RUNNING", "SUCCESS" or "FAILED") and the server message.
+
+        Raises:
+            ValueError: If the installation ID is unknown or its final status was
+                already reported.
+        """
+        return self._query_manager.get_query_installation_status(installation_id)
+
+    def wait_for_query_installation(
+        self,
+        installation_id: str,
+        poll_interval: float = 1.0,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Poll a query installation started by `install_queries` until it finishes.
+
+        Args:
+            installation_id: The ID returned by `install_queries`.
+            poll_interval: Seconds to wait between two status checks.
+            timeout: Maximum number of seconds to wait. Waits indefinitely if None.
+
+        Returns:
+            The final installation status.
+
+        Raises:
+            TimeoutError: If the installation does not finish within `timeout` seconds.
+            RuntimeError: If the installation fails.
+        """
+        return self._query_manager.wait_for_query_installation(
+            installation_id, poll_interval, timeout
+        )
+
+    def close(self) -> None:
+        """
+        Release the background resources of the graph.
+
+        Query installations that have not started are cancelled, and the running
+        one is waited for.
+        """
+        self._query_manager.close()
+
     def drop_query(self, query_name: str) -> bool:
         """
         Drop a GSQL query from the graph.
@@ -724,6 +1065,46 @@ class Graph:
         node_type = self._validate_node_type(node_type)
         return self._vector_manager.upsert(data, node_type)
 
+    def upsert_vectors(
+        self,
+        node_ids: List[str] | List[int],
+        vectors: np.ndarray,
+        vector_attribute_name: str,
+        node_type: Optional[str] = None,
+        batch_size: int = 10000,
+        max_workers: int = 4,
+    ) -> Optional[int]:
+        """
+        Upsert an embedding matrix as the vectors of the given nodes.
+
+        The matrix is validated once with vectorized checks. It is then sent in
+        chunks of `batch_size` rows over up to `max_workers` concurrent requests.
+
+        Args:
+            node_ids: The node identifiers, one per row of `vectors`.
+            vectors: A 2-D array with one embedding per row.
+            vector_attribute_name: The vector attribute name.
+            node_type: The node type.
+            batch_size: Number of vectors per request.
+            max_workers: Maximum number of concurrent requests.
+
+        Returns:
+            The number of upserted nodes, or None if an error occurs.
+
+        Raises:
+            ValueError: If the matrix does not match the vector attribute or the IDs, or
+                contains non-finite values.
+        """
+        node_type = self._validate_node_type(node_type)
+        return self._vector_manager.upsert_vectors(
+            node_ids=self._to_str_node_ids(node_ids),
+            vectors=vectors,
+            vector_attribute_name=vector_attribute_name,
+            node_type=node_type,
+            batch_size=batch_size,
+            max_workers=max_workers,
+        )
+
     def fetch_node(
         self,
         node_id: str | int,
@@ -770,6 +1151,35 @@ class Graph:
             new_node_ids, vector_attribute_name, node_type
         )
 
+    def fetch_vectors(
+        self,
+        node_ids: List[str] | List[int],
+        vector_attribute_name: str,
+        node_type: Optional[str] = None,
+        batch_size: int = 10000,
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Fetch the embedding vectors of multiple nodes as a float32 matrix.
+
+        Args:
+            node_ids: List of node identifiers.
+            vector_attribute_name: The vector attribute name.
+            node_type: The node type.
+            batch_size: Number of nodes per request.
+
+        Returns:
+            The IDs of the nodes found, in the requested order, and a contiguous
+            float32 matrix with their vectors as rows.
+
+        Raises:
+            ValueError: If the fetched vectors are malformed.
+        """
+        new_node_ids = self._to_str_node_ids(node_ids)
+        node_type = self._validate_node_type(node_type)
+        return self._vector_manager.fetch_vectors(
+            new_node_ids, vector_attribute_name, node_type, batch_size
+        )
+
     def search(
         self,
         data: List[float],
@@ -778,6 +1188,7 @@ class Graph:
         limit: int = 10,
         return_attributes: Optional[str | List[str]] = None,
         candidate_ids: Optional[Set[str]] = None,
+        filter_expression: Optional[str] = None,
     ) -> List[Dict]:
         """
         Search for similar nodes based on a query vector.
@@ -789,9 +1200,22 @@ class Graph:
             limit: Number of nearest neighbors to return.
             return_attributes: Attributes to return.
             candidate_ids: Limit search to these node IDs.
+            filter_expression: A condition on the nodes to search, using `s` as
+                the node alias, e.g. `'s.category == "x" AND s.price < 50'`. It may
+                only compare attributes of the node type with each other or with
+                string, number and boolean literals, combined with AND, OR, NOT
+                and parentheses. The candidates are filtered server-side. The
+                first search with a new filter shape blocks until a dedicated
+                query is installed. Filters that differ only in their literal
+                values reuse that query.
 
         Returns:
             List of similar nodes and their details.
+
+        Raises:
+            ValueError: If the filter expression is not supported.
+            RuntimeError: If the query for the filter expression cannot be
+                installed.
         """
         node_type = self._validate_node_type(node_type)
         return self._vector_manager.search(
@@ -801,6 +1225,48 @@ class Graph:
             limit=limit,
             return_attributes=return_attributes,
             candidate_ids=candidate_ids,
+            filter_expression=filter_expression,
+        )
+
+    def search_batch(
+        self,
+        data: List[List[float]],
+        vector_attribute_name: str,
+        node_type: Optional[str] = None,
+        limit: int = 10,
+        return_attributes: Optional[str | List[str]] = None,
+        candidate_ids: Optional[Set[str]] = None,
+    ) -> List[List[Dict]]:
+        """
+        Search for similar nodes for several query vectors in one request.
+
+        All searches run server-side in a single installed query, so N searches cost
+        one round trip instead of N.
+
+        Args:
+            data: Query vectors, as a list of lists or a 2-D NumPy array. All vectors
+                must have the same dimension.
+            vector_attribute_name: The vector attribute name.
+            node_type: The node type to search.
+            limit: Number of nearest neighbors to return per query vector.
+            return_attributes: Attributes to return.
+            candidate_ids: Limit search to these node IDs.
+
+        Returns:
+            One list of similar nodes and their details per query vector, in the
+            order of `data`, each sorted by distance.
+
+        Raises:
+            ValueError: If the query vectors do not all have the same dimension.
+        """
+        node_type = self._validate_node_type(node_type)
+        return self._vector_manager.search_batch(
+            data=data,
+            vector_attribute_name=vector_attribute_name,
+            node_type=node_type,
+            limit=limit,
+            return_attributes=return_attributes,
+            candidate_ids=candidate_ids,
         )
 
     def search_multi_vector_attributes(
@@ -810,16 +1276,24 @@ class Graph:
         node_types: Optional[List[str]] = None,
         limit: int = 10,
         return_attributes_list: Optional[List[List[str]]] = None,
+        fusion: Literal["min_distance", "rrf"] = "min_distance",
     ) -> List[Dict]:
         """
         Search for similar nodes using multiple vector attributes.
 
+        The searches on the individual vector attributes run concurrently.
+
         Args:
             data: Query vector.
             vector_attribute_names: List of vector attribute names.
             node_types: List of node types corresponding to the attributes.
             limit: Number of nearest neighbors to return.
             return_attributes_list: Attributes to return per node type.
+            fusion: How the results of the individual searches are merged.
+                "min_distance" ranks nodes by their smallest distance.
+                "rrf" ranks them by reciprocal rank fusion, which is robust to
+                distances that are not comparable across vector attributes, and
+                adds the fused score to each result.
 
         Returns:
             List of similar nodes and their details.
@@ -839,6 +1313,7 @@ class Graph:
             node_types=new_node_types,
             limit=limit,
             return_attributes_list=return_attributes_list,
+            fusion=fusion,
         )
 
     def search_top_k_similar_nodes(
@@ -872,7 +1347,136 @@ class Graph:
             return_attributes=return_attributes,
         )
 
+    def search_top_k_similar_nodes_batch(
+        self,
+        node_ids: List[str | int],
+        vector_attribute_name: str,
+        node_type: Optional[str] = None,
+        limit: int = 5,
+        return_attributes: Optional[List[str]] = None,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Retrieve the top-k nodes similar to each of many given nodes in one request.
+
+        The embeddings of the source nodes are read server-side and are never
+        transferred, which makes this suitable for tasks such as entity deduplication.
+
+        Args:
+            node_ids: The source nodes' identifiers.
+            vector_attribute_name: The embedding attribute name.
+            node_type: The type of nodes to search.
+            limit: Number of similar nodes to return per source node.
+            return_attributes: Attributes to return.
+
+        Returns:
+            The similar nodes of each source node, keyed by source node ID.
+        """
+        node_type = self._validate_node_type(node_type)
+        return self._vector_manager.search_top_k_similar_nodes_batch(
+            node_ids=[self._to_str_node_id(node_id) for node_id in node_ids],
+            vector_attribute_name=vector_attribute_name,
+            node_type=node_type,
+            limit=limit,
+            return_attributes=return_attributes,
+        )
+
+    def search_and_expand(
+        self,
+        data: List[float],
+        vector_attribute_name: str,
+        expansions: List[ExpansionSpec | Dict],
+        node_type: Optional[str] = None,
+        limit: int = 10,
+        return_attributes: Optional[str | List[str]] = None,
+        candidate_ids: Optional[Set[str]] = None,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Search for similar nodes and expand their neighborhoods in a single query.
+
+        The search results (the seeds) never leave the server before they are
+        expanded. Each expansion traverses up to `max_hops` hops from the seeds
+        over its edge types and returns the nodes of its target types. The query
+        is generated for the shape of the expansions and installed on first use.
+
+        Args:
+            data: The query vector.
+            vector_attribute_name: The vector attribute to search on.
+            expansions: The neighborhoods to expand, as `ExpansionSpec` objects or
+                dictionaries with the keys `name`, `edge_type_set`,
+                `target_node_type_set`, `max_hops`, `return_attributes`, `limit`,
+                `order_by`, `token_count_attribute` and `max_tokens`. Ranked
+                expansions are sorted by `order_by` and cut off at `max_tokens`
+                on the server.
+            node_type: The type of nodes to search.
+            limit: Number of seeds to return.
+            return_attributes: Attributes of the seeds to return.
+            candidate_ids: Limit the search to these node IDs.
+
+        Returns:
+            The seeds under the key "seeds", sorted by distance, and the nodes of
+            every expansion under its name.
+
+        Raises:
+            ValueError: If an expansion refers to an unknown node or edge type, or
+                ranks by an attribute that its target node types do not have.
+        """
+        node_type = self._validate_node_type(node_type)
+        expansion_specs = []
+        for expansion in expansions:
+            spec = ExpansionSpec.ensure_config(expansion)
+            if spec.edge_type_set is not None:
+                self._validate_edge_types_as_set(sorted(spec.edge_type_set))
+            if spec.target_node_type_set is not None:
+                self._validate_node_types_as_set(sorted(spec.target_node_type_set))
+            self._validate_expansion_ranking(spec)
+            expansion_specs.append(spec)
+        names = [spec.name for spec in expansion_specs]
+        if "seeds" in names or len(set(names)) != len(names):
+            raise ValueError("Expansion names must be unique and must not be 'seeds'.")
+        return self._vector_manager.search_and_expand(
+            data=data,
+            vector_attribute_name=vector_attribute_name,
+            node_type=node_type,
+            expansions=expansion_specs,
+            limit=limit,
+            return_attributes=return_attributes,
+            candidate_ids=candidate_ids,
+        )
+
     # ------------------------------ Utilities ------------------------------
+    def _validate_expansion_ranking(self, spec: ExpansionSpec) -> None:
+        """
+        Validate that the target node types of a ranked expansion have the
+        attributes it ranks and counts tokens by.
+
+        Args:
+            spec: The expansion to validate.
+
+        Raises:
+            ValueError: If the expansion is ranked without target node types, or a
+                target node type lacks one of the attributes.
+        """
+        attributes = [
+            attribute
+            for attribute in (spec.order_by, spec.token_count_attribute)
+            if attribute is not None
+        ]
+        if not attributes:
+            return
+        if not spec.target_node_type_set:
+            raise ValueError(
+                f"Expansion '{spec.name}' must set target_node_type_set to rank "
+                "or count tokens by node attributes."
+            )
+        for target_node_type in sorted(spec.target_node_type_set):
+            node_schema = self._context.graph_schema.nodes[target_node_type]
+            for attribute in attributes:
+                if attribute not in node_schema.attributes:
+                    raise ValueError(
+                        f"Node type '{target_node_type}' has no attribute "
+                        f"'{attribute}' used by expansion '{spec.name}'."
+                    )
+
     def _validate_node_type(self, node_type: Optional[str] = None) -> str:
         """
         Validate and return the effective node type.
@@ -5,60 +5,427 @@
 # Permission is granted to use, copy, modify, and distribute this software
 # under the License. The software is provided "AS IS", without warranty.
 
+import codecs
+import csv
+import hashlib
 import logging
-from typing import Dict
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set
 from pathlib import Path
+import pandas as pd
 
 from .base_manager import BaseManager
+from .upsert_payload import to_pandas_dataframe
 
 from tigergraphx.core.graph_context import GraphContext
-from tigergraphx.config import LoadingJobConfig
+from tigergraphx.config import LoadingJobConfig, CsvParsingOptions, QuoteType
 
 
 logger = logging.getLogger(__name__)
 
 
+# Loading job run statuses reported by the server. A paused job only resumes when
+# asked to, so waiting for it ends as it does for a failed job.
+_TERMINAL_STATUSES = {
+    "FINISHED",
+    "SUCCESS",
+    "FAILED",
+    "ABORTED",
+    "STOPPED",
+    "KILLED",
+    "PAUSED",
+}
+_SUCCESSFUL_STATUSES = {"FINISHED", "SUCCESS"}
+_RUNNING_STATUSES = {
+    "QUEUED",
+    "PENDING",
+    "INITIALIZING",
+    "STARTING",
+    "STARTED",
+    "RUNNING",
+    "PAUSING",
+    "STOPPING",
+}
+_LOADING_JOB_NAME_PATTERN = re.compile(r"CREATE\s+LOADING\s+JOB\s+(\w+)")
+
+
 class DataManager(BaseManager):
     def __init__(self, context: GraphContext):
         super().__init__(context)
+        # Loading jobs known to exist on the server with the current definition
+        self._loading_jobs: Set[str] = set()
 
-    def load_data(self, loading_job_config: LoadingJobConfig | Dict | str | Path):
+    def load_data(
+        self,
+        loading_job_config: LoadingJobConfig | Dict | str | Path,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
         loading_job_config = LoadingJobConfig.ensure_config(loading_job_config)
         logger.info(
             f"Initiating data load for job: {loading_job_config.loading_job_name}...",
         )
-        gsql_script = self._create_gsql_load_data(loading_job_config)
+        job_id = self.run_loading_job(loading_job_config)
+        status = self.wait_for_loading_job(job_id, timeout=timeout)
+        logger.info(
+            f"Data load completed successfully: {status['loaded_lines']} lines loaded, "
+            f"{status['rejected_lines']} lines rejected."
+        )
+        return status
 
-        result = self._tigergraph_api.gsql(gsql_script)
-        if "LOAD SUCCESSFUL for loading jobid" not in result:
-            error_msg = f"Data load process failed. GSQL response: {result}"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
+    def load_local_data(
+        self,
+        loading_job_config: LoadingJobConfig | Dict | str | Path,
+        sources: Dict[str, Any],
+        chunk_size: int = 100000,
+    ) -> Dict[str, Dict[str, int]]:
+        loading_job_config = LoadingJobConfig.ensure_config(loading_job_config)
+        files = {file.file_alias: file for file in loading_job_config.files}
+        unknown_aliases = [alias for alias in sources if alias not in files]
+        if unknown_aliases:
+            raise ValueError(
+                f"File aliases not defined in the loading job: {', '.join(unknown_aliases)}"
+            )
+        missing_aliases = [alias for alias in files if alias not in sources]
+        if missing_aliases:
+            raise ValueError(
+                f"No data provided for file aliases: {', '.join(missing_aliases)}"
+            )
 
-        if f"Using graph '{self._graph_name}'" not in result:
-            error_msg = f"Failed to set graph context for '{self._graph_name}'. GSQL response: {result}"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
-        if "Successfully created loading jobs:" not in result:
-            error_msg = f"Loading job creation failed. GSQL response: {result}"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
+        logger.info(
+            "Initiating local data load for job: "
+            f"{loading_job_config.loading_job_name}..."
+        )
+        loading_job_name = self.create_loading_job(loading_job_config)
+        statistics = {}
+        for file_alias, source in sources.items():
+            csv_options = files[file_alias].csv_parsing_options
+            separator = codecs.decode(csv_options.separator, "unicode_escape")
+            eol = codecs.decode(csv_options.EOL, "unicode_escape")
+            file_statistics = {"valid_lines": 0, "rejected_lines": 0}
+            for chunk in self._iter_csv_chunks(source, csv_options, chunk_size):
+                result = self._tigergraph_api.run_loading_job_with_data(
+                    self._graph_name,
+                    loading_job_name,
+                    file_alias,
+                    chunk,
+                    separator,
+                    eol,
+                )
+                self._accumulate_loading_statistics(file_statistics, result)
+            statistics[file_alias] = file_statistics
+            logger.info(
+                f"Loaded file alias '{file_alias}': {file_statistics['valid_lines']} "
+                f"valid lines, {file_statistics['rejected_lines']} rejected lines."
+            )
+        logger.info("Local data load completed successfully.")
+        return statistics
+
+    def create_loading_job(
+        self, loading_job_config: LoadingJobConfig | Dict | str | Path
+    ) -> str:
+        loading_job_config = LoadingJobConfig.ensure_config(loading_job_config)
+        loading_job_name = self._get_loading_job_name(loading_job_config)
+        if loading_job_name in self._loading_jobs:
+            return loading_job_name
+
+        result = self._tigergraph_api.gsql(
+            f"USE GRAPH {self._graph_name}\nSHOW LOADING JOB *"
+        )
+        existing_job_names = set(_LOADING_JOB_NAME_PATTERN.findall(result))
+        if loading_job_name in existing_job_names:
+            logger.info(f"Reusing existing loading job: {loading_job_name}")
+        else:
+            gsql_script = (
+                f"USE GRAPH {self._graph_name}\n\n"
+                + self._create_gsql_loading_job(
+                    loading_job_config,
+                    with_file_paths=False,
+                    loading_job_name=loading_job_name,
+                )
+            )
+            result = self._tigergraph_api.gsql(gsql_script)
+            if "Successfully created loading jobs:" not in result:
+                error_msg = f"Loading job creation failed. GSQL response: {result}"
+                logger.error(error_msg)
+                raise RuntimeError(error_msg)
+            logger.info(f"Created loading job: {loading_job_name}")
+        self._loading_jobs.add(loading_job_name)
+        self._drop_superseded_loading_jobs(
+            loading_job_config.loading_job_name, loading_job_name, existing_job_names
+        )
+        return loading_job_name
+
+    def drop_loading_job(
+        self, loading_job_config: LoadingJobConfig | Dict | str | Path
+    ) -> bool:
+        loading_job_config = LoadingJobConfig.ensure_config(loading_job_config)
+        loading_job_name = self._get_loading_job_name(loading_job_config)
+        self._loading_jobs.discard(loading_job_name)
+        result = self._tigergraph_api.gsql(
+            f"USE GRAPH {self._graph_name}\nDROP JOB {loading_job_name}"
+        )
         if "Successfully dropped jobs" not in result:
-            error_msg = f"Loading job cleanup failed. GSQL response: {result}"
+            logger.error(f"Failed to drop loading job. GSQL response: {result}")
+            return False
+        return True
+
+    def run_loading_job(
+        self,
+        loading_job_config: LoadingJobConfig | Dict | str | Path,
+        file_paths: Optional[Dict[str, str]] = None,
+        max_num_error: Optional[int] = None,
+        max_percent_error: Optional[int] = None,
+    ) -> str:
+        loading_job_config = LoadingJobConfig.ensure_config(loading_job_config)
+        data_sources = {
+            file.file_alias: file.file_path
+            for file in loading_job_config.files
+            if file.file_path
+        }
+        data_sources.update(file_paths or {})
+        missing_aliases = [
+            file.file_alias
+            for file in loading_job_config.files
+            if file.file_alias not in data_sources
+        ]
+        if missing_aliases:
+            raise ValueError(
+                f"No file path provided for file aliases: {', '.join(missing_aliases)}"
+            )
+
+        loading_job_name = self.create_loading_job(loading_job_config)
+        job_id = self._tigergraph_api.run_loading_job(
+            self._graph_name,
+            loading_job_name,
+            data_sources,
+            max_num_error,
+            max_percent_error,
+        )
+        logger.info(f"Started loading job {loading_job_name} with job ID: {job_id}")
+        return job_id
+
+    def get_loading_job_status(self, job_id: str) -> Dict[str, Any]:
+        result = self._tigergraph_api.get_loading_job_status(self._graph_name, job_id)
+        return self._parse_loading_job_status(job_id, result)
+
+    def wait_for_loading_job(
+        self,
+        job_id: str,
+        poll_interval: float = 1.0,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        start_time = time.monotonic()
+        while True:
+            status = self.get_loading_job_status(job_id)
+            if status["status"] in _TERMINAL_STATUSES:
+                break
+            if status["status"] not in _RUNNING_STATUSES:
+                # Polling a status that never becomes terminal would never end
+                error_msg = (
+                    f"Unrecognized status of loading job {job_id}: {status['status']}"
+                )
+                logger.error(error_msg)
+                raise RuntimeError(error_msg)
+            if timeout is not None and time.monotonic() - start_time > timeout:
+                raise TimeoutError(
+                    f"Loading job {job_id} did not finish within {timeout} seconds. "
+                    f"Last status: {status}"
+                )
+            logger.debug(f"Loading job {job_id} status: {status}")
+            time.sleep(poll_interval)
+
+        if status["status"] not in _SUCCESSFUL_STATUSES:
+            error_msg = f"Data load process failed. Loading job status: {status}"
             logger.error(error_msg)
             raise RuntimeError(error_msg)
-        logger.info("Data load completed successfully.")
+        return status
 
-    def _create_gsql_load_data(
+    def _drop_superseded_loading_jobs(
+        self,
+        base_name: str,
+        loading_job_name: str,
+        existing_job_names: Set[str],
+    ) -> None:
+        """
+        Drop the loading jobs created for earlier definitions of the same job,
+        which would otherwise pile up on the server.
+        """
+        pattern = re.compile(rf"{re.escape(base_name)}_[0-9a-f]{{12}}")
+        superseded_job_names = sorted(
+            job_name
+            for job_name in existing_job_names
+            if job_name != loading_job_name and pattern.fullmatch(job_name)
+        )
+        if not superseded_job_names:
+            return
+        drop_statements = "\n".join(
+            f"DROP JOB {job_name}" for job_name in superseded_job_names
+        )
+        result = self._tigergraph_api.gsql(
+            f"USE GRAPH {self._graph_name}\n{drop_statements}"
+        )
+        if "Successfully dropped jobs" not in result:
+            logger.warning(
+                f"Failed to drop superseded loading jobs. GSQL response: {result}"
+            )
+            return
+        logger.info(
+            f"Dropped superseded loading jobs: {', '.join(superseded_job_names)}"
+        )
+
+    def _get_loading_job_name(self, loading_job_config: LoadingJobConfig) -> str:
+        """
+        Suffix the loading job name with a hash of its definition, so that a job is
+        only reused while its definition is unchanged.
+        """
+        definition = self._create_gsql_loading_job(
+            loading_job_config, with_file_paths=False
+        )
+        digest = hashlib.sha256(definition.encode("utf-8")).hexdigest()[:12]
+        return f"{loading_job_config.loading_job_name}_{digest}"
+
+    @staticmethod
+    def _parse_loading_job_status(job_id: str, result: Dict) -> Dict[str, Any]:
+        """
+        Normalize the status reported by the server into progress counters.
+        """
+
+        def pick(source: Dict, *keys: str) -> Any:
+            for key in keys:
+                if source.get(key) is not None:
+                    return source[key]
+            return None
+
+        status = pick(result, "status", "loadingStatus", "state") or "UNKNOWN"
+        statistics = result.get("statistics") or {}
+        overall = (
+            result.get("overall") or statistics.get("overall") or statistics or result
+        )
+        loaded_lines = pick(overall, "loadedLines", "validLine", "validLines") or 0
+        rejected_lines = (
+            pick(overall, "errorLines", "rejectLine", "rejectedLine", "rejectedLines")
+            or 0
+        )
+        # Durations are reported in milliseconds
+        duration = pick(overall, "duration")
+        duration_seconds = duration / 1000 if duration is not None else None
+        throughput = pick(overall, "averageSpeed", "avgSpeed")
+        if throughput is None and duration_seconds:
+            throughput = loaded_lines / duration_seconds
+        return {
+            "job_id": job_id,
+            "status": str(status).upper(),
+            "progress": pick(overall, "progress", "percentage"),
+            "loaded_lines": loaded_lines,
+            "rejected_lines": rejected_lines,
+            "duration_seconds": duration_seconds,
+            "throughput": throughput,
+        }
+
+    @staticmethod
+    def _iter_csv_chunks(
+        source: Any, csv_options: CsvParsingOptions, chunk_size: int
+    ) -> Iterator[bytes]:
+        """
+        Split a local file or table into CSV chunks, repeating the header line in
+        every chunk when the loading job expects one.
+        """
+        if isinstance(source, (str, Path)):
+            with open(source, "rb") as f:
+                header = f.readline() if csv_options.header else b""
+                lines: List[bytes] = []
+                for line in f:
+                    lines.append(line)
+                    if len(lines) >= chunk_size:
+                        yield header + b"".join(lines)
+                        lines = []
+                if lines:
+                    yield header + b"".join(lines)
+            return
+
+        df = to_pandas_dataframe(source)
+        separator = codecs.decode(csv_options.separator, "unicode_escape")
+        eol = codecs.decode(csv_options.EOL, "unicode_escape")
+        if csv_options.quote is None:
+            # The loader does not unescape values, so they are written as they are
+            quoting_options: Dict[str, Any] = {"quoting": csv.QUOTE_NONE}
+        else:
+            quotechar = '"' if csv_options.quote == QuoteType.DOUBLE else "'"
+            quoting_options = {"quotechar": quotechar}
+        for start in range(0, len(df), chunk_size):
+            chunk_df = df.iloc[start : start + chunk_size]
+            if csv_options.quote is None:
+                DataManager._check_unquoted_values(chunk_df, separator, eol)
+            chunk = chunk_df.to_csv(
+                index=False,
+                header=csv_options.header,
+                sep=separator,
+                lineterminator=eol,
+                **quoting_options,
+            )
+            yield chunk.encode("utf-8")
+
+    @staticmethod
+    def _check_unquoted_values(df: pd.DataFrame, separator: str, eol: str) -> None:
+        """
+        Make sure that no value would split a line or a field when written
+        without quotes.
+
+        Raises:
+            ValueError: If a value contains the separator or a line break.
+        """
+        forbidden = {separator, "\n", "\r", *eol}
+        pattern = "|".join(re.escape(character) for character in sorted(forbidden))
+        for column in df.columns:
+            values = df[column]
+            if pd.api.types.is_numeric_dtype(values):
+                continue
+            if values.dropna().astype(str).str.contains(pattern).any():
+                raise ValueError(
+                    f"Column '{column}' contains the separator {separator!r} or a "
+                    "line break, which cannot be loaded without quotes. Set the "
+                    "quote option of the CSV parsing options."
+                )
+
+    @staticmethod
+    def _accumulate_loading_statistics(
+        totals: Dict[str, int], results: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Add the line counts reported by the loading endpoint to the running totals.
+        """
+        for result in results:
+            statistics = result.get("statistics", {}) if isinstance(result, dict) else {}
+            # Newer versions nest file-level counters under parsingStatistics
+            file_level = statistics.get("parsingStatistics", {}).get("fileLevel")
+            if file_level:
+                statistics = file_level
+            totals["valid_lines"] += statistics.get("validLine", 0)
+            totals["rejected_lines"] += sum(
+                statistics.get(key, 0)
+                for key in (
+                    "rejectLine",
+                    "rejectedLine",
+                    "failedConditionLine",
+                    "notEnoughToken",
+                    "invalidJson",
+                    "oversizeToken",
+                )
+            )
+
+    def _create_gsql_loading_job(
         self,
         loading_job_config: LoadingJobConfig,
+        with_file_paths: bool = True,
+        loading_job_name: Optional[str] = None,
     ) -> str:
         graph_schema = self._graph_schema
         # Define file paths for each file in config with numbered file names
         files = loading_job_config.files
         define_files = []
         for file in files:
-            if file.file_path:
+            if file.file_path and with_file_paths:
                 define_files.append(
                     f'DEFINE FILENAME {file.file_alias} = "{file.file_path}";'
                 )
@@ -205,27 +572,13 @@ class DataManager(BaseManager):
         define_files_section = "  # Define files\n  " + "\n  ".join(define_files)
         load_section = "  # Load vertices and edges\n  " + "\n  ".join(load_statements)
 
-        # Create the final GSQL script with each section layered
-        loading_job_name = loading_job_config.loading_job_name
-        gsql_script = f"""
-# 1. Use graph
-USE GRAPH {graph_schema.graph_name}
-
-# 2. Create loading job
-CREATE LOADING JOB {loading_job_name} FOR GRAPH {graph_schema.graph_name} {{
+        # Create the loading job definition with each section layered
+        loading_job_name = loading_job_name or loading_job_config.loading_job_name
+        return f"""CREATE LOADING JOB {loading_job_name} FOR GRAPH {graph_schema.graph_name} {{
 {define_files_section}
 
 {load_section}
-}}
-
-# 3. Run loading job
-RUN LOADING JOB {loading_job_name}
-
-# 4. Drop loading job
-DROP JOB {loading_job_name}
-"""
-        logger.debug("Generated GSQL script: %s", gsql_script)
-        return gsql_script.strip()
+}}"""
 
     @staticmethod
     def _format_column_name(column_name: str | int | None) -> str:
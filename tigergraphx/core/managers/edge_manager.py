@@ -7,8 +7,15 @@
 
 import logging
 from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
 
 from .base_manager import BaseManager
+from .upsert_payload import (
+    build_edges_payload,
+    encode_attributes,
+    encode_ids,
+    resolve_attribute_column_mappings,
+)
 
 from tigergraphx.core.graph_context import GraphContext
 
@@ -80,6 +87,56 @@ class EdgeManager(BaseManager):
             logger.error(f"Error adding edges: {e}")
             return None
 
+    def add_edges_from_dataframe(
+        self,
+        data: pd.DataFrame,
+        source_id_column: str,
+        target_id_column: str,
+        src_node_type: str,
+        edge_type: str,
+        tgt_node_type: str,
+        attribute_column_mappings: Optional[Dict[str, str]] = None,
+        batch_size: int = 10000,
+    ) -> Optional[int]:
+        edge_schema = self._graph_schema.edges[edge_type]
+        for column in (source_id_column, target_id_column):
+            if column not in data.columns:
+                raise ValueError(f"ID column '{column}' does not exist in the data.")
+        mappings = resolve_attribute_column_mappings(
+            data,
+            attribute_column_mappings,
+            edge_schema.attributes,
+            excluded_columns=[source_id_column, target_id_column],
+        )
+        is_multi_edge = bool(edge_schema.discriminator)
+
+        # Validate and encode every column once, before anything is sent
+        src_ids = encode_ids(data[source_id_column])
+        tgt_ids = encode_ids(data[target_id_column])
+        bodies = encode_attributes(data, mappings, edge_schema.attributes)
+
+        accepted = 0
+        try:
+            for start in range(0, len(data), batch_size):
+                end = start + batch_size
+                payload = build_edges_payload(
+                    src_node_type,
+                    edge_type,
+                    tgt_node_type,
+                    src_ids.iloc[start:end],
+                    tgt_ids.iloc[start:end],
+                    bodies.iloc[start:end],
+                    is_multi_edge=is_multi_edge,
+                )
+                result = self._tigergraph_api.upsert_graph_data(
+                    self._graph_name, payload
+                )
+                accepted += result[0].get("accepted_edges", 0)
+            return accepted
+        except Exception as e:
+            logger.error(f"Error adding edges from DataFrame: {e}")
+            return None
+
     def has_edge(
         self,
         src_node_id: str,
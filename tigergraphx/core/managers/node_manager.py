@@ -7,8 +7,15 @@
 
 import logging
 from typing import Any, Dict, List, Optional, Set, Tuple
+import pandas as pd
 
 from .base_manager import BaseManager
+from .upsert_payload import (
+    build_vertices_payload,
+    encode_attributes,
+    encode_ids,
+    resolve_attribute_column_mappings,
+)
 
 from tigergraphx.core.graph_context import GraphContext
 
@@ -51,6 +58,51 @@ class NodeManager(BaseManager):
             logger.error(f"Error adding nodes: {e}")
             return None
 
+    def add_nodes_from_dataframe(
+        self,
+        data: pd.DataFrame,
+        node_type: str,
+        id_column: Optional[str] = None,
+        attribute_column_mappings: Optional[Dict[str, str]] = None,
+        batch_size: int = 10000,
+    ) -> Optional[int]:
+        node_schema = self._graph_schema.nodes[node_type]
+        id_column = id_column or node_schema.primary_key
+        if id_column not in data.columns:
+            raise ValueError(f"ID column '{id_column}' does not exist in the data.")
+        mappings = resolve_attribute_column_mappings(
+            data,
+            attribute_column_mappings,
+            node_schema.attributes,
+            node_schema.vector_attributes,
+            excluded_columns=[id_column],
+            excluded_attributes=[node_schema.primary_key],
+        )
+        data = data.drop_duplicates(subset=[id_column], keep="last")
+
+        # Validate and encode every column once, before anything is sent
+        ids = encode_ids(data[id_column])
+        bodies = encode_attributes(
+            data, mappings, node_schema.attributes, node_schema.vector_attributes
+        )
+
+        accepted = 0
+        try:
+            for start in range(0, len(data), batch_size):
+                payload = build_vertices_payload(
+                    node_type,
+                    ids.iloc[start : start + batch_size],
+                    bodies.iloc[start : start + batch_size],
+                )
+                result = self._tigergraph_api.upsert_graph_data(
+                    self._graph_name, payload
+                )
+                accepted += result[0].get("accepted_vertices", 0)
+            return accepted
+        except Exception as e:
+            logger.error(f"Error adding nodes from DataFrame: {e}")
+            return None
+
     def remove_node(self, node_id: str, node_type: str) -> bool:
         try:
             result = self._tigergraph_api.delete_a_node(
@@ -6,6 +6,9 @@
 # under the License. The software is provided "AS IS", without warranty.
 
 import logging
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Dict, List, Literal, Optional, Set, Tuple
 import pandas as pd
 
@@ -26,6 +29,10 @@ logger = logging.getLogger(__name__)
 class QueryManager(BaseManager):
     def __init__(self, context: GraphContext):
         super().__init__(context)
+        # Query installations run one at a time in the background, since the
+        # server compiles them sequentially anyway
+        self._installation_executor: Optional[ThreadPoolExecutor] = None
+        self._installations: Dict[str, Tuple[List[str], Future]] = {}
 
     def create_query(self, gsql_query: str) -> bool:
         try:
@@ -52,6 +59,87 @@ class QueryManager(BaseManager):
             logger.error(f"Exception while installing query '{query_name}': {e}")
             return False
 
+    def install_queries(self, query_names: List[str]) -> str:
+        if not isinstance(query_names, list) or not query_names:
+            raise ValueError("query_names must be a non-empty list of query names.")
+        if self._installation_executor is None:
+            self._installation_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="tigergraphx-query-install"
+            )
+        installation_id = uuid.uuid4().hex
+        logger.info(
+            f"Installing queries {query_names} for graph '{self._graph_name}' "
+            f"in the background (installation ID: {installation_id})..."
+        )
+        future = self._installation_executor.submit(
+            self._tigergraph_api.install_query, self._graph_name, query_names
+        )
+        self._installations[installation_id] = (list(query_names), future)
+        return installation_id
+
+    def get_query_installation_status(self, installation_id: str) -> Dict[str, Any]:
+        if installation_id not in self._installations:
+            raise ValueError(f"Unknown query installation ID: {installation_id}")
+        query_names, future = self._installations[installation_id]
+        status: Dict[str, Any] = {
+            "installation_id": installation_id,
+            "query_names": query_names,
+            "status": "RUNNING",
+            "message": None,
+        }
+        if not future.done():
+            return status
+        # The final status is only reported once, so that finished installations
+        # do not pile up
+        del self._installations[installation_id]
+        exception = future.exception()
+        if exception is not None:
+            status.update(status="FAILED", message=str(exception))
+        else:
+            result = future.result()
+            status.update(
+                status=(
+                    "SUCCESS" if "Query installed successfully" in result else "FAILED"
+                ),
+                message=result,
+            )
+        return status
+
+    def wait_for_query_installation(
+        self,
+        installation_id: str,
+        poll_interval: float = 1.0,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        start_time = time.monotonic()
+        while True:
+            status = self.get_query_installation_status(installation_id)
+            if status["status"] != "RUNNING":
+                break
+            if timeout is not None and time.monotonic() - start_time > timeout:
+                raise TimeoutError(
+                    f"Query installation {installation_id} did not finish within "
+                    f"{timeout} seconds."
+                )
+            time.sleep(poll_interval)
+
+        if status["status"] != "SUCCESS":
+            error_msg = f"Query installation failed. Installation status: {status}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+        logger.info(f"Queries {status['query_names']} installed successfully.")
+        return status
+
+    def close(self) -> None:
+        """
+        Shut down the background query installations, cancelling those that
+        have not started and waiting for the running one to finish.
+        """
+        if self._installation_executor is not None:
+            self._installation_executor.shutdown(wait=True, cancel_futures=True)
+            self._installation_executor = None
+        self._installations.clear()
+
     def drop_query(self, query_name: str) -> bool:
         try:
             result = self._tigergraph_api.drop_query(self._graph_name, query_name)
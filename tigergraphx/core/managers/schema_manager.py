@@ -5,18 +5,41 @@
 # Permission is granted to use, copy, modify, and distribute this software
 # under the License. The software is provided "AS IS", without warranty.
 
+import hashlib
 import logging
-from typing import Dict, Literal, Optional
+import re
+from typing import Dict, List, Literal, Optional, Set, Tuple
 from pathlib import Path
 
 from .base_manager import BaseManager
 
 from tigergraphx.core.graph_context import GraphContext
-from tigergraphx.config import GraphSchema, TigerGraphConnectionConfig
+from tigergraphx.config import (
+    DataType,
+    GraphSchema,
+    NodeSchema,
+    EdgeSchema,
+    VectorAttributeSchema,
+    TigerGraphConnectionConfig,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Marker placed in the body of the queries created by TigerGraphX, so that a query
+# is only recreated and reinstalled when its definition has changed
+_CONTENT_HASH_MARKER = "tigergraphx:content_hash="
+_CONTENT_HASH_PATTERN = re.compile(
+    r"QUERY\s+(\w+)\s*\([^{]*\{\s*//\s*"
+    + re.escape(_CONTENT_HASH_MARKER)
+    + r"([0-9a-f]+)"
+)
+_INSTALLED_QUERY_PATTERN = re.compile(r"^\s*-\s*(\w+)\(.*\(installed", re.MULTILINE)
+_QUERY_NAME_PATTERN = re.compile(r"^\s*-\s*(\w+)\(", re.MULTILINE)
+# Prefixes of the search queries that the VectorManager installs on demand for
+# filter expressions and expansions, which may reference any type or attribute
+_ON_DEMAND_QUERY_PREFIXES = ("api_search_filter_", "api_search_expand_")
+
 
 class SchemaManager(BaseManager):
     def __init__(self, context: GraphContext):
@@ -60,6 +83,9 @@ class SchemaManager(BaseManager):
                 raise RuntimeError(error_msg)
             logger.info("Graph schema created successfully.")
 
+            # Install the functions in the package GDS unless already installed
+            self._install_gds_functions()
+
             # Add vector attributes
             gsql_add_vector_attr = self._create_gsql_add_vector_attr()
             if gsql_add_vector_attr:
@@ -88,15 +114,16 @@ class SchemaManager(BaseManager):
                     )
                     logger.error(error_msg)
                     raise RuntimeError(error_msg)
-                if "Query installation finished" not in result:
-                    error_msg = f"Query installation failed. GSQL response: {result}"
-                    logger.error(error_msg)
-                    raise RuntimeError(error_msg)
                 logger.info("Vector attribute(s) added successfully.")
 
+                # Create and install the vector search queries
+                self.install_changed_queries(self._create_gsql_vector_queries())
+
             return True
 
         logger.debug(f"Graph '{self._graph_name}' already exists. Skipping graph creation.")
+        # Bring the vector search queries of the existing graph up to date
+        self.install_changed_queries(self._create_gsql_vector_queries())
         return False
 
     def drop_graph(self) -> None:
@@ -110,6 +137,146 @@ class SchemaManager(BaseManager):
             raise RuntimeError(error_msg)
         logger.info("Graph dropped successfully.")
 
+    def update_schema(self, drop_removed: bool = True) -> bool:
+        # A graph that does not exist yet is simply created
+        if not self._check_graph_exists():
+            return self.create_schema()
+
+        # Compare the configured schema with the one in TigerGraph
+        raw_schema = self._tigergraph_api.get_schema(self._graph_name)
+        logger.debug(f"The raw schema: {raw_schema}")
+        db_schema = self._parse_raw_schema(self._graph_name, raw_schema)
+        gsql_schema_change, gsql_vector_change = self._create_gsql_update_schema(
+            db_schema, drop_removed
+        )
+        if not gsql_schema_change and not gsql_vector_change:
+            logger.info(f"Graph schema of {self._graph_name} is up to date.")
+            return False
+
+        if gsql_schema_change:
+            logger.info(f"Updating schema for graph: {self._graph_name}...")
+            result = self._tigergraph_api.gsql(gsql_schema_change)
+            logger.debug(f"GSQL response: {result}")
+            self._check_schema_change_result(result)
+            logger.info("Graph schema updated successfully.")
+
+        if gsql_vector_change:
+            logger.info(f"Updating vector attribute(s) for graph: {self._graph_name}...")
+            result = self._tigergraph_api.gsql(gsql_vector_change)
+            logger.debug(f"GSQL response: {result}")
+            self._check_schema_change_result(result)
+            logger.info("Vector attribute(s) updated successfully.")
+
+        # The vector search queries project the regular attributes too, so they are
+        # brought up to date after any schema change
+        self.install_changed_queries(self._create_gsql_vector_queries())
+        return True
+
+    def install_changed_queries(self, queries: Dict[str, str]) -> List[str]:
+        """
+        Create and install the given queries, skipping those whose installed
+        definition is identical.
+
+        Every query is tagged with a hash of its definition in a comment of its
+        body, which is read back from the database to decide what has changed.
+
+        Args:
+            queries: The GSQL definitions of the queries, keyed by query name.
+
+        Returns:
+            The names of the queries that were (re)installed.
+        """
+        if not queries:
+            return []
+
+        content_hashes = {
+            query_name: hashlib.sha256(gsql_query.encode("utf-8")).hexdigest()[:16]
+            for query_name, gsql_query in queries.items()
+        }
+        installed_hashes = self._get_installed_query_hashes()
+        changed_query_names = [
+            query_name
+            for query_name, content_hash in content_hashes.items()
+            if installed_hashes.get(query_name) != content_hash
+        ]
+        if not changed_query_names:
+            logger.debug(f"All {len(queries)} queries are up to date. Skipping installation.")
+            return []
+
+        query_statements_str = "\n".join(
+            self._add_content_hash(queries[query_name], content_hashes[query_name])
+            for query_name in changed_query_names
+        )
+        gsql_script = f"""
+# 1. Use graph
+USE GRAPH {self._graph_name}
+
+# 2. Create queries
+{query_statements_str}
+
+# 3. Install queries
+INSTALL QUERY {", ".join(changed_query_names)}
+"""
+        logger.info(
+            f"Installing {len(changed_query_names)} query(ies) for graph: "
+            f"{self._graph_name}..."
+        )
+        result = self._tigergraph_api.gsql(gsql_script.strip())
+        logger.debug(f"GSQL response: {result}")
+        if "Query installation finished" not in result:
+            error_msg = f"Query installation failed. GSQL response: {result}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+        logger.info("Query(ies) installed successfully.")
+        return changed_query_names
+
+    def _get_installed_query_hashes(self) -> Dict[str, str]:
+        """
+        Return the content hashes of the installed queries on the graph.
+        """
+        result = self._tigergraph_api.gsql(
+            f"USE GRAPH {self._graph_name}\nSHOW QUERY *\nLS"
+        )
+        installed_query_names = set(_INSTALLED_QUERY_PATTERN.findall(result))
+        return {
+            query_name: content_hash
+            for query_name, content_hash in _CONTENT_HASH_PATTERN.findall(result)
+            if query_name in installed_query_names
+        }
+
+    def _get_query_names(self) -> Set[str]:
+        """
+        Return the names of all queries on the graph, installed or not.
+        """
+        result = self._tigergraph_api.gsql(
+            f"USE GRAPH {self._graph_name}\nSHOW QUERY *\nLS"
+        )
+        return set(_QUERY_NAME_PATTERN.findall(result))
+
+    @staticmethod
+    def _add_content_hash(gsql_query: str, content_hash: str) -> str:
+        # The marker goes into the body, since GSQL keeps comments inside queries
+        return gsql_query.replace(
+            "{\n", f"{{\n  // {_CONTENT_HASH_MARKER}{content_hash}\n", 1
+        )
+
+    def _install_gds_functions(self) -> None:
+        # The functions are installed globally, so skip them if another graph
+        # has installed them already
+        result = self._tigergraph_api.gsql("USE GLOBAL\nSHOW PACKAGE GDS")
+        if "(installed" in result:
+            logger.debug("Functions in the package GDS are already installed.")
+            return
+        logger.info("Installing functions in the package GDS...")
+        gsql_script = """
+# Install functions in the package gds
+USE GLOBAL
+IMPORT PACKAGE GDS
+INSTALL FUNCTION GDS.**
+"""
+        result = self._tigergraph_api.gsql(gsql_script.strip())
+        logger.debug(f"GSQL response: {result}")
+
     def _check_graph_exists(self) -> bool:
         """Check if the specified graph name exists in the gsql_script."""
         result = self._tigergraph_api.gsql(f"USE Graph {self._graph_name}")
@@ -120,6 +287,21 @@ class SchemaManager(BaseManager):
         )
         return "Using graph" in result
 
+    @staticmethod
+    def _check_schema_change_result(result: str) -> None:
+        if "Successfully created schema change jobs" not in result:
+            error_msg = f"Schema change job creation failed. GSQL response: {result}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+        if "Local schema change succeeded" not in result:
+            error_msg = f"Schema change failed. GSQL response: {result}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+        if "Successfully dropped jobs" not in result:
+            error_msg = f"Schema change job cleanup failed. GSQL response: {result}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+
     def _create_gsql_drop_graph(self) -> str:
         # Generating the gsql script to drop graph
         gsql_script = f"""
@@ -133,71 +315,16 @@ DROP GRAPH {self._graph_name}
     def _create_gsql_graph_schema(self) -> str:
         # Extracting node attributes
         graph_schema = self._graph_schema
-        node_definitions = []
-        for node_name, node_schema in graph_schema.nodes.items():
-            primary_key_name = node_schema.primary_key
-
-            # Extract the primary ID type
-            primary_key_type = node_schema.attributes[primary_key_name].data_type.value
-
-            # Build attribute string excluding the primary ID, since it’s declared separately
-            node_attr_str = ", ".join(
-                [
-                    f"{attribute_name} {attribute_schema.data_type.value}"
-                    for attribute_name, attribute_schema in node_schema.attributes.items()
-                    if attribute_name != primary_key_name
-                ]
-            )
-
-            # Append the vertex definition with the dynamic primary ID
-            node_definitions.append(
-                f"ADD VERTEX {node_name}(PRIMARY_ID {primary_key_name} {primary_key_type}"
-                + (f", {node_attr_str}" if node_attr_str else "")
-                + ') WITH PRIMARY_ID_AS_ATTRIBUTE="true";'
-            )
+        node_definitions = [
+            self._create_gsql_add_vertex(node_name, node_schema)
+            for node_name, node_schema in graph_schema.nodes.items()
+        ]
 
         # Extracting edge attributes
-        edge_definitions = []
-        for edge_name, edge_schema in graph_schema.edges.items():
-            edge_attr_str = []
-
-            # Separate out the regular attributes and discriminator attributes
-            regular_attrs = []
-            discriminator_attrs = []
-            for attribute_name, attribute_schema in edge_schema.attributes.items():
-                if attribute_name in edge_schema.discriminator:
-                    # This attribute is part of the edge identifier
-                    discriminator_attrs.append(
-                        f"{attribute_name} {attribute_schema.data_type.value}"
-                    )
-                else:
-                    # This attribute is a regular edge attribute
-                    regular_attrs.append(
-                        f"{attribute_name} {attribute_schema.data_type.value}"
-                    )
-
-            # Combine regular and discriminator attributes
-            if discriminator_attrs:
-                discriminator_str = f"DISCRIMINATOR({', '.join(discriminator_attrs)})"
-                edge_attr_str.append(discriminator_str)
-
-            # Adding regular attributes to edge definition string
-            if regular_attrs:
-                edge_attr_str.append(", ".join(regular_attrs))
-
-            # Construct the edge definition, with conditional attribute string and direction
-            edge_type_str = "DIRECTED" if edge_schema.is_directed_edge else "UNDIRECTED"
-            reverse_edge_clause = (
-                f' WITH REVERSE_EDGE="reverse_{edge_name}"'
-                if edge_schema.is_directed_edge
-                else ""
-            )
-
-            edge_definitions.append(
-                f"ADD {edge_type_str} EDGE {edge_name}(FROM {edge_schema.from_node_type}, TO {edge_schema.to_node_type}"
-                + (f", {', '.join(edge_attr_str)}" if edge_attr_str else "")
-                + f"){reverse_edge_clause};"
-            )
+        edge_definitions = [
+            self._create_gsql_add_edge(edge_name, edge_schema)
+            for edge_name, edge_schema in graph_schema.edges.items()
+        ]
 
         # Generating the full schema string
         graph_name = graph_schema.graph_name
@@ -227,21 +354,386 @@ RUN SCHEMA_CHANGE JOB schema_change_job_for_graph_{graph_name}
 
 # 4. Drop schema_change job
 DROP JOB schema_change_job_for_graph_{graph_name}
-
-# 5. Install functions in the package gds
-USE GLOBAL
-IMPORT PACKAGE GDS
-INSTALL FUNCTION GDS.**
 """
         logger.debug("GSQL script for creating graph: %s", gsql_script)
         return gsql_script.strip()
 
-    def _create_gsql_add_vector_attr(self) -> str:
+    @staticmethod
+    def _create_gsql_add_vertex(node_name: str, node_schema: NodeSchema) -> str:
+        primary_key_name = node_schema.primary_key
+
+        # Extract the primary ID type
+        primary_key_type = node_schema.attributes[primary_key_name].data_type.value
+
+        # Build attribute string excluding the primary ID, since it’s declared separately
+        node_attr_str = ", ".join(
+            [
+                f"{attribute_name} {attribute_schema.data_type.value}"
+                for attribute_name, attribute_schema in node_schema.attributes.items()
+                if attribute_name != primary_key_name
+            ]
+        )
+
+        # Return the vertex definition with the dynamic primary ID
+        return (
+            f"ADD VERTEX {node_name}(PRIMARY_ID {primary_key_name} {primary_key_type}"
+            + (f", {node_attr_str}" if node_attr_str else "")
+            + ') WITH PRIMARY_ID_AS_ATTRIBUTE="true";'
+        )
+
+    @staticmethod
+    def _create_gsql_add_edge(edge_name: str, edge_schema: EdgeSchema) -> str:
+        edge_attr_str = []
+
+        # Separate out the regular attributes and discriminator attributes
+        regular_attrs = []
+        discriminator_attrs = []
+        for attribute_name, attribute_schema in edge_schema.attributes.items():
+            if attribute_name in edge_schema.discriminator:
+                # This attribute is part of the edge identifier
+                discriminator_attrs.append(
+                    f"{attribute_name} {attribute_schema.data_type.value}"
+                )
+            else:
+                # This attribute is a regular edge attribute
+                regular_attrs.append(
+                    f"{attribute_name} {attribute_schema.data_type.value}"
+                )
+
+        # Combine regular and discriminator attributes
+        if discriminator_attrs:
+            discriminator_str = f"DISCRIMINATOR({', '.join(discriminator_attrs)})"
+            edge_attr_str.append(discriminator_str)
+
+        # Adding regular attributes to edge definition string
+        if regular_attrs:
+            edge_attr_str.append(", ".join(regular_attrs))
+
+        # Construct the edge definition, with conditional attribute string and direction
+        edge_type_str = "DIRECTED" if edge_schema.is_directed_edge else "UNDIRECTED"
+        reverse_edge_clause = (
+            f' WITH REVERSE_EDGE="reverse_{edge_name}"'
+            if edge_schema.is_directed_edge
+            else ""
+        )
+
+        return (
+            f"ADD {edge_type_str} EDGE {edge_name}(FROM {edge_schema.from_node_type}, TO {edge_schema.to_node_type}"
+            + (f", {', '.join(edge_attr_str)}" if edge_attr_str else "")
+            + f"){reverse_edge_clause};"
+        )
+
+    def _create_gsql_update_schema(
+        self, db_schema: Dict, drop_removed: bool = True
+    ) -> Tuple[str, str]:
         """
-        Generate the GSQL script to add vector attributes to vertices.
+        Generate the GSQL scripts that evolve the graph in the database into the
+        configured schema.
+
+        Only the differences are applied: node and edge types, attributes and
+        vector attributes that are missing are added, and those that are no longer
+        configured are dropped. An attribute or vector attribute whose definition
+        changed is dropped and added again, and so is an edge type whose endpoints,
+        direction or discriminator changed.
 
         Args:
-            graph_schema (GraphSchema): The graph schema configuration.
+            db_schema: The schema in the database, as returned by `_parse_raw_schema`.
+            drop_removed: If False, types and attributes that only exist in the
+                database are kept, and changes that would require dropping data
+                raise an error instead.
+
+        Returns:
+            A tuple of the script for the node, edge and attribute changes and the
+            script for the vector attribute changes. Empty strings mean nothing has
+            to be changed.
+
+        Raises:
+            ValueError: If the primary key of an existing node type changed, or if
+                `drop_removed` is False and a change requires dropping data.
+        """
+        graph_name = self._graph_name
+        nodes = self._graph_schema.nodes
+        edges = self._graph_schema.edges
+        db_nodes = db_schema.get("nodes", {})
+        db_edges = db_schema.get("edges", {})
+
+        def _check_drop(description: str) -> None:
+            if not drop_removed:
+                raise ValueError(
+                    f"{description} requires dropping existing data. Call "
+                    "update_schema with drop_removed=True, or recreate the graph "
+                    "with create_schema(drop_existing_graph=True)."
+                )
+
+        def _diff_attributes(
+            type_name: str,
+            attributes: Dict,
+            db_attributes: Dict,
+            excluded: Optional[set] = None,
+        ) -> Tuple[List[str], List[str]]:
+            excluded = excluded or set()
+            to_add = []
+            to_drop = []
+            for name, attribute_schema in attributes.items():
+                if name in excluded:
+                    continue
+                if name not in db_attributes:
+                    to_add.append(f"{name} {attribute_schema.data_type.value}")
+                elif attribute_schema.data_type.value != db_attributes[name]["data_type"]:
+                    _check_drop(f"Changing the type of attribute '{type_name}.{name}'")
+                    to_drop.append(name)
+                    to_add.append(f"{name} {attribute_schema.data_type.value}")
+            for name in db_attributes:
+                if name not in attributes and name not in excluded and drop_removed:
+                    to_drop.append(name)
+            return to_add, to_drop
+
+        # Generated queries that reference types or attributes which are about to
+        # disappear, and would otherwise block or break the schema change jobs
+        schema_change_query_names: Set[str] = set()
+        vector_change_query_names: Set[str] = set()
+        # Statements of the schema change job, grouped in execution order
+        drop_edge_statements = []
+        drop_attribute_statements = []
+        drop_node_statements = []
+        add_node_statements = []
+        add_attribute_statements = []
+        add_edge_statements = []
+        # Statements of the vector schema change job
+        drop_vector_statements = []
+        add_vector_statements = []
+
+        # Compare node types
+        for node_type, node_schema in nodes.items():
+            if node_type not in db_nodes:
+                add_node_statements.append(
+                    self._create_gsql_add_vertex(node_type, node_schema)
+                )
+                for name, vector_attr in node_schema.vector_attributes.items():
+                    add_vector_statements.append(
+                        self._create_gsql_add_vector_attribute(
+                            node_type, name, vector_attr
+                        )
+                    )
+                continue
+
+            db_node = db_nodes[node_type]
+            primary_key = node_schema.primary_key
+            if (
+                primary_key != db_node["primary_key"]
+                or node_schema.attributes[primary_key].data_type.value
+                != db_node["attributes"][db_node["primary_key"]]["data_type"]
+            ):
+                raise ValueError(
+                    f"The primary key of node type '{node_type}' cannot be changed "
+                    "in place. Recreate the graph with "
+                    "create_schema(drop_existing_graph=True) instead."
+                )
+
+            to_add, to_drop = _diff_attributes(
+                node_type,
+                node_schema.attributes,
+                db_node["attributes"],
+                excluded={primary_key, db_node["primary_key"]},
+            )
+            db_vector_attributes = db_node.get("vector_attributes", {})
+            if to_drop:
+                drop_attribute_statements.append(
+                    f"ALTER VERTEX {node_type} DROP ATTRIBUTE ({', '.join(to_drop)});"
+                )
+                # The search queries of the node type project its attributes
+                for name in db_vector_attributes:
+                    schema_change_query_names.update(
+                        self._get_vector_query_names(node_type, name)
+                    )
+            if to_add:
+                add_attribute_statements.append(
+                    f"ALTER VERTEX {node_type} ADD ATTRIBUTE ({', '.join(to_add)});"
+                )
+
+            for name, vector_attr in node_schema.vector_attributes.items():
+                if name in db_vector_attributes:
+                    db_vector_attr = db_vector_attributes[name]
+                    if (
+                        vector_attr.dimension == db_vector_attr["dimension"]
+                        and vector_attr.index_type == db_vector_attr["index_type"]
+                        and vector_attr.data_type == db_vector_attr["data_type"]
+                        and vector_attr.metric == db_vector_attr["metric"]
+                    ):
+                        continue
+                    _check_drop(
+                        f"Changing the definition of vector attribute '{node_type}.{name}'"
+                    )
+                    vector_change_query_names.update(
+                        self._get_vector_query_names(node_type, name)
+                    )
+                    drop_vector_statements.append(
+                        f"ALTER VERTEX {node_type} DROP VECTOR ATTRIBUTE {name};"
+                    )
+                add_vector_statements.append(
+                    self._create_gsql_add_vector_attribute(node_type, name, vector_attr)
+                )
+            if drop_removed:
+                for name in db_vector_attributes:
+                    if name not in node_schema.vector_attributes:
+                        vector_change_query_names.update(
+                            self._get_vector_query_names(node_type, name)
+                        )
+                        drop_vector_statements.append(
+                            f"ALTER VERTEX {node_type} DROP VECTOR ATTRIBUTE {name};"
+                        )
+
+        if drop_removed:
+            for node_type, db_node in db_nodes.items():
+                if node_type not in nodes:
+                    for name in db_node.get("vector_attributes", {}):
+                        schema_change_query_names.update(
+                            self._get_vector_query_names(node_type, name)
+                        )
+                    drop_node_statements.append(f"DROP VERTEX {node_type};")
+
+        # Compare edge types
+        for edge_type, edge_schema in edges.items():
+            if edge_type in db_edges:
+                db_edge = db_edges[edge_type]
+                discriminator = (
+                    {edge_schema.discriminator}
+                    if isinstance(edge_schema.discriminator, str)
+                    else set(edge_schema.discriminator)
+                )
+                if (
+                    edge_schema.is_directed_edge == db_edge["is_directed_edge"]
+                    and edge_schema.from_node_type == db_edge["from_node_type"]
+                    and edge_schema.to_node_type == db_edge["to_node_type"]
+                    and discriminator == set(db_edge["discriminator"])
+                    and all(
+                        edge_schema.attributes[name].data_type.value
+                        == db_edge["attributes"][name]["data_type"]
+                        for name in discriminator
+                    )
+                ):
+                    to_add, to_drop = _diff_attributes(
+                        edge_type,
+                        edge_schema.attributes,
+                        db_edge["attributes"],
+                        excluded=discriminator,
+                    )
+                    if to_drop:
+                        drop_attribute_statements.append(
+                            f"ALTER EDGE {edge_type} DROP ATTRIBUTE ({', '.join(to_drop)});"
+                        )
+                    if to_add:
+                        add_attribute_statements.append(
+                            f"ALTER EDGE {edge_type} ADD ATTRIBUTE ({', '.join(to_add)});"
+                        )
+                    continue
+                _check_drop(f"Changing the definition of edge type '{edge_type}'")
+                drop_edge_statements.append(f"DROP EDGE {edge_type};")
+            add_edge_statements.append(self._create_gsql_add_edge(edge_type, edge_schema))
+
+        if drop_removed:
+            for edge_type in db_edges:
+                if edge_type not in edges:
+                    drop_edge_statements.append(f"DROP EDGE {edge_type};")
+
+        # Drop the affected queries that exist on the graph. The queries installed
+        # on demand may reference any type or attribute, so they are dropped with
+        # any change that drops something, and installed again on their next use.
+        drops_schema = bool(
+            drop_edge_statements or drop_attribute_statements or drop_node_statements
+        )
+        drop_schema_query_statements: List[str] = []
+        drop_vector_query_statements: List[str] = []
+        if drops_schema or drop_vector_statements:
+            existing_query_names = self._get_query_names()
+            on_demand_query_names = {
+                query_name
+                for query_name in existing_query_names
+                if query_name.startswith(_ON_DEMAND_QUERY_PREFIXES)
+            }
+            if drops_schema:
+                schema_change_query_names |= on_demand_query_names
+            else:
+                vector_change_query_names |= on_demand_query_names
+            schema_change_query_names &= existing_query_names
+            vector_change_query_names &= existing_query_names
+            vector_change_query_names -= schema_change_query_names
+            drop_schema_query_statements = [
+                f"DROP QUERY {query_name}"
+                for query_name in sorted(schema_change_query_names)
+            ]
+            drop_vector_query_statements = [
+                f"DROP QUERY {query_name}"
+                for query_name in sorted(vector_change_query_names)
+            ]
+
+        # Generate the script for the node, edge and attribute changes
+        schema_change_statements = (
+            drop_edge_statements
+            + drop_attribute_statements
+            + drop_node_statements
+            + add_node_statements
+            + add_attribute_statements
+            + add_edge_statements
+        )
+        gsql_schema_change = ""
+        if schema_change_statements:
+            gsql_schema_change = self._create_gsql_schema_change_job(
+                f"update_schema_for_graph_{graph_name}",
+                schema_change_statements,
+                drop_schema_query_statements,
+            )
+        logger.debug("GSQL script for updating graph: %s", gsql_schema_change)
+
+        # Generate the script for the vector attribute changes
+        vector_statements = drop_vector_statements + add_vector_statements
+        gsql_vector_change = ""
+        if vector_statements:
+            gsql_vector_change = self._create_gsql_schema_change_job(
+                f"update_vector_attr_for_graph_{graph_name}",
+                vector_statements,
+                drop_vector_query_statements,
+            )
+        logger.debug(
+            "GSQL script for updating vector attributes: %s", gsql_vector_change
+        )
+
+        return gsql_schema_change, gsql_vector_change
+
+    def _create_gsql_schema_change_job(
+        self,
+        job_name: str,
+        schema_change_statements: List[str],
+        drop_query_statements: Optional[List[str]] = None,
+    ) -> str:
+        graph_name = self._graph_name
+        drop_query_str = ""
+        if drop_query_statements:
+            drop_query_str = (
+                "\n# 1.1 Drop queries using the dropped types and attributes\n"
+                + "\n".join(drop_query_statements)
+            )
+        schema_change_statements_str = "\n  ".join(schema_change_statements)
+        gsql_script = f"""
+# 1. Use graph
+USE GRAPH {graph_name}{drop_query_str}
+
+# 2. Create schema_change job
+CREATE SCHEMA_CHANGE JOB {job_name} FOR GRAPH {graph_name} {{
+  {schema_change_statements_str}
+}}
+
+# 3. Run schema_change job
+RUN SCHEMA_CHANGE JOB {job_name}
+
+# 4. Drop schema_change job
+DROP JOB {job_name}
+"""
+        return gsql_script.strip()
+
+    def _create_gsql_add_vector_attr(self) -> str:
+        """
+        Generate the GSQL script to add vector attributes to vertices.
 
         Returns:
             str: The generated GSQL script.
@@ -250,36 +742,182 @@ INSTALL FUNCTION GDS.**
         # List to hold GSQL commands for adding vector attributes
         vector_attribute_statements = []
 
-        # List to hold GSQL commands for creating vector search query
-        query_statements = []
-
         # Iterate over all nodes and their vector attributes
         for node_type, node_schema in graph_schema.nodes.items():
-            if node_schema.vector_attributes:
-                for (
-                    vector_attribute_name,
-                    vector_attr,
-                ) in node_schema.vector_attributes.items():
-                    # Extract the fields from VectorAttributeSchema
-                    dimension = vector_attr.dimension
-                    index_type = vector_attr.index_type
-                    data_type = vector_attr.data_type
-                    metric = vector_attr.metric
-
-                    # Generate GSQL for each vector attribute in the node schema
-                    vector_attribute_statements.append(
-                        f"ALTER VERTEX {node_type} ADD VECTOR ATTRIBUTE {vector_attribute_name}"
-                        f'(DIMENSION={dimension}, INDEXTYPE="{index_type}", '
-                        f'DATATYPE="{data_type}", METRIC="{metric}");'
+            for (
+                vector_attribute_name,
+                vector_attr,
+            ) in node_schema.vector_attributes.items():
+                vector_attribute_statements.append(
+                    self._create_gsql_add_vector_attribute(
+                        node_type, vector_attribute_name, vector_attr
                     )
-                    query_statements.append(
-                        f"""
+                )
+
+        # Combine all statements and wrap them into the full GSQL script
+        if len(vector_attribute_statements) == 0:
+            gsql_script = ""
+        else:
+            vector_attribute_statements_str = "\n  ".join(vector_attribute_statements)
+            gsql_script = f"""
+# 1. Use graph
+USE GRAPH {graph_schema.graph_name}
+
+# 2. Create schema_change job
+CREATE SCHEMA_CHANGE JOB add_vector_attr_for_graph_{graph_schema.graph_name} FOR GRAPH {graph_schema.graph_name} {{
+  # 2.1 Add vector attributes
+  {vector_attribute_statements_str}
+}}
+
+# 3. Run schema_change job
+RUN SCHEMA_CHANGE JOB add_vector_attr_for_graph_{graph_schema.graph_name}
+
+# 4. Drop schema_change job
+DROP JOB add_vector_attr_for_graph_{graph_schema.graph_name}
+"""
+        logger.debug("GSQL script for adding vector attributes: %s", gsql_script)
+        return gsql_script.rstrip()
+
+    def _create_gsql_vector_queries(self) -> Dict[str, str]:
+        """
+        Generate the GSQL definitions of the vector search queries, keyed by query name.
+        """
+        queries = {}
+        for node_type, node_schema in self._graph_schema.nodes.items():
+            for vector_attribute_name in node_schema.vector_attributes:
+                query_names = self._get_vector_query_names(
+                    node_type, vector_attribute_name
+                )
+                gsql_queries = [
+                    self._create_gsql_vector_search_query(
+                        node_type, vector_attribute_name, node_schema
+                    ),
+                    self._create_gsql_vector_search_batch_query(
+                        node_type, vector_attribute_name, node_schema
+                    ),
+                    self._create_gsql_similar_query(
+                        node_type, vector_attribute_name, node_schema
+                    ),
+                    self._create_gsql_similar_batch_query(
+                        node_type, vector_attribute_name, node_schema
+                    ),
+                    self._create_gsql_vector_fetch_query(
+                        node_type, vector_attribute_name
+                    ),
+                ]
+                queries.update(zip(query_names, gsql_queries))
+        if queries:
+            queries["api_fetch"] = self._create_gsql_fetch_query()
+        return queries
+
+    @staticmethod
+    def _get_vector_query_names(node_type: str, vector_attribute_name: str) -> List[str]:
+        """
+        Return the names of the queries generated for a vector attribute, in the
+        order in which `_create_gsql_vector_queries` defines them.
+        """
+        return [
+            f"{prefix}_{node_type}_{vector_attribute_name}"
+            for prefix in [
+                "api_search",
+                "api_search_batch",
+                "api_similar",
+                "api_similar_batch",
+                "api_fetch",
+            ]
+        ]
+
+    @staticmethod
+    def _create_gsql_add_vector_attribute(
+        node_type: str,
+        vector_attribute_name: str,
+        vector_attr: VectorAttributeSchema,
+    ) -> str:
+        # Extract the fields from VectorAttributeSchema
+        dimension = vector_attr.dimension
+        index_type = vector_attr.index_type
+        data_type = vector_attr.data_type
+        metric = vector_attr.metric
+
+        return (
+            f"ALTER VERTEX {node_type} ADD VECTOR ATTRIBUTE {vector_attribute_name}"
+            f'(DIMENSION={dimension}, INDEXTYPE="{index_type}", '
+            f'DATATYPE="{data_type}", METRIC="{metric}");'
+        )
+
+    @staticmethod
+    def _create_gsql_attribute_projection(node_schema: NodeSchema) -> str:
+        """
+        Generate the GSQL statements that print only the attributes listed in the
+        `return_attributes` parameter.
+
+        GSQL cannot look up attributes by name, so every attribute of the node type
+        gets its own branch. Floating-point values are collected into a map of
+        doubles, so that they keep their precision, and all other values into a
+        map of strings, which the client converts back to their types.
+        """
+        projection_statements = ",\n".join(
+            f'        IF return_attributes.contains("{attribute_name}") THEN '
+            + SchemaManager._create_gsql_projected_value(
+                attribute_name, attribute_schema.data_type
+            )
+            + " END"
+            for attribute_name, attribute_schema in node_schema.attributes.items()
+        )
+        return f"""
+  IF project_attributes THEN
+    Nodes = SELECT s FROM Nodes:s
+      POST-ACCUM
+{projection_statements};
+    PRINT Nodes[
+      Nodes.@map_attribute AS projected_attributes,
+      Nodes.@map_double_attribute AS projected_double_attributes
+    ];
+  ELSE
+    PRINT Nodes;
+  END;
+""".strip("\n")
+
+    @staticmethod
+    def _create_gsql_projected_value(attribute_name: str, data_type: DataType) -> str:
+        """
+        Generate the statement that adds the value of an attribute to the map of
+        projected attributes, converted according to its data type.
+        """
+        if data_type in (DataType.FLOAT, DataType.DOUBLE):
+            return (
+                f's.@map_double_attribute += ("{attribute_name}" -> s.{attribute_name})'
+            )
+        if data_type == DataType.BOOL:
+            return (
+                f'IF s.{attribute_name} THEN s.@map_attribute += ("{attribute_name}" '
+                f'-> "true") ELSE s.@map_attribute += ("{attribute_name}" -> "false") END'
+            )
+        if data_type == DataType.DATETIME:
+            # The format TigerGraph prints datetime attributes in
+            value = f'datetime_format(s.{attribute_name}, "%Y-%m-%d %H:%M:%S")'
+        elif data_type == DataType.STRING:
+            value = f"s.{attribute_name}"
+        else:
+            value = f"to_string(s.{attribute_name})"
+        return f's.@map_attribute += ("{attribute_name}" -> {value})'
+
+    @staticmethod
+    def _create_gsql_vector_search_query(
+        node_type: str, vector_attribute_name: str, node_schema: NodeSchema
+    ) -> str:
+        projection = SchemaManager._create_gsql_attribute_projection(node_schema)
+        return f"""
 CREATE OR REPLACE QUERY api_search_{node_type}_{vector_attribute_name} (
   UINT k=10,
   LIST<float> query_vector,
-  SET<VERTEX> set_candidate
+  SET<VERTEX> set_candidate,
+  SET<STRING> return_attributes,
+  BOOL project_attributes=FALSE
 ) SYNTAX v3 {{
   MapAccum<Vertex, Float> @@map_node_distance;
+  MapAccum<STRING, STRING> @map_attribute;
+  MapAccum<STRING, DOUBLE> @map_double_attribute;
 
   IF set_candidate.size() > 0 THEN
     Candidates = {{set_candidate}};
@@ -299,17 +937,165 @@ CREATE OR REPLACE QUERY api_search_{node_type}_{vector_attribute_name} (
   END;
 
   PRINT @@map_node_distance AS map_node_distance;
-  PRINT Nodes;
+{projection}
 }}
 """.strip()
-                    )
 
-        # Combine all statements and wrap them into the full GSQL script
-        if len(vector_attribute_statements) == 0:
-            gsql_script = ""
-        else:
-            query_statements.append(
-                """
+    @staticmethod
+    def _create_gsql_vector_search_batch_query(
+        node_type: str, vector_attribute_name: str, node_schema: NodeSchema
+    ) -> str:
+        # The query vectors are passed flattened, as GSQL has no nested list parameters
+        projection = SchemaManager._create_gsql_attribute_projection(node_schema)
+        return f"""
+CREATE OR REPLACE QUERY api_search_batch_{node_type}_{vector_attribute_name} (
+  UINT k=10,
+  UINT dimension,
+  LIST<FLOAT> query_vectors,
+  SET<VERTEX> set_candidate,
+  SET<STRING> return_attributes,
+  BOOL project_attributes=FALSE
+) SYNTAX v3 {{
+  MapAccum<INT, MapAccum<Vertex, Float>> @@map_query_node_distance;
+  MapAccum<Vertex, Float> @@map_node_distance;
+  ListAccum<Float> @@query_vector;
+  SetAccum<Vertex> @@set_result_node;
+  MapAccum<STRING, STRING> @map_attribute;
+  MapAccum<STRING, DOUBLE> @map_double_attribute;
+  INT num_queries = query_vectors.size() / dimension;
+  INT i = 0;
+
+  Candidates = {{set_candidate}};
+  WHILE i < num_queries DO
+    @@query_vector.clear();
+    @@map_node_distance.clear();
+    FOREACH j IN RANGE[0, dimension - 1] DO
+      @@query_vector += query_vectors.get(i * dimension + j);
+    END;
+
+    IF set_candidate.size() > 0 THEN
+      Nodes = vectorSearch(
+        {{{node_type}.{vector_attribute_name}}},
+        @@query_vector,
+        k,
+        {{ distance_map: @@map_node_distance, candidate_set: Candidates}}
+      );
+    ELSE
+      Nodes = vectorSearch(
+        {{{node_type}.{vector_attribute_name}}},
+        @@query_vector,
+        k,
+        {{ distance_map: @@map_node_distance}}
+      );
+    END;
+
+    @@map_query_node_distance += (i -> @@map_node_distance);
+    Nodes = SELECT s FROM Nodes:s POST-ACCUM @@set_result_node += s;
+    i = i + 1;
+  END;
+
+  Nodes = {{@@set_result_node}};
+  PRINT @@map_query_node_distance AS map_query_node_distance;
+{projection}
+}}
+""".strip()
+
+    @staticmethod
+    def _create_gsql_similar_query(
+        node_type: str, vector_attribute_name: str, node_schema: NodeSchema
+    ) -> str:
+        # The source vector never leaves the server; the source itself is excluded
+        projection = SchemaManager._create_gsql_attribute_projection(node_schema)
+        return f"""
+CREATE OR REPLACE QUERY api_similar_{node_type}_{vector_attribute_name} (
+  VERTEX source,
+  UINT k=10,
+  SET<STRING> return_attributes,
+  BOOL project_attributes=FALSE
+) SYNTAX v3 {{
+  MapAccum<Vertex, Float> @@map_node_distance;
+  ListAccum<Float> @@query_vector;
+  MapAccum<STRING, STRING> @map_attribute;
+  MapAccum<STRING, DOUBLE> @map_double_attribute;
+
+  Source = {{source}};
+  Source = SELECT s FROM Source:s POST-ACCUM @@query_vector = s.{vector_attribute_name};
+
+  Nodes = vectorSearch(
+    {{{node_type}.{vector_attribute_name}}},
+    @@query_vector,
+    k + 1,
+    {{ distance_map: @@map_node_distance}}
+  );
+  Nodes = Nodes MINUS Source;
+  @@map_node_distance.remove(source);
+
+  PRINT @@map_node_distance AS map_node_distance;
+{projection}
+}}
+""".strip()
+
+    @staticmethod
+    def _create_gsql_similar_batch_query(
+        node_type: str, vector_attribute_name: str, node_schema: NodeSchema
+    ) -> str:
+        projection = SchemaManager._create_gsql_attribute_projection(node_schema)
+        return f"""
+CREATE OR REPLACE QUERY api_similar_batch_{node_type}_{vector_attribute_name} (
+  SET<VERTEX> sources,
+  UINT k=10,
+  SET<STRING> return_attributes,
+  BOOL project_attributes=FALSE
+) SYNTAX v3 {{
+  MapAccum<Vertex, MapAccum<Vertex, Float>> @@map_source_node_distance;
+  MapAccum<Vertex, Float> @@map_node_distance;
+  ListAccum<Float> @@query_vector;
+  SetAccum<Vertex> @@set_result_node;
+  MapAccum<STRING, STRING> @map_attribute;
+  MapAccum<STRING, DOUBLE> @map_double_attribute;
+
+  FOREACH source IN sources DO
+    @@query_vector.clear();
+    @@map_node_distance.clear();
+    Source = {{source}};
+    Source = SELECT s FROM Source:s POST-ACCUM @@query_vector = s.{vector_attribute_name};
+
+    Nodes = vectorSearch(
+      {{{node_type}.{vector_attribute_name}}},
+      @@query_vector,
+      k + 1,
+      {{ distance_map: @@map_node_distance}}
+    );
+    @@map_node_distance.remove(source);
+
+    @@map_source_node_distance += (source -> @@map_node_distance);
+    Nodes = SELECT s FROM Nodes:s WHERE s != source POST-ACCUM @@set_result_node += s;
+  END;
+
+  Nodes = {{@@set_result_node}};
+  PRINT @@map_source_node_distance AS map_source_node_distance;
+{projection}
+}}
+""".strip()
+
+    @staticmethod
+    def _create_gsql_vector_fetch_query(
+        node_type: str, vector_attribute_name: str
+    ) -> str:
+        # Only the requested vector is printed, not every vector of the node type
+        return f"""
+CREATE OR REPLACE QUERY api_fetch_{node_type}_{vector_attribute_name}(
+  SET<VERTEX> input
+) SYNTAX v3 {{
+  Nodes = {{input}};
+  Nodes = SELECT s FROM Nodes:s WHERE s.type == "{node_type}";
+  PRINT Nodes[Nodes.{vector_attribute_name}] WITH VECTOR;
+}}
+""".strip()
+
+    @staticmethod
+    def _create_gsql_fetch_query() -> str:
+        return """
 CREATE OR REPLACE QUERY api_fetch(
   SET<VERTEX> input
 ) SYNTAX v3 {
@@ -317,33 +1103,6 @@ CREATE OR REPLACE QUERY api_fetch(
   PRINT Nodes WITH VECTOR;
 }
 """.strip()
-            )
-            vector_attribute_statements_str = "\n  ".join(vector_attribute_statements)
-            query_statements_str = "\n".join(query_statements)
-            gsql_script = f"""
-# 1. Use graph
-USE GRAPH {graph_schema.graph_name}
-
-# 2. Create schema_change job
-CREATE SCHEMA_CHANGE JOB add_vector_attr_for_graph_{graph_schema.graph_name} FOR GRAPH {graph_schema.graph_name} {{
-  # 2.1 Add vector attributes
-  {vector_attribute_statements_str}
-}}
-
-# 3. Run schema_change job
-RUN SCHEMA_CHANGE JOB add_vector_attr_for_graph_{graph_schema.graph_name}
-
-# 4. Drop schema_change job
-DROP JOB add_vector_attr_for_graph_{graph_schema.graph_name}
-"""
-            if len(query_statements) > 0:
-                gsql_script = f"""
-{gsql_script}
-{query_statements_str}
-INSTALL QUERY *
-"""
-        logger.debug("GSQL script for adding vector attributes: %s", gsql_script)
-        return gsql_script.rstrip()
 
     @staticmethod
     def get_schema_from_db(
@@ -362,7 +1121,10 @@ INSTALL QUERY *
         # Retrieve the schema from TigerGraph DB
         raw_schema = context.tigergraph_api.get_schema(graph_name)
         logger.debug(f"The raw schema: {raw_schema}")
+        return SchemaManager._parse_raw_schema(graph_name, raw_schema)
 
+    @staticmethod
+    def _parse_raw_schema(graph_name: str, raw_schema: Dict) -> Dict:
         # Construct nodes dictionary
         nodes = {}
         for vertex in raw_schema.get("VertexTypes", []):
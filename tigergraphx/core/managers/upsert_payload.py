@@ -0,0 +1,300 @@
+# Copyright 2025 TigerGraph Inc.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file or https://www.apache.org/licenses/LICENSE-2.0
+#
+# Permission is granted to use, copy, modify, and distribute this software
+# under the License. The software is provided "AS IS", without warranty.
+
+"""
+Column-wise serialization of DataFrames into the RESTPP upsert wire format.
+
+Each column is validated once against the graph schema and encoded into JSON
+fragments as a whole; rows are only touched when the fragments are stitched
+together, so no per-row Python dictionaries are ever built.
+"""
+
+import json
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from tigergraphx.config import (
+    AttributeSchema,
+    DataType,
+    VectorAttributeSchema,
+)
+
+_INTEGER_KINDS = {"integer", "empty"}
+_NUMERIC_KINDS = {"integer", "floating", "mixed-integer-float", "decimal", "empty"}
+_DATETIME_KINDS = {"datetime64", "datetime", "date", "string", "empty"}
+
+
+def to_pandas_dataframe(data: Any) -> pd.DataFrame:
+    """
+    Convert a pandas DataFrame, Arrow table or Polars DataFrame into pandas.
+
+    Arrow and Polars are optional dependencies, so they are recognized through
+    their `to_pandas` method instead of being imported.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data
+    to_pandas = getattr(data, "to_pandas", None)
+    if callable(to_pandas):
+        result = to_pandas()
+        if isinstance(result, pd.DataFrame):
+            return result
+    raise TypeError(
+        "Expected a pandas DataFrame, a pyarrow Table or a polars DataFrame, "
+        f"but got {type(data).__name__}."
+    )
+
+
+def encode_attribute_column(
+    series: pd.Series, attribute_name: str, attribute_schema: AttributeSchema
+) -> pd.Series:
+    """
+    Validate a column against its attribute schema and encode it as JSON values.
+
+    Missing values are encoded as NaN so that they can be skipped when the
+    payload is assembled.
+    """
+    data_type = attribute_schema.data_type
+    mask = series.notna()
+    values = series[mask]
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+
+    if data_type in (DataType.INT, DataType.UINT):
+        if kind in _NUMERIC_KINDS - _INTEGER_KINDS:
+            numbers = pd.to_numeric(values)
+            if not np.all(np.mod(numbers, 1) == 0):
+                raise ValueError(
+                    f"Column for attribute '{attribute_name}' contains non-integer "
+                    f"values, but the attribute type is {data_type.value}."
+                )
+            values = numbers.astype("int64")
+        elif kind not in _INTEGER_KINDS:
+            raise ValueError(
+                f"Column for attribute '{attribute_name}' has inferred type '{kind}', "
+                f"which is incompatible with {data_type.value}."
+            )
+        if data_type == DataType.UINT and len(values) and values.min() < 0:
+            raise ValueError(
+                f"Column for attribute '{attribute_name}' contains negative values, "
+                "but the attribute type is UINT."
+            )
+        encoded = values.astype("int64").astype(str)
+    elif data_type in (DataType.FLOAT, DataType.DOUBLE):
+        if kind not in _NUMERIC_KINDS:
+            raise ValueError(
+                f"Column for attribute '{attribute_name}' has inferred type '{kind}', "
+                f"which is incompatible with {data_type.value}."
+            )
+        numbers = pd.to_numeric(values).astype("float64")
+        if not np.all(np.isfinite(numbers.to_numpy())):
+            raise ValueError(
+                f"Column for attribute '{attribute_name}' contains infinite values."
+            )
+        encoded = numbers.astype(str)
+    elif data_type == DataType.BOOL:
+        if kind not in ("boolean", "empty"):
+            raise ValueError(
+                f"Column for attribute '{attribute_name}' has inferred type '{kind}', "
+                "which is incompatible with BOOL."
+            )
+        encoded = values.astype(bool).map({True: "true", False: "false"})
+    elif data_type == DataType.DATETIME:
+        if kind not in _DATETIME_KINDS:
+            raise ValueError(
+                f"Column for attribute '{attribute_name}' has inferred type '{kind}', "
+                "which is incompatible with DATETIME."
+            )
+        if kind != "string":
+            values = pd.to_datetime(values).dt.strftime("%Y-%m-%d %H:%M:%S")
+        encoded = values.map(json.dumps)
+    else:
+        encoded = values.astype(str).map(json.dumps)
+
+    return encoded.reindex(series.index)
+
+
+def encode_vector_column(
+    series: pd.Series,
+    attribute_name: str,
+    vector_attribute_schema: VectorAttributeSchema,
+) -> pd.Series:
+    """
+    Validate a column of embeddings and encode every vector as a JSON list.
+    """
+    mask = series.map(lambda value: value is not None and not np.isscalar(value))
+    values = series[mask]
+    if len(values) == 0:
+        return pd.Series(np.nan, index=series.index, dtype=object)
+    try:
+        matrix = np.stack(values.to_numpy()).astype(np.float64, copy=False)
+    except ValueError as e:
+        raise ValueError(
+            f"Column for vector attribute '{attribute_name}' contains vectors of "
+            f"different lengths: {e}"
+        ) from e
+    dimension = vector_attribute_schema.dimension
+    if matrix.ndim != 2 or matrix.shape[1] != dimension:
+        raise ValueError(
+            f"Column for vector attribute '{attribute_name}' has shape "
+            f"{matrix.shape}, expected vectors of dimension {dimension}."
+        )
+    if not np.all(np.isfinite(matrix)):
+        raise ValueError(
+            f"Column for vector attribute '{attribute_name}' contains non-finite values."
+        )
+    encoded = pd.Series(
+        [json.dumps(row) for row in matrix.tolist()], index=values.index, dtype=object
+    )
+    return encoded.reindex(series.index)
+
+
+def encode_attributes(
+    data: pd.DataFrame,
+    attribute_column_mappings: Mapping[str, str],
+    attributes: Mapping[str, AttributeSchema],
+    vector_attributes: Optional[Mapping[str, VectorAttributeSchema]] = None,
+) -> pd.Series:
+    """
+    Encode the mapped columns into the body of an attribute JSON object per row,
+    e.g. `"name":{"value":"Alice"},"age":{"value":30}`.
+    """
+    vector_attributes = vector_attributes or {}
+    body = pd.Series("", index=data.index, dtype=object)
+    for attribute_name, column_name in attribute_column_mappings.items():
+        if attribute_name in vector_attributes:
+            encoded = encode_vector_column(
+                data[column_name], attribute_name, vector_attributes[attribute_name]
+            )
+        else:
+            encoded = encode_attribute_column(
+                data[column_name], attribute_name, attributes[attribute_name]
+            )
+        prefix = "," + json.dumps(attribute_name) + ':{"value":'
+        fragment = (prefix + encoded + "}").fillna("")
+        body = body + fragment
+    # Every non-empty fragment starts with a comma; drop the leading one.
+    return body.str[1:]
+
+
+def encode_ids(series: pd.Series) -> pd.Series:
+    """
+    Encode a column of node IDs as JSON object keys.
+
+    Float columns are accepted only if every ID is integral, and are encoded
+    as integers; pandas stores integer IDs as floats once the column has held
+    a missing value, and `"1.0"` would not match the vertex `"1"`.
+    """
+    if series.isna().any():
+        raise ValueError("Node ID columns must not contain missing values.")
+    if pd.api.types.is_float_dtype(series.dtype):
+        if not np.isfinite(series).all() or not (series % 1 == 0).all():
+            raise ValueError(
+                f"Node ID column '{series.name}' contains non-integral floats."
+            )
+        series = series.astype("Int64")
+    return series.astype(str).map(json.dumps)
+
+
+def build_vertices_payload(
+    node_type: str, ids: pd.Series, attribute_bodies: pd.Series
+) -> str:
+    """
+    Build a `{"vertices": {...}}` upsert payload from encoded IDs and attributes.
+    """
+    entries = ids + ":{" + attribute_bodies + "}"
+    return (
+        '{"vertices":{'
+        + json.dumps(node_type)
+        + ":{"
+        + ",".join(entries.tolist())
+        + "}}}"
+    )
+
+
+def build_edges_payload(
+    src_node_type: str,
+    edge_type: str,
+    tgt_node_type: str,
+    src_ids: pd.Series,
+    tgt_ids: pd.Series,
+    attribute_bodies: pd.Series,
+    is_multi_edge: bool = False,
+) -> str:
+    """
+    Build an `{"edges": {...}}` upsert payload from encoded IDs and attributes.
+
+    Edges are grouped by source node, and for multi-edge types also by target
+    node, so that the JSON object never contains duplicate keys.
+    """
+    frame = pd.DataFrame(
+        {"src": src_ids, "tgt": tgt_ids, "attributes": "{" + attribute_bodies + "}"}
+    )
+    if is_multi_edge:
+        grouped = frame.groupby(["src", "tgt"], sort=False)["attributes"].agg(
+            ",".join
+        )
+        frame = grouped.reset_index()
+        targets = frame["tgt"] + ":[" + frame["attributes"] + "]"
+    else:
+        frame = frame.drop_duplicates(subset=["src", "tgt"], keep="last")
+        targets = frame["tgt"] + ":" + frame["attributes"]
+    targets_by_source = targets.groupby(frame["src"].to_numpy(), sort=False).agg(
+        ",".join
+    )
+    inner_prefix = (
+        ":{" + json.dumps(edge_type) + ":{" + json.dumps(tgt_node_type) + ":{"
+    )
+    sources: List[str] = [
+        src + inner_prefix + body + "}}}"
+        for src, body in zip(
+            targets_by_source.index.tolist(), targets_by_source.tolist()
+        )
+    ]
+    return (
+        '{"edges":{' + json.dumps(src_node_type) + ":{" + ",".join(sources) + "}}}"
+    )
+
+
+def resolve_attribute_column_mappings(
+    data: pd.DataFrame,
+    attribute_column_mappings: Optional[Dict[str, str]],
+    attributes: Mapping[str, AttributeSchema],
+    vector_attributes: Optional[Mapping[str, VectorAttributeSchema]] = None,
+    excluded_columns: Optional[List[str]] = None,
+    excluded_attributes: Optional[List[str]] = None,
+) -> Dict[str, str]:
+    """
+    Validate an explicit attribute-to-column mapping, or derive one from the
+    columns whose names match schema attributes.
+    """
+    vector_attributes = vector_attributes or {}
+    excluded_columns = excluded_columns or []
+    excluded_attributes = excluded_attributes or []
+    known_attributes = set(attributes) | set(vector_attributes)
+
+    if attribute_column_mappings is None:
+        return {
+            column: column
+            for column in data.columns
+            if column in known_attributes
+            and column not in excluded_columns
+            and column not in excluded_attributes
+        }
+
+    for attribute_name, column_name in attribute_column_mappings.items():
+        if attribute_name not in known_attributes:
+            raise ValueError(
+                f"Attribute '{attribute_name}' is not defined in the graph schema."
+            )
+        if column_name not in data.columns:
+            raise ValueError(f"Column '{column_name}' does not exist in the data.")
+    return {
+        attribute_name: column_name
+        for attribute_name, column_name in attribute_column_mappings.items()
+        if attribute_name not in excluded_attributes
+    }
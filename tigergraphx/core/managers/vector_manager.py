@@ -5,20 +5,57 @@
 # Permission is granted to use, copy, modify, and distribute this software
 # under the License. The software is provided "AS IS", without warranty.
 
+import hashlib
+import json
 import logging
-from typing import Dict, List, Optional, Set
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Literal, Optional, Sequence, Set, Tuple
+import numpy as np
+import pandas as pd
 
 from .base_manager import BaseManager
+from .schema_manager import SchemaManager
+from .upsert_payload import build_vertices_payload, encode_ids
+
+from tigergraphx.config import DataType, ExpansionSpec
 
 from tigergraphx.core.graph_context import GraphContext
 
 
 logger = logging.getLogger(__name__)
 
+# Rank offset of reciprocal rank fusion, as proposed by Cormack et al. (2009)
+_RRF_K = 60
+
+# Tokens of filter expressions. Attributes are referenced through the alias `s`,
+# and literals are turned into query parameters so that filters of the same
+# shape share one installed query
+_FILTER_TOKEN_PATTERN = re.compile(
+    r'\s*(?:(?P<string>"(?:[^"\\]|\\.)*")'
+    r"|(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)(?![\w.])"
+    r"|s\.(?P<attribute>[A-Za-z_]\w*)(?![\w.])"
+    r"|(?P<operator>==|!=|<>|<=|>=|<|>)"
+    r"|(?P<paren>[()])"
+    r"|(?P<word>[A-Za-z_]\w*)(?![\w.]))"
+)
+_FILTER_KEYWORDS = {"AND", "OR", "NOT"}
+_FILTER_BOOLEANS = {"TRUE", "FALSE"}
+
 
 class VectorManager(BaseManager):
     def __init__(self, context: GraphContext):
         super().__init__(context)
+        self._schema_manager = SchemaManager(context)
+        # Names of the search queries generated on demand and known to be installed
+        self._installed_query_names: Set[str] = set()
+
+    def reset_installed_queries(self) -> None:
+        """
+        Forget the search queries installed on demand, e.g. after a schema change
+        dropped them, so that they are installed again on their next use.
+        """
+        self._installed_query_names.clear()
 
     def upsert(
         self,
@@ -68,6 +105,135 @@ class VectorManager(BaseManager):
             logger.error(f"Error adding nodes: {e}")
             return None
 
+    def upsert_vectors(
+        self,
+        node_ids: Sequence[str],
+        vectors: np.ndarray,
+        vector_attribute_name: str,
+        node_type: str,
+        batch_size: int = 10000,
+        max_workers: int = 4,
+    ) -> Optional[int]:
+        """
+        Upsert the rows of an embedding matrix as the vectors of the given nodes.
+        """
+        self._ensure_minimum_version("4.2.0")
+        vector_attr = self._graph_schema.nodes[node_type].vector_attributes.get(
+            vector_attribute_name
+        )
+        if vector_attr is None:
+            raise ValueError(
+                f"Vector attribute '{vector_attribute_name}' is not defined for "
+                f"node type '{node_type}'."
+            )
+
+        # Validate the whole matrix at once, before anything is sent
+        matrix = np.asarray(vectors, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != vector_attr.dimension:
+            raise ValueError(
+                f"Expected a matrix with {vector_attr.dimension} columns, "
+                f"but got an array of shape {matrix.shape}."
+            )
+        if len(node_ids) != len(matrix):
+            raise ValueError(
+                f"Got {len(node_ids)} node IDs for {len(matrix)} vectors."
+            )
+        if not np.all(np.isfinite(matrix)):
+            raise ValueError("The vectors contain non-finite values.")
+        ids = encode_ids(pd.Series(list(node_ids), dtype=object))
+        prefix = json.dumps(vector_attribute_name) + ':{"value":'
+
+        def upsert_chunk(start: int) -> int:
+            rows = matrix[start : start + batch_size].tolist()
+            bodies = pd.Series(
+                [prefix + json.dumps(row) + "}" for row in rows],
+                index=ids.index[start : start + batch_size],
+            )
+            payload = build_vertices_payload(
+                node_type, ids.iloc[start : start + batch_size], bodies
+            )
+            result = self._tigergraph_api.upsert_graph_data(self._graph_name, payload)
+            return result[0].get("accepted_vertices", 0)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return sum(
+                    executor.map(upsert_chunk, range(0, len(matrix), batch_size))
+                )
+        except Exception as e:
+            logger.error(f"Error upserting vectors: {e}")
+            return None
+
+    def fetch_vectors(
+        self,
+        node_ids: Sequence[str],
+        vector_attribute_name: str,
+        node_type: str,
+        batch_size: int = 10000,
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Retrieve the vectors of the given nodes as a float32 matrix, together with
+        the IDs of the nodes found, in the order of the rows.
+        """
+        self._ensure_minimum_version("4.2.0")
+        node_ids = list(node_ids)
+        node_schema = self._graph_schema.nodes.get(node_type)
+        vector_attr = (
+            node_schema.vector_attributes.get(vector_attribute_name)
+            if node_schema
+            else None
+        )
+        empty_matrix = np.empty(
+            (0, vector_attr.dimension if vector_attr else 0), dtype=np.float32
+        )
+        query_name = f"api_fetch_{node_type}_{vector_attribute_name}"
+        embeddings: Dict[str, List[float]] = {}
+        try:
+            for start in range(0, len(node_ids), batch_size):
+                # The IDs are sent in the request body, as a GET request with
+                # thousands of IDs exceeds the maximum URL length
+                params = {
+                    "input": [
+                        {"id": node_id, "type": node_type}
+                        for node_id in node_ids[start : start + batch_size]
+                    ]
+                }
+                result = self._tigergraph_api.run_installed_query_post(
+                    self._graph_name, query_name, params
+                )
+                for node in result[0].get("Nodes", []) if result else []:
+                    node_embeddings = node.get("Embeddings") or node.get(
+                        "attributes", {}
+                    )
+                    if vector_attribute_name in node_embeddings:
+                        embeddings[node["v_id"]] = node_embeddings[
+                            vector_attribute_name
+                        ]
+        except Exception as e:
+            logger.error(
+                f"Error fetching vectors of vector attribute {vector_attribute_name} "
+                f"of node type {node_type}: {e}"
+            )
+            return [], empty_matrix
+
+        # Keep the requested order, then decode and validate all vectors at once
+        found_ids = [node_id for node_id in node_ids if node_id in embeddings]
+        if not found_ids:
+            return [], empty_matrix
+        try:
+            matrix = np.array(
+                [embeddings[node_id] for node_id in found_ids], dtype=np.float32
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid embedding format: {e}") from e
+        if matrix.ndim != 2:
+            raise ValueError(
+                f"Expected vectors of the same dimension, but got shape {matrix.shape}."
+            )
+        if not np.all(np.isfinite(matrix)):
+            raise ValueError("The fetched vectors contain non-finite values.")
+        return found_ids, matrix
+
     def fetch_node(
         self, node_id: str, vector_attribute_name: str, node_type: str
     ) -> Optional[List[float]]:
@@ -88,7 +254,9 @@ class VectorManager(BaseManager):
         try:
             params = {"input": [(node_id, node_type) for node_id in node_ids]}
             result = self._tigergraph_api.run_installed_query_get(
-                self._graph_name, "api_fetch", params
+                self._graph_name,
+                f"api_fetch_{node_type}_{vector_attribute_name}",
+                params,
             )
 
             if not result or not isinstance(result, list):
@@ -104,7 +272,7 @@ class VectorManager(BaseManager):
             embeddings = {}
             for node in nodes:
                 node_id = node.get("v_id")
-                node_embeddings = node.get("Embeddings", {})
+                node_embeddings = node.get("Embeddings") or node.get("attributes", {})
                 if vector_attribute_name not in node_embeddings:
                     logger.warning(
                         f"'{vector_attribute_name}' not found for node_id: '{node_id}'."
@@ -135,10 +303,18 @@ class VectorManager(BaseManager):
         limit: int = 10,
         return_attributes: Optional[str | List[str]] = None,
         candidate_ids: Optional[Set[str]] = None,
+        filter_expression: Optional[str] = None,
     ) -> List[Dict]:
         self._ensure_minimum_version("4.2.0")
+        query_name = f"api_search_{node_type}_{vector_attribute_name}"
+        filter_params: Dict[str, Any] = {}
+        if filter_expression:
+            # Invalid filters and failed installations are raised, so that they
+            # are not mistaken for a search without results
+            query_name, filter_params = self._ensure_filter_query(
+                node_type, vector_attribute_name, filter_expression
+            )
         try:
-            query_name = f"api_search_{node_type}_{vector_attribute_name}"
             set_candidate = []
             if candidate_ids:
                 set_candidate = [
@@ -146,12 +322,16 @@ class VectorManager(BaseManager):
                     for candidate_id in candidate_ids
                 ]
             params = {"k": limit, "query_vector": data, "set_candidate": set_candidate}
+            params.update(filter_params)
+            self._add_projection_params(params, return_attributes)
 
             result = self._execute_search_query(query_name, params)
             if result is None:
                 return []
 
-            combined_result = self._process_search_results(result, return_attributes)
+            combined_result = self._process_search_results(
+                result, return_attributes, node_type
+            )
             return combined_result
         except Exception as e:
             logger.error(
@@ -160,6 +340,76 @@ class VectorManager(BaseManager):
             )
             return []
 
+    def search_batch(
+        self,
+        data: List[List[float]] | np.ndarray,
+        vector_attribute_name: str,
+        node_type: str,
+        limit: int = 10,
+        return_attributes: Optional[str | List[str]] = None,
+        candidate_ids: Optional[Set[str]] = None,
+    ) -> List[List[Dict]]:
+        self._ensure_minimum_version("4.2.0")
+        query_vectors = np.asarray(data, dtype=np.float64)
+        if query_vectors.size == 0:
+            return []
+        if query_vectors.ndim != 2:
+            raise ValueError(
+                "Expected a list of query vectors of the same dimension, "
+                f"but got an array of shape {query_vectors.shape}."
+            )
+        num_queries, dimension = query_vectors.shape
+        try:
+            query_name = f"api_search_batch_{node_type}_{vector_attribute_name}"
+            set_candidate = []
+            if candidate_ids:
+                set_candidate = [
+                    {"id": candidate_id, "type": node_type}
+                    for candidate_id in candidate_ids
+                ]
+            params = {
+                "k": limit,
+                "dimension": dimension,
+                "query_vectors": query_vectors.ravel().tolist(),
+                "set_candidate": set_candidate,
+            }
+            self._add_projection_params(params, return_attributes)
+            result = self._tigergraph_api.run_installed_query_post(
+                self._graph_name, query_name, params
+            )
+            if (
+                not result
+                or "map_query_node_distance" not in result[0]
+                or "Nodes" not in result[1]
+            ):
+                logger.error(f"Invalid result of query {query_name}: {result}")
+                return [[] for _ in range(num_queries)]
+
+            # Split the shared node list into one search result per query vector
+            query_node_distances = result[0]["map_query_node_distance"]
+            nodes = {node.get("v_id"): node for node in result[1]["Nodes"]}
+            batch_results = []
+            for i in range(num_queries):
+                node_distances = query_node_distances.get(
+                    str(i), query_node_distances.get(i, {})
+                )
+                query_result = [
+                    {"map_node_distance": node_distances},
+                    {"Nodes": [nodes[v_id] for v_id in node_distances if v_id in nodes]},
+                ]
+                combined_result = self._process_search_results(
+                    query_result, return_attributes, node_type
+                )
+                combined_result.sort(key=lambda x: x["distance"])
+                batch_results.append(combined_result)
+            return batch_results
+        except Exception as e:
+            logger.error(
+                f"Error performing batch vector search for vector attribute "
+                f"{vector_attribute_name} of node type {node_type}: {e}"
+            )
+            return [[] for _ in range(num_queries)]
+
     def search_multi_vector_attributes(
         self,
         data: List[float],
@@ -167,6 +417,7 @@ class VectorManager(BaseManager):
         node_types: List[str],
         limit: int = 10,
         return_attributes_list: Optional[List[List[str]]] = None,
+        fusion: Literal["min_distance", "rrf"] = "min_distance",
     ) -> List[Dict]:
         self._ensure_minimum_version("4.2.0")
         if len(vector_attribute_names) != len(node_types):
@@ -185,23 +436,43 @@ class VectorManager(BaseManager):
             )
             return []
 
-        for idx, (vector_attribute_name, node_type) in enumerate(
-            zip(vector_attribute_names, node_types)
-        ):
-            return_attributes = (
-                return_attributes_list[idx] if return_attributes_list else None
-            )
-            result = self.search(
+        if not vector_attribute_names:
+            return []
+
+        # Search all vector attributes concurrently
+        def search_one(idx: int) -> List[Dict]:
+            return self.search(
                 data=data,
-                vector_attribute_name=vector_attribute_name,
-                node_type=node_type,
+                vector_attribute_name=vector_attribute_names[idx],
+                node_type=node_types[idx],
                 limit=limit,
-                return_attributes=return_attributes,
+                return_attributes=(
+                    return_attributes_list[idx] if return_attributes_list else None
+                ),
             )
-            combined_results.extend(result)
 
-        # Sort by distance
-        combined_results.sort(key=lambda x: x["distance"])
+        with ThreadPoolExecutor(max_workers=len(vector_attribute_names)) as executor:
+            results = list(executor.map(search_one, range(len(vector_attribute_names))))
+
+        if fusion == "rrf":
+            # Score every node by the sum of its reciprocal ranks across the searches
+            scores: Dict[str, float] = {}
+            for result in results:
+                ranked_result = sorted(result, key=lambda x: x["distance"])
+                for rank, item in enumerate(ranked_result, start=1):
+                    node_id = item.get("id")
+                    scores[node_id] = scores.get(node_id, 0.0) + 1.0 / (_RRF_K + rank)
+            for result in results:
+                combined_results.extend(
+                    {**item, "score": scores[item.get("id")]} for item in result
+                )
+            # Sort by score, then by distance for the nodes seen in several searches
+            combined_results.sort(key=lambda x: (-x["score"], x["distance"]))
+        else:
+            for result in results:
+                combined_results.extend(result)
+            # Sort by distance
+            combined_results.sort(key=lambda x: x["distance"])
 
         # Keep only the first occurrence of each unique node_id
         unique_results = []
@@ -229,24 +500,144 @@ class VectorManager(BaseManager):
         Retrieve the top-k similar nodes based on a source node's specified embedding.
         """
         self._ensure_minimum_version("4.2.0")
-        query_vector = self.fetch_node(node_id, vector_attribute_name, node_type)
-        if not query_vector:
+        try:
+            query_name = f"api_similar_{node_type}_{vector_attribute_name}"
+            params = {"source": {"id": node_id, "type": node_type}, "k": limit}
+            self._add_projection_params(params, return_attributes)
+            result = self._execute_search_query(query_name, params)
+            if result is None:
+                return []
+
+            results = self._process_search_results(
+                result, return_attributes, node_type
+            )
+            filtered_results = [item for item in results if item.get("id") != node_id]
+            filtered_results.sort(key=lambda x: x["distance"])
+            return filtered_results[:limit]
+        except Exception as e:
             logger.error(
-                f"Embedding '{vector_attribute_name}' not found for node_id: '{node_id}', "
-                f"node_type: '{node_type}'."
+                f"Error searching for nodes similar to '{node_id}' by vector attribute "
+                f"{vector_attribute_name} of node type {node_type}: {e}"
             )
             return []
 
-        results = self.search(
-            data=query_vector,
-            vector_attribute_name=vector_attribute_name,
-            node_type=node_type,
-            limit=limit + 1,
-            return_attributes=return_attributes,
-        )
+    def search_top_k_similar_nodes_batch(
+        self,
+        node_ids: List[str],
+        vector_attribute_name: str,
+        node_type: str = "",
+        limit: int = 5,
+        return_attributes: Optional[List[str]] = None,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Retrieve the top-k similar nodes of many source nodes in one request.
+        """
+        self._ensure_minimum_version("4.2.0")
+        if not node_ids:
+            return {}
+        try:
+            query_name = f"api_similar_batch_{node_type}_{vector_attribute_name}"
+            params = {
+                "sources": [{"id": node_id, "type": node_type} for node_id in node_ids],
+                "k": limit,
+            }
+            self._add_projection_params(params, return_attributes)
+            result = self._tigergraph_api.run_installed_query_post(
+                self._graph_name, query_name, params
+            )
+            if (
+                not result
+                or "map_source_node_distance" not in result[0]
+                or "Nodes" not in result[1]
+            ):
+                logger.error(f"Invalid result of query {query_name}: {result}")
+                return {node_id: [] for node_id in node_ids}
+
+            # Split the shared node list into one search result per source node
+            source_node_distances = result[0]["map_source_node_distance"]
+            nodes = {node.get("v_id"): node for node in result[1]["Nodes"]}
+            batch_results = {}
+            for node_id in node_ids:
+                node_distances = {
+                    v_id: distance
+                    for v_id, distance in source_node_distances.get(node_id, {}).items()
+                    if v_id != node_id
+                }
+                query_result = [
+                    {"map_node_distance": node_distances},
+                    {"Nodes": [nodes[v_id] for v_id in node_distances if v_id in nodes]},
+                ]
+                combined_result = self._process_search_results(
+                    query_result, return_attributes, node_type
+                )
+                combined_result.sort(key=lambda x: x["distance"])
+                batch_results[node_id] = combined_result[:limit]
+            return batch_results
+        except Exception as e:
+            logger.error(
+                f"Error searching for nodes similar to {len(node_ids)} nodes by vector "
+                f"attribute {vector_attribute_name} of node type {node_type}: {e}"
+            )
+            return {node_id: [] for node_id in node_ids}
+
+    def search_and_expand(
+        self,
+        data: List[float],
+        vector_attribute_name: str,
+        node_type: str,
+        expansions: List[ExpansionSpec],
+        limit: int = 10,
+        return_attributes: Optional[str | List[str]] = None,
+        candidate_ids: Optional[Set[str]] = None,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Perform a vector search and expand the neighborhood of the results in a
+        single query.
+        """
+        self._ensure_minimum_version("4.2.0")
+        empty_result: Dict[str, List[Dict]] = {"seeds": []}
+        empty_result.update({spec.name: [] for spec in expansions})
+        try:
+            query_name = self._ensure_search_expand_query(
+                node_type, vector_attribute_name, expansions
+            )
+            params: Dict[str, Any] = {
+                "k": limit,
+                "query_vector": data,
+                "set_candidate": [
+                    {"id": candidate_id, "type": node_type}
+                    for candidate_id in candidate_ids or []
+                ],
+            }
+            self._add_projection_params(params, return_attributes)
+            result = self._execute_search_query(query_name, params)
+            if result is None:
+                return empty_result
 
-        filtered_results = [result for result in results if result.get("id") != node_id]
-        return filtered_results[:limit]
+            seeds = self._process_search_results(
+                result[:2], return_attributes, node_type
+            )
+            seeds.sort(key=lambda x: x["distance"])
+            expanded_result: Dict[str, List[Dict]] = {"seeds": seeds}
+            for i, spec in enumerate(expansions):
+                nodes = next(
+                    (
+                        item[f"Expansion_{i}"]
+                        for item in result[2:]
+                        if f"Expansion_{i}" in item
+                    ),
+                    [],
+                )
+                expanded_result[spec.name] = self._process_expansion_results(
+                    nodes, spec.return_attributes, spec.order_by
+                )
+            return expanded_result
+        except Exception as e:
+            logger.error(
+                f"Error performing graph-expanded vector search for vector attribute "
+                f"{vector_attribute_name} of node type {node_type}: {e}"
+            )
+            return empty_result
 
     def _execute_search_query(
         self,
@@ -280,10 +671,514 @@ class VectorManager(BaseManager):
 
         return result
 
+    def _ensure_filter_query(
+        self, node_type: str, vector_attribute_name: str, filter_expression: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Return the name of the installed search query for the shape of the filter
+        expression, installing it on first use, and the values of its parameters.
+        """
+        node_schema = self._graph_schema.nodes.get(node_type)
+        if node_schema is None:
+            raise ValueError(
+                f"Node type '{node_type}' does not exist in the graph schema."
+            )
+        filter_shape, parameter_types, filter_params = (
+            self._parameterize_filter_expression(
+                filter_expression, set(node_schema.attributes)
+            )
+        )
+        shape_hash = hashlib.sha256(
+            f"{filter_shape}|{','.join(parameter_types)}".encode("utf-8")
+        ).hexdigest()[:12]
+        query_name = f"api_search_filter_{node_type}_{vector_attribute_name}_{shape_hash}"
+        if query_name not in self._installed_query_names:
+            gsql_query = self._create_gsql_filtered_search_query(
+                query_name,
+                node_type,
+                vector_attribute_name,
+                filter_shape,
+                parameter_types,
+            )
+            self._schema_manager.install_changed_queries({query_name: gsql_query})
+            self._installed_query_names.add(query_name)
+        return query_name, filter_params
+
+    def _ensure_search_expand_query(
+        self,
+        node_type: str,
+        vector_attribute_name: str,
+        expansions: List[ExpansionSpec],
+    ) -> str:
+        """
+        Return the name of the installed query for the shape of the expansions,
+        installing it on first use.
+        """
+        expansion_shapes = [
+            spec.model_dump_json(exclude={"name"}) for spec in expansions
+        ]
+        shape_hash = hashlib.sha256(
+            "|".join(expansion_shapes).encode("utf-8")
+        ).hexdigest()[:12]
+        query_name = f"api_search_expand_{node_type}_{vector_attribute_name}_{shape_hash}"
+        if query_name not in self._installed_query_names:
+            gsql_query = self._create_gsql_search_expand_query(
+                query_name, node_type, vector_attribute_name, expansions
+            )
+            self._schema_manager.install_changed_queries({query_name: gsql_query})
+            self._installed_query_names.add(query_name)
+        return query_name
+
+    @staticmethod
+    def _parameterize_filter_expression(
+        filter_expression: str, attribute_names: Set[str] | Sequence[str]
+    ) -> Tuple[str, List[str], Dict[str, Any]]:
+        """
+        Validate a filter expression and replace its string and number literals
+        with query parameters.
+
+        The expression becomes part of an installed query, so it may only consist
+        of comparisons between the given attributes and literals, combined with
+        AND, OR, NOT and parentheses. A boolean attribute may stand on its own.
+
+        Returns:
+            The filter expression with parameter names in place of the literals, the
+            GSQL types of the parameters, and the parameter values by name.
+
+        Raises:
+            ValueError: If the expression contains anything else or is malformed.
+        """
+        tokens: List[Tuple[str, str]] = []
+        position = 0
+        expression = filter_expression.rstrip()
+        while position < len(expression):
+            match = _FILTER_TOKEN_PATTERN.match(expression, position)
+            if match is None:
+                raise ValueError(
+                    f"Unsupported filter expression at position {position}: "
+                    f"{filter_expression!r}"
+                )
+            kind = match.lastgroup
+            assert kind is not None
+            text = match.group(kind)
+            if kind == "attribute" and text not in attribute_names:
+                raise ValueError(f"Unknown attribute in filter expression: {text}")
+            if kind == "word":
+                if text.upper() in _FILTER_KEYWORDS:
+                    kind, text = "keyword", text.upper()
+                elif text.upper() in _FILTER_BOOLEANS:
+                    kind, text = "boolean", text.lower()
+                else:
+                    raise ValueError(f"Unsupported word in filter expression: {text}")
+            tokens.append((kind, text))
+            position = match.end()
+
+        shape: List[str] = []
+        parameter_types: List[str] = []
+        filter_params: Dict[str, Any] = {}
+        index = 0
+
+        def peek() -> Tuple[str, str]:
+            return tokens[index] if index < len(tokens) else ("end", "")
+
+        def fail() -> ValueError:
+            kind, text = peek()
+            found = "end of expression" if kind == "end" else repr(text)
+            return ValueError(
+                f"Malformed filter expression, unexpected {found}: "
+                f"{filter_expression!r}"
+            )
+
+        def parse_operand() -> str:
+            nonlocal index
+            kind, text = peek()
+            if kind in ("attribute", "boolean"):
+                shape.append(f"s.{text}" if kind == "attribute" else text)
+            elif kind in ("string", "number"):
+                parameter_name = f"filter_param_{len(parameter_types)}"
+                if kind == "string":
+                    try:
+                        value = json.loads(text)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(
+                            f"Invalid string literal in filter expression: {text}"
+                        ) from e
+                    parameter_types.append("STRING")
+                elif re.fullmatch(r"-?\d+", text):
+                    value = int(text)
+                    parameter_types.append("INT")
+                else:
+                    value = float(text)
+                    parameter_types.append("DOUBLE")
+                filter_params[parameter_name] = value
+                shape.append(parameter_name)
+            else:
+                raise fail()
+            index += 1
+            return kind
+
+        def parse_primary() -> None:
+            nonlocal index
+            if peek() == ("paren", "("):
+                index += 1
+                shape.append("(")
+                parse_or()
+                if peek() != ("paren", ")"):
+                    raise fail()
+                index += 1
+                shape.append(")")
+                return
+            kind = parse_operand()
+            if peek()[0] == "operator":
+                shape.append(peek()[1])
+                index += 1
+                if "attribute" not in (kind, parse_operand()):
+                    raise ValueError(
+                        "Comparisons in filter expressions must involve an "
+                        f"attribute: {filter_expression!r}"
+                    )
+            elif kind != "attribute":
+                raise fail()
+
+        def parse_not() -> None:
+            nonlocal index
+            while peek() == ("keyword", "NOT"):
+                index += 1
+                shape.append("NOT")
+            parse_primary()
+
+        def parse_and() -> None:
+            nonlocal index
+            parse_not()
+            while peek() == ("keyword", "AND"):
+                index += 1
+                shape.append("AND")
+                parse_not()
+
+        def parse_or() -> None:
+            nonlocal index
+            parse_and()
+            while peek() == ("keyword", "OR"):
+                index += 1
+                shape.append("OR")
+                parse_and()
+
+        parse_or()
+        if index != len(tokens):
+            raise fail()
+        filter_shape = " ".join(shape).replace("( ", "(").replace(" )", ")")
+        return filter_shape, parameter_types, filter_params
+
+    def _create_gsql_filtered_search_query(
+        self,
+        query_name: str,
+        node_type: str,
+        vector_attribute_name: str,
+        filter_shape: str,
+        parameter_types: List[str],
+    ) -> str:
+        filter_parameters_str = "".join(
+            f"\n  {parameter_type} filter_param_{i},"
+            for i, parameter_type in enumerate(parameter_types)
+        )
+        projection = SchemaManager._create_gsql_attribute_projection(
+            self._graph_schema.nodes[node_type]
+        )
+        return f"""
+CREATE OR REPLACE QUERY {query_name} (
+  UINT k=10,
+  LIST<float> query_vector,
+  SET<VERTEX> set_candidate,{filter_parameters_str}
+  SET<STRING> return_attributes,
+  BOOL project_attributes=FALSE
+) SYNTAX v3 {{
+  MapAccum<Vertex, Float> @@map_node_distance;
+  MapAccum<STRING, STRING> @map_attribute;
+  MapAccum<STRING, DOUBLE> @map_double_attribute;
+
+  IF set_candidate.size() > 0 THEN
+    Candidates = {{set_candidate}};
+  ELSE
+    Candidates = {{{node_type}.*}};
+  END;
+  Candidates = SELECT s FROM Candidates:s WHERE {filter_shape};
+
+  Nodes ({node_type}) = {{}};
+  IF Candidates.size() > 0 THEN
+    Nodes = vectorSearch(
+      {{{node_type}.{vector_attribute_name}}},
+      query_vector,
+      k,
+      {{ distance_map: @@map_node_distance, candidate_set: Candidates}}
+    );
+  END;
+
+  PRINT @@map_node_distance AS map_node_distance;
+{projection}
+}}
+""".strip()
+
+    def _create_gsql_search_expand_query(
+        self,
+        query_name: str,
+        node_type: str,
+        vector_attribute_name: str,
+        expansions: List[ExpansionSpec],
+    ) -> str:
+        projection = SchemaManager._create_gsql_attribute_projection(
+            self._graph_schema.nodes[node_type]
+        )
+        typedefs = "".join(
+            f"\n  TYPEDEF TUPLE<VERTEX v, DOUBLE score, INT tokens> Ranked_{i};"
+            for i, spec in enumerate(expansions)
+            if spec.is_ranked
+        )
+        accumulators = "".join(
+            f"\n  OrAccum @visited_{i};" for i in range(len(expansions))
+        )
+        for i, spec in enumerate(expansions):
+            if spec.is_ranked:
+                accumulators += (
+                    f"\n  HeapAccum<Ranked_{i}>({spec.limit or 1}, score DESC) "
+                    f"@@ranked_{i};"
+                    f"\n  SetAccum<VERTEX> @@selected_{i};"
+                )
+                if spec.max_tokens is not None:
+                    accumulators += f"\n  SumAccum<INT> @@used_tokens_{i};"
+        expansion_statements = "\n".join(
+            self._create_gsql_expansion(i, spec) for i, spec in enumerate(expansions)
+        )
+        return f"""
+CREATE OR REPLACE QUERY {query_name} (
+  UINT k=10,
+  LIST<float> query_vector,
+  SET<VERTEX> set_candidate,
+  SET<STRING> return_attributes,
+  BOOL project_attributes=FALSE
+) SYNTAX v3 {{{typedefs}
+  MapAccum<Vertex, Float> @@map_node_distance;
+  MapAccum<STRING, STRING> @map_attribute;
+  MapAccum<STRING, DOUBLE> @map_double_attribute;{accumulators}
+
+  IF set_candidate.size() > 0 THEN
+    Candidates = {{set_candidate}};
+    Nodes = vectorSearch(
+      {{{node_type}.{vector_attribute_name}}},
+      query_vector,
+      k,
+      {{ distance_map: @@map_node_distance, candidate_set: Candidates}}
+    );
+  ELSE
+    Nodes = vectorSearch(
+      {{{node_type}.{vector_attribute_name}}},
+      query_vector,
+      k,
+      {{ distance_map: @@map_node_distance}}
+    );
+  END;
+
+  PRINT @@map_node_distance AS map_node_distance;
+{projection}
+{expansion_statements}
+}}
+""".strip()
+
+    @staticmethod
+    def _create_gsql_expansion(index: int, spec: ExpansionSpec) -> str:
+        """
+        Generate the statements that collect the nodes within `max_hops` hops of
+        the search results and print them.
+
+        Ranked expansions push the reached nodes into a heap ordered by
+        `order_by`, and select them in that order until the token budget is
+        used up.
+        """
+        edge_types = sorted(spec.edge_type_set or [])
+        if len(edge_types) > 1:
+            edge_pattern = f"({'|'.join(edge_types)}):e"
+        else:
+            edge_pattern = f"{''.join(edge_types)}:e"
+        target_types = sorted(spec.target_node_type_set or [])
+        if len(target_types) > 1:
+            target_pattern = f"({'|'.join(target_types)}):t"
+        elif target_types:
+            target_pattern = f"{target_types[0]}:t"
+        else:
+            target_pattern = ":t"
+
+        frontier = f"Frontier_{index}"
+        reached = f"Reached_{index}"
+        visited = f"@visited_{index}"
+        statements = [
+            f"  {frontier} = SELECT s FROM Nodes:s POST-ACCUM s.{visited} = TRUE;",
+            f"  {reached} (ANY) = {{}};",
+        ]
+        for hop in range(1, spec.max_hops + 1):
+            # Intermediate hops may pass through any node type, but nodes reached
+            # by the last hop are only useful if they are returned
+            pattern = target_pattern if hop == spec.max_hops else ":t"
+            statements += [
+                f"  {frontier} =",
+                "    SELECT t",
+                f"    FROM {frontier}:s -({edge_pattern})- {pattern}",
+                f"    WHERE t.{visited} == FALSE",
+                f"    POST-ACCUM t.{visited} = TRUE;",
+                f"  {reached} = {reached} UNION {frontier};",
+            ]
+
+        expansion = f"Expansion_{index}"
+        where_clause = ""
+        if target_types and spec.max_hops > 1:
+            target_types_str = ", ".join(f'"{t}"' for t in target_types)
+            where_clause = f" WHERE t.type IN ({target_types_str})"
+        if spec.is_ranked:
+            statements += VectorManager._create_gsql_ranking(
+                index, spec, reached, where_clause
+            )
+        else:
+            limit_clause = f" LIMIT {spec.limit}" if spec.limit else ""
+            statements.append(
+                f"  {expansion} = SELECT t FROM {reached}:t{where_clause}{limit_clause};"
+            )
+
+        return_attributes = (
+            [spec.return_attributes]
+            if isinstance(spec.return_attributes, str)
+            else spec.return_attributes
+        )
+        if (
+            return_attributes
+            and spec.order_by is not None
+            and spec.order_by not in return_attributes
+        ):
+            # The results are sorted by the ranking attribute after they are printed
+            return_attributes = [*return_attributes, spec.order_by]
+        if return_attributes:
+            prefixed_attributes = ", ".join(
+                f"{expansion}.{attr} AS {attr}" for attr in return_attributes
+            )
+            statements.append(f"  PRINT {expansion}[{prefixed_attributes}];")
+        else:
+            statements.append(f"  PRINT {expansion};")
+        return "\n".join(statements)
+
+    @staticmethod
+    def _create_gsql_ranking(
+        index: int, spec: ExpansionSpec, reached: str, where_clause: str
+    ) -> List[str]:
+        """
+        Generate the statements that rank the reached nodes and select the best
+        ones within the limit and the token budget.
+        """
+        ranked = f"@@ranked_{index}"
+        selected = f"@@selected_{index}"
+        used_tokens = f"@@used_tokens_{index}"
+        score = f"t.{spec.order_by}" if spec.order_by is not None else "0"
+        tokens = (
+            f"t.{spec.token_count_attribute}"
+            if spec.token_count_attribute is not None
+            else "0"
+        )
+        statements = []
+        if not spec.limit:
+            statements.append(
+                f"  IF {reached}.size() > 0 THEN "
+                f"{ranked}.resize({reached}.size()); END;"
+            )
+        statements += [
+            f"  Eligible_{index} = SELECT t FROM {reached}:t{where_clause}",
+            f"    POST-ACCUM {ranked} += Ranked_{index}(t, {score}, {tokens});",
+            f"  FOREACH item IN {ranked} DO",
+        ]
+        if spec.max_tokens is not None:
+            statements += [
+                f"    IF {used_tokens} + item.tokens > {spec.max_tokens} THEN",
+                "      BREAK;",
+                "    END;",
+                f"    {used_tokens} += item.tokens;",
+            ]
+        statements += [
+            f"    {selected} += item.v;",
+            "  END;",
+            f"  Expansion_{index} = {{{selected}}};",
+        ]
+        return statements
+
+    @staticmethod
+    def _process_expansion_results(
+        nodes: List[Dict],
+        return_attributes: Optional[str | List[str]] = None,
+        order_by: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Extract the attributes of the nodes printed by an expansion, sorted by
+        the ranking attribute if there is one.
+        """
+        if isinstance(return_attributes, str):
+            return_attributes = [return_attributes]
+        if order_by is not None:
+
+            def rank_key(node: Dict) -> Tuple[bool, float]:
+                value = node.get("attributes", {}).get(order_by)
+                return value is None, -float(value or 0)
+
+            nodes = sorted(nodes, key=rank_key)
+        expanded_nodes = []
+        for node in nodes:
+            attributes = node.get("attributes", {})
+            if return_attributes is None:
+                expanded_nodes.append(attributes)
+            else:
+                expanded_nodes.append(
+                    {attr: attributes.get(attr) for attr in return_attributes}
+                )
+        return expanded_nodes
+
+    @staticmethod
+    def _add_projection_params(
+        params: Dict, return_attributes: Optional[str | List[str]]
+    ) -> None:
+        """
+        Ask the search query to print only the requested attributes.
+        """
+        if return_attributes is None:
+            return
+        if isinstance(return_attributes, str):
+            return_attributes = [return_attributes]
+        params["return_attributes"] = list(return_attributes)
+        params["project_attributes"] = True
+
+    def _decode_projected_attributes(
+        self, projected_attributes: Dict[str, str], node_type: Optional[str]
+    ) -> Dict:
+        """
+        Convert the attribute values printed as strings by a projection back to
+        the types declared in the graph schema.
+        """
+        node_schema = self._graph_schema.nodes.get(node_type) if node_type else None
+        attributes = {}
+        for name, value in projected_attributes.items():
+            attribute_schema = node_schema.attributes.get(name) if node_schema else None
+            data_type = attribute_schema.data_type if attribute_schema else None
+            if data_type in (DataType.INT, DataType.UINT):
+                attributes[name] = int(value)
+            elif data_type in (DataType.FLOAT, DataType.DOUBLE):
+                attributes[name] = float(value)
+            elif data_type == DataType.BOOL:
+                attributes[name] = str(value).lower() == "true"
+            elif data_type == DataType.DATETIME:
+                # Printed in the same format as datetime attributes of unprojected
+                # nodes
+                attributes[name] = str(value)
+            else:
+                attributes[name] = value
+        return attributes
+
     def _process_search_results(
         self,
         result: List[Dict],
         return_attributes: Optional[str | List[str]] = None,
+        node_type: Optional[str] = None,
     ) -> List[Dict]:
         """
         Processes the raw search results into a combined and formatted list.
@@ -312,6 +1207,16 @@ class VectorManager(BaseManager):
             if distance is None:
                 logger.warning(f"No distance found for node {node_id}.")
 
+            # Attributes printed by a projection are collected in a single map
+            attributes = node.get("attributes", {})
+            if isinstance(attributes.get("projected_attributes"), dict):
+                attributes = {
+                    **self._decode_projected_attributes(
+                        attributes["projected_attributes"], node_type
+                    ),
+                    **attributes.get("projected_double_attributes", {}),
+                }
+
             # Handle return_attributes logic
             if return_attributes is not None:
                 if isinstance(return_attributes, str):
@@ -321,11 +1226,11 @@ class VectorManager(BaseManager):
                 else:
                     node_data = {
                         key: value
-                        for key, value in node.get("attributes", {}).items()
+                        for key, value in attributes.items()
                         if key in return_attributes
                     }
             else:
-                node_data = node.get("attributes", {})
+                node_data = attributes
 
             combined_node = {
                 "id": node_id,
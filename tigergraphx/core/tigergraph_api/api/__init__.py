@@ -14,6 +14,7 @@ from .node_api import NodeAPI
 from .edge_api import EdgeAPI
 from .query_api import QueryAPI 
 from .upsert_api import UpsertAPI
+from .loading_job_api import LoadingJobAPI
 
 __all__ = [
     "TigerGraphAPIError",
@@ -26,4 +27,5 @@ __all__ = [
     "EdgeAPI",
     "QueryAPI",
     "UpsertAPI",
+    "LoadingJobAPI",
 ]
@@ -49,8 +49,8 @@ class BaseAPI:
         self,
         endpoint_name: str,
         params: Optional[Dict] = None,
-        data: Optional[Dict | str] = None,
-        json: Optional[Dict] = None,
+        data: Optional[Dict | str | bytes] = None,
+        json: Optional[Dict | List] = None,
         **path_kwargs,
     ) -> Dict | List | str:
         """
@@ -119,6 +119,9 @@ class BaseAPI:
                         "dropped": response_json.get("dropped", []),
                         "failedToDrop": response_json.get("failedToDrop", []),
                     }
+                # Check for loading-job-specific keys if no results
+                if "jobIds" in response_json:
+                    return {"jobIds": response_json["jobIds"]}
                 # Fallback to message
                 return response_json.get("message", None)
 
@@ -0,0 +1,118 @@
+# Copyright 2025 TigerGraph Inc.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file or https://www.apache.org/licenses/LICENSE-2.0
+#
+# Permission is granted to use, copy, modify, and distribute this software
+# under the License. The software is provided "AS IS", without warranty.
+
+from typing import Any, Dict, List, Optional
+
+from .base_api import BaseAPI
+
+
+class LoadingJobAPI(BaseAPI):
+    def run_loading_job_with_data(
+        self,
+        graph_name: str,
+        loading_job_name: str,
+        file_alias: str,
+        data: str | bytes,
+        separator: str = ",",
+        eol: str = "\n",
+    ) -> List:
+        """
+        Post a chunk of delimited data to a file alias of an existing loading job.
+        """
+        params = {
+            "tag": loading_job_name,
+            "filename": file_alias,
+            "sep": separator,
+            "eol": eol,
+        }
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        result = self._request(
+            endpoint_name="run_loading_job_with_data",
+            params=params,
+            data=data,
+            graph_name=graph_name,
+        )
+        if not isinstance(result, list):
+            raise TypeError(f"Expected list, but got {type(result).__name__}: {result}")
+        return result
+
+    def run_loading_job(
+        self,
+        graph_name: str,
+        loading_job_name: str,
+        data_sources: Dict[str, str],
+        max_num_error: Optional[int] = None,
+        max_percent_error: Optional[int] = None,
+    ) -> str:
+        """
+        Start a loading job without waiting for it to finish and return its job ID.
+        """
+        job: Dict[str, Any] = {
+            "name": loading_job_name,
+            "dataSources": [
+                self._create_data_source_entry(file_alias, path)
+                for file_alias, path in data_sources.items()
+            ],
+        }
+        if max_num_error is not None:
+            job["maxNumError"] = max_num_error
+        if max_percent_error is not None:
+            job["maxPercentError"] = max_percent_error
+        result = self._request(
+            endpoint_name="run_loading_job",
+            json=[job],
+            graph_name=graph_name,
+        )
+        job_id = self._extract_job_id(result, loading_job_name)
+        if job_id is None:
+            raise TypeError(
+                f"Expected a loading job ID, but got {type(result).__name__}: {result}"
+            )
+        return job_id
+
+    def get_loading_job_status(self, graph_name: str, job_id: str) -> Dict:
+        """
+        Get the status and statistics of a loading job run.
+        """
+        result = self._request(
+            endpoint_name="get_loading_job_status",
+            graph_name=graph_name,
+            job_id=job_id,
+        )
+        if isinstance(result, list) and result and isinstance(result[0], dict):
+            return result[0]
+        if not isinstance(result, dict):
+            raise TypeError(f"Expected dict, but got {type(result).__name__}: {result}")
+        return result
+
+    @staticmethod
+    def _create_data_source_entry(file_alias: str, path: str) -> Dict[str, str]:
+        # Paths such as "$s3_source:s3://bucket/file.csv" refer to a named data source
+        if path.startswith("$") and ":" in path:
+            data_source_name, data_source_path = path[1:].split(":", 1)
+            return {
+                "filename": file_alias,
+                "name": data_source_name,
+                "path": data_source_path,
+            }
+        return {"filename": file_alias, "name": "file", "path": path}
+
+    @staticmethod
+    def _extract_job_id(result: Any, loading_job_name: str) -> Optional[str]:
+        if isinstance(result, dict) and "jobIds" in result:
+            job_ids = result["jobIds"]
+            if isinstance(job_ids, dict):
+                job_id = job_ids.get(loading_job_name)
+                if job_id is None and job_ids:
+                    job_id = next(iter(job_ids.values()))
+                return job_id
+            if isinstance(job_ids, list) and job_ids:
+                return job_ids[0]
+        if isinstance(result, list) and result and isinstance(result[0], dict):
+            return result[0].get("jobId")
+        return None
@@ -10,15 +10,26 @@ from .base_api import BaseAPI
 
 
 class UpsertAPI(BaseAPI):
-    def upsert_graph_data(self, graph_name: str, payload: Dict[str, Any]) -> List:
+    def upsert_graph_data(
+        self, graph_name: str, payload: Dict[str, Any] | str
+    ) -> List:
         """
         Upsert data (nodes and/or edges) into a specific graph.
+
+        The payload may also be a pre-serialized JSON document.
         """
-        result = self._request(
-            endpoint_name="upsert_graph_data",
-            graph_name=graph_name,
-            json=payload,
-        )
+        if isinstance(payload, str):
+            result = self._request(
+                endpoint_name="upsert_graph_data",
+                graph_name=graph_name,
+                data=payload.encode("utf-8"),
+            )
+        else:
+            result = self._request(
+                endpoint_name="upsert_graph_data",
+                graph_name=graph_name,
+                json=payload,
+            )
         if not isinstance(result, list):
             raise TypeError(f"Expected list, but got {type(result).__name__}: {result}")
         return result
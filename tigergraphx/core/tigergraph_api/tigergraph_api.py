@@ -20,6 +20,7 @@ from .api import (
     EdgeAPI,
     QueryAPI,
     UpsertAPI,
+    LoadingJobAPI,
 )
 from .api.data_source_api import DataSourceType
 
@@ -109,6 +110,9 @@ class TigerGraphAPI:
         self._upsert_api = UpsertAPI(
             self.config, self.endpoint_registry, self.session, self.version
         )
+        self._loading_job_api = LoadingJobAPI(
+            self.config, self.endpoint_registry, self.session, self.version
+        )
 
     # ------------------------------ Admin ------------------------------
     def ping(self) -> str:
@@ -475,19 +479,92 @@ class TigerGraphAPI:
         return self._query_api.run_installed_query_post(graph_name, query_name, params)
 
     # ------------------------------ Upsert ------------------------------
-    def upsert_graph_data(self, graph_name: str, payload: Dict[str, Any]) -> List:
+    def upsert_graph_data(
+        self, graph_name: str, payload: Dict[str, Any] | str
+    ) -> List:
         """
         Upsert nodes and edges into the graph.
 
         Args:
             graph_name: The name of the graph.
-            payload: Dictionary containing nodes and edges.
+            payload: Dictionary containing nodes and edges, or the same
+                document already serialized to a JSON string.
 
         Returns:
             API response as a list.
         """
         return self._upsert_api.upsert_graph_data(graph_name, payload)
 
+    # ------------------------------ Loading Job ------------------------------
+    def run_loading_job_with_data(
+        self,
+        graph_name: str,
+        loading_job_name: str,
+        file_alias: str,
+        data: str | bytes,
+        separator: str = ",",
+        eol: str = "\n",
+    ) -> List:
+        """
+        Stream a chunk of delimited data to a file alias of an existing loading job.
+
+        Args:
+            graph_name: The name of the graph.
+            loading_job_name: The name of the loading job.
+            file_alias: The file alias defined in the loading job.
+            data: The delimited data, including the header line if the job expects one.
+            separator: The field separator of the data.
+            eol: The end-of-line character of the data.
+
+        Returns:
+            Loading statistics as a list.
+        """
+        return self._loading_job_api.run_loading_job_with_data(
+            graph_name, loading_job_name, file_alias, data, separator, eol
+        )
+
+    def run_loading_job(
+        self,
+        graph_name: str,
+        loading_job_name: str,
+        data_sources: Dict[str, str],
+        max_num_error: Optional[int] = None,
+        max_percent_error: Optional[int] = None,
+    ) -> str:
+        """
+        Start a loading job in non-blocking mode.
+
+        Args:
+            graph_name: The name of the graph.
+            loading_job_name: The name of the loading job.
+            data_sources: Mapping from file aliases to file paths on the server.
+            max_num_error: Maximum number of error lines before the job is aborted.
+            max_percent_error: Maximum percentage of error lines before the job is aborted.
+
+        Returns:
+            The ID of the started loading job run.
+        """
+        return self._loading_job_api.run_loading_job(
+            graph_name,
+            loading_job_name,
+            data_sources,
+            max_num_error,
+            max_percent_error,
+        )
+
+    def get_loading_job_status(self, graph_name: str, job_id: str) -> Dict:
+        """
+        Get the status and statistics of a loading job run.
+
+        Args:
+            graph_name: The name of the graph.
+            job_id: The ID returned when the loading job was started.
+
+        Returns:
+            The status reported by the server.
+        """
+        return self._loading_job_api.get_loading_job_status(graph_name, job_id)
+
     def _initialize_session(self) -> Session:
         """
         Create a shared requests.Session with retries and default headers.
@@ -6,6 +6,8 @@
 # under the License. The software is provided "AS IS", without warranty.
 
 from .base_context_builder import BaseContextBuilder
+from .token_counter import TokenCounter, get_token_counter
+from .context_cache import ContextCache
 from .evaluation import (
     BaseRAGEvaluator,
     RagasEvaluator,
@@ -15,4 +17,7 @@ __all__ = [
     "BaseRAGEvaluator",
     "RagasEvaluator",
     "BaseContextBuilder",
+    "TokenCounter",
+    "get_token_counter",
+    "ContextCache",
 ]
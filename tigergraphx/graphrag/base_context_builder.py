@@ -5,13 +5,18 @@
 # Permission is granted to use, copy, modify, and distribute this software
 # under the License. The software is provided "AS IS", without warranty.
 
+import asyncio
 import tiktoken
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
 
+from tigergraphx.config import ExpansionSpec
 from tigergraphx.core import Graph
-from tigergraphx.vector_search import BaseSearchEngine
+from tigergraphx.vector_search import BaseSearchEngine, TigerVectorManager
+
+from .token_counter import get_token_counter
 
 
 class BaseContextBuilder(ABC):
@@ -23,6 +28,7 @@ class BaseContextBuilder(ABC):
         single_batch: Whether to process data in a single batch.
         search_engine: The search engine for retrieving top-k objects.
         token_encoder: Token encoder for text tokenization.
+        token_counter: The cached token counter shared by all users of the encoding.
     """
 
     def __init__(
@@ -45,6 +51,7 @@ class BaseContextBuilder(ABC):
         self.single_batch = single_batch
         self.search_engine = search_engine
         self.token_encoder = token_encoder or tiktoken.get_encoding("cl100k_base")
+        self.token_counter = get_token_counter(self.token_encoder)
 
     @abstractmethod
     async def build_context(self, *args, **kwargs) -> str | List[str]:
@@ -62,47 +69,138 @@ class BaseContextBuilder(ABC):
         section_name: str,
         single_batch: bool = False,
         max_tokens: int = 12000,
+        token_count_columns: Optional[Dict[str, str]] = None,
     ) -> str | List[str]:
         """
         Convert graph data to a formatted string or list of strings in batches based on token count.
 
+        Rows are added to a batch greedily until the next row would exceed the
+        token budget; that row then starts the next batch. All rows are
+        tokenized at once, and the batch boundaries are found on the cumulative
+        token counts. With `single_batch`, rows are tokenized in growing chunks
+        only until the first batch is full. Token counts are cached, so rows
+        seen by earlier queries are not tokenized again.
+
         Args:
             graph_data: The graph data to convert.
             section_name: The section name for the header.
             single_batch: Whether to process data in a single batch. Defaults to False.
             max_tokens: Maximum number of tokens per batch. Defaults to 12000.
+            token_count_columns: Mapping from text columns to columns with their
+                precomputed token counts, e.g. `{"text": "n_tokens"}`. The text
+                columns of rows with counts are not tokenized, which makes the
+                row token counts slightly approximate. The count columns are
+                not included in the output.
 
         Returns:
             The formatted graph data as a string or list of strings.
         """
+        token_count_columns = {
+            text_column: count_column
+            for text_column, count_column in (token_count_columns or {}).items()
+            if text_column in graph_data.columns and count_column in graph_data.columns
+        }
+        token_counts = graph_data[list(token_count_columns.values())]
+        graph_data = graph_data.drop(columns=list(token_count_columns.values()))
+        text_columns = list(token_count_columns)
+
         header = f"-----{section_name}-----\n" + "|".join(graph_data.columns) + "\n"
-        content_rows = [
-            "|".join(str(value) for value in row) for row in graph_data.values
+        budget = max_tokens - self.token_counter.count(header)
+        values = graph_data.values
+
+        if single_batch:
+            content_rows: List[str] = []
+            row_tokens = np.zeros(0, dtype=np.int64)
+            chunk_size = 64
+            while len(content_rows) < len(values) and row_tokens.sum() <= budget:
+                rows = slice(len(content_rows), len(content_rows) + chunk_size)
+                chunk = self._rows_to_text(values[rows])
+                content_rows.extend(chunk)
+                chunk_tokens = self._row_tokens(
+                    chunk, graph_data.iloc[rows], token_counts.iloc[rows], text_columns
+                )
+                row_tokens = np.concatenate([row_tokens, chunk_tokens])
+                chunk_size *= 2
+        else:
+            content_rows = self._rows_to_text(values)
+            row_tokens = self._row_tokens(
+                content_rows, graph_data, token_counts, text_columns
+            )
+
+        batches = [
+            (header + "\n".join(content_rows[start:end])).strip()
+            for start, end in self._batch_boundaries(
+                row_tokens, budget, max_batches=1 if single_batch else None
+            )
         ]
+        return batches[0] if single_batch else batches
 
-        header_tokens = self._num_tokens(header, self.token_encoder)
-        batches = []
-        current_batch = header
-        current_tokens = header_tokens
+    @staticmethod
+    def _rows_to_text(values: np.ndarray) -> List[str]:
+        """
+        Convert rows of graph data to "|"-separated strings.
+        """
+        return ["|".join(map(str, row)) for row in values]
 
-        for row in content_rows:
-            row_tokens = self._num_tokens(row, self.token_encoder)
+    def _row_tokens(
+        self,
+        rows: List[str],
+        graph_data: pd.DataFrame,
+        token_counts: pd.DataFrame,
+        text_columns: List[str],
+    ) -> np.ndarray:
+        """
+        Count the tokens of every row. Rows with precomputed token counts for
+        all text columns are only tokenized without those columns.
+        """
+        if not text_columns:
+            return self.token_counter.count_batch(rows)
+        has_counts = token_counts.notna().all(axis=1).to_numpy()
+        row_tokens = np.zeros(len(rows), dtype=np.int64)
+        missing = np.flatnonzero(~has_counts)
+        if len(missing):
+            row_tokens[missing] = self.token_counter.count_batch(
+                [rows[i] for i in missing]
+            )
+        if has_counts.any():
+            remainder = graph_data[has_counts].assign(
+                **{column: "" for column in text_columns}
+            )
+            row_tokens[has_counts] = self.token_counter.count_batch(
+                self._rows_to_text(remainder.values)
+            ) + token_counts[has_counts].sum(axis=1).to_numpy(dtype=np.int64)
+        return row_tokens
 
-            if current_tokens + row_tokens > max_tokens:
-                batches.append(current_batch.strip())
-                if single_batch:
-                    return batches[0]
+    @staticmethod
+    def _batch_boundaries(
+        row_tokens: np.ndarray, budget: int, max_batches: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Split rows greedily into batches whose token counts stay within the budget.
 
-                current_batch = header + row + "\n"
-                current_tokens = header_tokens + row_tokens
-            else:
-                current_batch += row + "\n"
-                current_tokens += row_tokens
+        Every batch after the first starts with the row that did not fit into
+        the previous one, even if that row alone exceeds the budget. The first
+        batch may therefore hold no rows at all.
 
-        if current_batch.strip():
-            batches.append(current_batch.strip())
+        Args:
+            row_tokens: The number of tokens of every row.
+            budget: The number of tokens available for the rows of a batch.
+            max_batches: Stop after this many batches, if given.
 
-        return batches[0] if single_batch else batches
+        Returns:
+            The start and end row index of every batch.
+        """
+        prefix = np.concatenate([[0], np.cumsum(row_tokens)])
+        num_rows = len(row_tokens)
+        boundaries: List[Tuple[int, int]] = []
+        start = 0
+        while True:
+            end = int(np.searchsorted(prefix, prefix[start] + budget, side="right")) - 1
+            end = min(max(end, start + 1 if boundaries else start), num_rows)
+            boundaries.append((start, end))
+            if end >= num_rows or len(boundaries) == max_batches:
+                return boundaries
+            start = end
 
     async def retrieve_top_k_objects(
         self,
@@ -139,6 +237,126 @@ class BaseContextBuilder(ABC):
             return search_results
         return []
 
+    async def retrieve_top_k_neighborhoods(
+        self,
+        query: str,
+        expansions: List[ExpansionSpec | Dict],
+        start_node_type: str,
+        k: int = 10,
+        oversample_scaler: int = 2,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Retrieve the neighborhoods of the top-k objects most similar to the query.
+
+        With TigerVector, the vector search and the expansions run in a single
+        query, which also ranks the nodes and applies the token budgets on the
+        server. Other vector databases fall back to a search followed by one
+        neighbor query per expansion, which only supports single-hop expansions
+        and ranks the nodes on the client.
+
+        Args:
+            query: The query string.
+            expansions: The neighborhoods to expand from the top-k objects.
+            start_node_type: The node type of the objects in the vector database.
+            k: The number of top results to expand from. Defaults to 10.
+            oversample_scaler: Factor by which to oversample the search results.
+
+        Returns:
+            The nodes of every expansion, keyed by expansion name.
+
+        Raises:
+            ValueError: If `k` is less than or equal to 0, if the search engine is
+                not initialized, or if a multi-hop expansion is requested without
+                TigerVector.
+        """
+        if k <= 0:
+            raise ValueError("Parameter 'k' must be greater than 0.")
+
+        if not self.search_engine:
+            raise ValueError("Search engine is not initialized.")
+
+        specs = [ExpansionSpec.ensure_config(expansion) for expansion in expansions]
+        empty_result = {spec.name: pd.DataFrame() for spec in specs}
+        if not query:
+            return empty_result
+
+        vector_db = self.search_engine.vector_db
+        if isinstance(vector_db, TigerVectorManager):
+            embedding = await self.search_engine.embedding_model.generate_embedding(
+                query
+            )
+            result = await asyncio.to_thread(
+                vector_db.query_and_expand,
+                query_embedding=embedding,
+                expansions=specs,
+                k=k * oversample_scaler,
+            )
+            return {
+                spec.name: pd.DataFrame(result.get(spec.name, [])) for spec in specs
+            }
+
+        if any(spec.max_hops > 1 for spec in specs):
+            raise ValueError("Multi-hop expansions require TigerVector.")
+        top_k_objects = await self.retrieve_top_k_objects(
+            query, k=k, oversample_scaler=oversample_scaler
+        )
+        if not top_k_objects:
+            return empty_result
+        neighborhoods = {}
+        for spec in specs:
+            requested = (
+                [spec.return_attributes]
+                if isinstance(spec.return_attributes, str)
+                else spec.return_attributes
+            )
+            return_attributes = requested
+            if requested is not None and spec.is_ranked:
+                ranking_attributes = [
+                    attribute
+                    for attribute in (spec.order_by, spec.token_count_attribute)
+                    if attribute is not None and attribute not in requested
+                ]
+                return_attributes = [*requested, *ranking_attributes]
+            df = self.graph.get_neighbors(
+                start_nodes=top_k_objects,
+                start_node_type=start_node_type,
+                edge_types=(
+                    sorted(spec.edge_type_set) if spec.edge_type_set else None
+                ),
+                target_node_types=(
+                    sorted(spec.target_node_type_set)
+                    if spec.target_node_type_set
+                    else None
+                ),
+                return_attributes=return_attributes,
+                limit=None if spec.is_ranked else spec.limit,
+            )
+            df = df if isinstance(df, pd.DataFrame) else pd.DataFrame(df)
+            if spec.is_ranked:
+                df = self._rank_neighbors(df, spec)
+                if requested is not None:
+                    df = df[[column for column in requested if column in df.columns]]
+            neighborhoods[spec.name] = df
+        return neighborhoods
+
+    @staticmethod
+    def _rank_neighbors(df: pd.DataFrame, spec: ExpansionSpec) -> pd.DataFrame:
+        """
+        Sort neighbors by the ranking attribute of an expansion and keep the best
+        ones within its limit and token budget, as the server does for TigerVector.
+        """
+        if spec.order_by is not None and spec.order_by in df.columns:
+            df = df.sort_values(
+                spec.order_by, ascending=False, kind="stable", na_position="last"
+            )
+        if spec.limit:
+            df = df.head(spec.limit)
+        if spec.max_tokens is not None and spec.token_count_attribute in df.columns:
+            used_tokens = df[spec.token_count_attribute].fillna(0).cumsum()
+            # Stop at the first node that exceeds the budget
+            df = df[(used_tokens > spec.max_tokens).cumsum() == 0]
+        return df.reset_index(drop=True)
+
     @staticmethod
     def _num_tokens(text: str, token_encoder: tiktoken.Encoding | None = None) -> int:
         """
@@ -151,6 +369,4 @@ class BaseContextBuilder(ABC):
         Returns:
             The number of tokens in the text.
         """
-        if token_encoder is None:
-            token_encoder = tiktoken.get_encoding("cl100k_base")
-        return len(token_encoder.encode(text))  # type: ignore
+        return get_token_counter(token_encoder).count(text)
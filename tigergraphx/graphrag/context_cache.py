@@ -0,0 +1,119 @@
+# Copyright 2025 TigerGraph Inc.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file or https://www.apache.org/licenses/LICENSE-2.0
+#
+# Permission is granted to use, copy, modify, and distribute this software
+# under the License. The software is provided "AS IS", without warranty.
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ContextCache:
+    """
+    Cache of materialized context batches, kept in memory and optionally on disk.
+
+    Every entry is stored with the data version it was built from. An entry is
+    only returned for the same version, so bumping the version after the graph
+    data changes invalidates it; entries can also be invalidated explicitly.
+    """
+
+    def __init__(self, cache_dir: Optional[str | Path] = None):
+        """
+        Initialize the ContextCache.
+
+        Args:
+            cache_dir: Directory to persist the batches in, so that they survive
+                restarts. If None, the batches are only cached in memory.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._memory_cache: Dict[str, Tuple[Optional[str], List[str]]] = {}
+
+    def get(self, key: str, version: Optional[str] = None) -> Optional[List[str]]:
+        """
+        Return the cached batches of a key if they were built from the version.
+
+        Args:
+            key: The key of the context.
+            version: The current data version.
+
+        Returns:
+            The cached batches, or None on a miss.
+        """
+        entry = self._memory_cache.get(key)
+        if entry is None:
+            entry = self._read_from_disk(key)
+            if entry is not None:
+                self._memory_cache[key] = entry
+        if entry is None or entry[0] != version:
+            return None
+        return list(entry[1])
+
+    def set(self, key: str, batches: List[str], version: Optional[str] = None) -> None:
+        """
+        Store the batches of a key built from the version.
+
+        Args:
+            key: The key of the context.
+            batches: The context batches.
+            version: The data version the batches were built from.
+        """
+        self._memory_cache[key] = (version, list(batches))
+        path = self._path(key)
+        if path is None:
+            return
+        # Write to a temporary file first, so that readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "version": version, "batches": batches}, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Remove the cached batches of a key, or of all keys.
+
+        Args:
+            key: The key to invalidate. If None, the whole cache is cleared.
+        """
+        if key is not None:
+            self._memory_cache.pop(key, None)
+            path = self._path(key)
+            paths = [path] if path is not None else []
+        else:
+            self._memory_cache.clear()
+            paths = list(self.cache_dir.glob("*.json")) if self.cache_dir else []
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _read_from_disk(self, key: str) -> Optional[Tuple[Optional[str], List[str]]]:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable context cache file {path}: {e}")
+            return None
+        if entry.get("key") != key:
+            return None
+        return entry.get("version"), entry.get("batches", [])
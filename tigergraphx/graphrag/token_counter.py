@@ -0,0 +1,154 @@
+# Copyright 2025 TigerGraph Inc.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file or https://www.apache.org/licenses/LICENSE-2.0
+#
+# Permission is granted to use, copy, modify, and distribute this software
+# under the License. The software is provided "AS IS", without warranty.
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+import tiktoken
+
+DEFAULT_ENCODING_NAME = "cl100k_base"
+
+
+class TokenCounter:
+    """
+    Counts the tokens of texts with an LRU cache keyed by a hash of the text.
+
+    A counter is bound to one token encoder; use `get_token_counter` to share
+    a counter per encoding across context builders.
+    """
+
+    def __init__(
+        self,
+        token_encoder: Optional[tiktoken.Encoding] = None,
+        max_items: int = 100000,
+    ):
+        """
+        Initialize the TokenCounter.
+
+        Args:
+            token_encoder: Token encoder for text tokenization. Defaults to "cl100k_base".
+            max_items: Maximum number of token counts kept in the cache.
+        """
+        self.token_encoder = token_encoder or tiktoken.get_encoding(
+            DEFAULT_ENCODING_NAME
+        )
+        self.max_items = max_items
+        self._cache: OrderedDict[bytes, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def count(self, text: str) -> int:
+        """
+        Return the number of tokens in the text.
+
+        Args:
+            text: The text to count.
+
+        Returns:
+            The number of tokens in the text.
+        """
+        return int(self.count_batch([text])[0])
+
+    def count_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Return the number of tokens of every text, tokenizing all cache misses
+        with a single batched encoder call.
+
+        Args:
+            texts: The texts to count.
+
+        Returns:
+            An integer array with the number of tokens of every text.
+        """
+        keys = [self._cache_key(text) for text in texts]
+        counts = np.zeros(len(texts), dtype=np.int64)
+        missing: Dict[bytes, List[int]] = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                count = self._cache.get(key)
+                if count is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    counts[i] = count
+            self._stats["hits"] += len(texts) - sum(map(len, missing.values()))
+            self._stats["misses"] += sum(map(len, missing.values()))
+        if not missing:
+            return counts
+
+        positions = list(missing.values())
+        encoded = self.token_encoder.encode_batch(
+            [texts[indices[0]] for indices in positions]
+        )
+        with self._lock:
+            for key, indices, tokens in zip(missing, positions, encoded):
+                counts[indices] = len(tokens)
+                self._cache[key] = len(tokens)
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.max_items:
+                self._cache.popitem(last=False)
+        return counts
+
+    def add_token_counts(
+        self,
+        data: pd.DataFrame,
+        text_column: str,
+        count_column: str = "n_tokens",
+    ) -> pd.DataFrame:
+        """
+        Add the token counts of a text column to a DataFrame, so that they can
+        be stored as a graph attribute at ingest time.
+
+        Args:
+            data: The data to annotate.
+            text_column: The column with the texts to count.
+            count_column: The column to store the token counts in.
+
+        Returns:
+            A copy of the data with the token counts. Missing texts count as
+            zero tokens.
+        """
+        texts = data[text_column].fillna("").astype(str).tolist()
+        return data.assign(**{count_column: self.count_batch(texts)})
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return the number of cache hits and misses.
+        """
+        return dict(self._stats)
+
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+_token_counters: Dict[str, TokenCounter] = {}
+_token_counters_lock = threading.Lock()
+
+
+def get_token_counter(
+    token_encoder: Optional[tiktoken.Encoding] = None,
+) -> TokenCounter:
+    """
+    Return the token counter shared by all users of an encoding.
+
+    Args:
+        token_encoder: Token encoder for text tokenization. Defaults to "cl100k_base".
+
+    Returns:
+        The shared token counter of the encoding.
+    """
+    name = token_encoder.name if token_encoder is not None else DEFAULT_ENCODING_NAME
+    with _token_counters_lock:
+        counter = _token_counters.get(name)
+        if counter is None:
+            counter = TokenCounter(token_encoder)
+            _token_counters[name] = counter
+        return counter
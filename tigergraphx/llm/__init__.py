@@ -6,15 +6,20 @@
 # under the License. The software is provided "AS IS", without warranty.
 
 from .base_llm_manager import BaseLLMManager
+from .rate_limiter import RateLimiter, RequestLease
 from .openai_manager import OpenAIManager
 from .chat import (
     BaseChat,
     OpenAIChat,
+    CachedChat,
 )
 
 __all__ = [
     "BaseLLMManager",
     "OpenAIManager",
+    "RateLimiter",
+    "RequestLease",
     "BaseChat",
     "OpenAIChat",
+    "CachedChat",
 ]
@@ -7,8 +7,10 @@
 
 from .base_chat import BaseChat
 from .openai_chat import OpenAIChat
+from .cached_chat import CachedChat
 
 __all__ = [
     "BaseChat",
     "OpenAIChat",
+    "CachedChat",
 ]
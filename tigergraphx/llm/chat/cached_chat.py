@@ -0,0 +1,265 @@
+# Copyright 2025 TigerGraph Inc.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file or https://www.apache.org/licenses/LICENSE-2.0
+#
+# Permission is granted to use, copy, modify, and distribute this software
+# under the License. The software is provided "AS IS", without warranty.
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base_chat import BaseChat
+
+_INDEX_FILE = "responses.sqlite"
+
+# Config fields that do not change the generated response
+_NON_GENERATION_FIELDS = {"max_retries"}
+
+
+class CachedChat(BaseChat):
+    """
+    Chat model wrapper that caches responses by model, messages and the
+    generation parameters of the chat config.
+
+    Responses are kept in an in-memory LRU cache, backed by an optional SQLite
+    store that survives restarts. Entries older than the time to live are
+    treated as misses, and both tiers are bounded in size. Hits in memory also
+    count as accesses of the on-disk copy, so that responses in frequent use are
+    not evicted from disk.
+    """
+
+    def __init__(
+        self,
+        chat_model: BaseChat,
+        cache_dir: Optional[str | Path] = None,
+        max_memory_items: int = 1000,
+        max_disk_items: Optional[int] = 100000,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the CachedChat wrapper.
+
+        Args:
+            chat_model: The chat model whose responses are cached.
+            cache_dir: Directory of the on-disk store. If None, responses are
+                only cached in memory.
+            max_memory_items: Maximum number of responses in the in-memory cache.
+            max_disk_items: Maximum number of responses in the on-disk store, or
+                None for no limit. The least recently used are evicted first.
+            ttl: Time to live of a response in seconds, or None if responses
+                never expire.
+
+        Raises:
+            ValueError: If a size bound or the time to live is not positive.
+        """
+        for name, value in [
+            ("max_memory_items", max_memory_items),
+            ("max_disk_items", max_disk_items),
+            ("ttl", ttl),
+        ]:
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive, but got {value}.")
+        super().__init__(chat_model.config)
+        self.chat_model = chat_model
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.ttl = ttl
+        self._memory_cache: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._key_prefix = json.dumps(
+            self.config.model_dump(exclude=_NON_GENERATION_FIELDS),
+            sort_keys=True,
+            default=str,
+        )
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        # Access times of memory hits, written to disk before the next eviction
+        self._pending_accesses: Dict[str, float] = {}
+        self._disk_count = 0
+
+        self._connection: Optional[sqlite3.Connection] = None
+        if cache_dir is not None:
+            cache_path = Path(cache_dir)
+            cache_path.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                cache_path / _INDEX_FILE, check_same_thread=False
+            )
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, "
+                    "response TEXT, created_at REAL, accessed_at REAL)"
+                )
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS responses_accessed_at "
+                    "ON responses (accessed_at)"
+                )
+            self._disk_count = self._count_disk_items()
+
+    async def chat(self, messages: List[Any]) -> str:
+        """
+        Return the cached response to the messages, generating it on a miss.
+
+        Args:
+            messages: A list of messages to process.
+
+        Returns:
+            The generated response.
+        """
+        key = self._cache_key(messages)
+        response = self._lookup(key)
+        if response is not None:
+            return response
+        response = await self.chat_model.chat(messages)
+        # Empty responses are not cached, so that they are requested again
+        if response:
+            self._store(key, response)
+        return response
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups served from either cache tier."""
+        hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+        total = hits + self._stats["misses"]
+        return hits / total if total else 0.0
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Return the number of hits per cache tier, misses and the hit rate.
+        """
+        return {**self._stats, "hit_rate": self.hit_rate}
+
+    def clear(self) -> None:
+        """Remove all responses from both cache tiers."""
+        self._memory_cache.clear()
+        self._pending_accesses.clear()
+        if self._connection is not None:
+            with self._connection:
+                self._connection.execute("DELETE FROM responses")
+            self._disk_count = 0
+
+    def close(self) -> None:
+        """Close the on-disk store."""
+        if self._connection is not None:
+            with self._connection:
+                self._flush_accesses()
+            self._connection.close()
+            self._connection = None
+
+    def _cache_key(self, messages: List[Any]) -> str:
+        payload = json.dumps(messages, sort_keys=True, default=str)
+        return hashlib.sha256(
+            f"{self._key_prefix}\0{payload}".encode("utf-8")
+        ).hexdigest()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """
+        Look up the key in memory first and then on disk, counting the hit or
+        miss.
+        """
+        now = time.time()
+        entry = self._memory_cache.get(key)
+        if entry is not None:
+            if not self._is_expired(entry[1], now):
+                self._memory_cache.move_to_end(key)
+                if self._connection is not None:
+                    self._pending_accesses[key] = now
+                self._stats["memory_hits"] += 1
+                return entry[0]
+            del self._memory_cache[key]
+
+        entry = self._read_from_disk(key, now)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["disk_hits"] += 1
+        self._remember(key, entry)
+        return entry[0]
+
+    def _store(self, key: str, response: str) -> None:
+        now = time.time()
+        self._remember(key, (response, now))
+        if self._connection is None:
+            return
+        with self._connection:
+            cursor = self._connection.execute(
+                "UPDATE responses SET response = ?, created_at = ?, accessed_at = ? "
+                "WHERE key = ?",
+                (response, now, now, key),
+            )
+            if cursor.rowcount == 0:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, response, now, now),
+                )
+                self._disk_count += 1
+            if self.max_disk_items is not None and (
+                self._disk_count > self.max_disk_items
+            ):
+                self._evict_from_disk(self.max_disk_items)
+
+    def _evict_from_disk(self, max_items: int) -> None:
+        """
+        Delete the least recently used responses beyond `max_items` from disk.
+        """
+        assert self._connection is not None
+        self._flush_accesses()
+        # Other processes may share the store, so the rows are counted again
+        self._disk_count = self._count_disk_items()
+        excess = self._disk_count - max_items
+        if excess > 0:
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            self._disk_count = max_items
+
+    def _flush_accesses(self) -> None:
+        """Write the access times of memory hits to disk."""
+        assert self._connection is not None
+        if self._pending_accesses:
+            self._connection.executemany(
+                "UPDATE responses SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                [(now, key) for key, now in self._pending_accesses.items()],
+            )
+            self._pending_accesses.clear()
+
+    def _count_disk_items(self) -> int:
+        assert self._connection is not None
+        return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _remember(self, key: str, entry: Tuple[str, float]) -> None:
+        """
+        Add a response to the in-memory cache, evicting the least recently used.
+        """
+        self._memory_cache[key] = entry
+        self._memory_cache.move_to_end(key)
+        while len(self._memory_cache) > self.max_memory_items:
+            self._memory_cache.popitem(last=False)
+
+    def _read_from_disk(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        if self._connection is None:
+            return None
+        row = self._connection.execute(
+            "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        with self._connection:
+            if self._is_expired(row[1], now):
+                cursor = self._connection.execute(
+                    "DELETE FROM responses WHERE key = ?", (key,)
+                )
+                self._disk_count -= cursor.rowcount
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return row[0], row[1]
@@ -41,12 +41,15 @@ class OpenAIChat(BaseChat, RetryMixin):
         config = OpenAIChatConfig.ensure_config(config)
         super().__init__(config)
         self.llm = llm_manager.get_llm()
+        self.rate_limiter = llm_manager.get_rate_limiter()
         self.retryer = self.initialize_retryer(self.config.max_retries, max_wait=10)
 
     async def chat(self, messages: List[ChatCompletionMessageParam]) -> str:
         """
         Asynchronously process the messages and return the generated response.
 
+        Every attempt waits for the rate limiter shared by the LLM manager.
+
         Args:
             messages: List of messages for chat completion.
 
@@ -57,13 +60,20 @@ class OpenAIChat(BaseChat, RetryMixin):
             RetryError: If retry attempts are exhausted.
             Exception: For any unexpected errors during processing.
         """
+        estimated_tokens = sum(
+            self.rate_limiter.estimate_tokens(str(message.get("content") or ""))
+            for message in messages
+        )
         try:
             async for attempt in self.retryer:
                 with attempt:
-                    response = await self.llm.chat.completions.create(
-                        messages=messages,
-                        model=self.config.model,
-                    )
+                    async with self.rate_limiter.limit(estimated_tokens) as lease:
+                        response = await self.llm.chat.completions.create(
+                            messages=messages,
+                            model=self.config.model,
+                        )
+                        usage = getattr(response, "usage", None)
+                        lease.record_usage(getattr(usage, "total_tokens", None))
                     return response.choices[0].message.content or ""
         except RetryError as e:
             logger.error(f"RetryError in chat for messages: {messages} | {e}")
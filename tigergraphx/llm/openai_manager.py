@@ -10,12 +10,14 @@ from pathlib import Path
 from openai import AsyncOpenAI
 
 from .base_llm_manager import BaseLLMManager
+from .rate_limiter import RateLimiter
 from ..config import OpenAIConfig
 
 
 class OpenAIManager(BaseLLMManager):
     """
-    Manages an asynchronous OpenAI instance for LLM operations.
+    Manages an asynchronous OpenAI instance for LLM operations, and the rate
+    limiter shared by all requests sent through it.
     """
 
     config: OpenAIConfig
@@ -46,6 +48,11 @@ class OpenAIManager(BaseLLMManager):
             timeout=self.config.request_timeout,
             max_retries=self.config.max_retries,
         )
+        self._rate_limiter = RateLimiter(
+            requests_per_minute=self.config.requests_per_minute,
+            tokens_per_minute=self.config.tokens_per_minute,
+            max_concurrency=self.config.max_concurrency,
+        )
 
     def get_llm(self) -> AsyncOpenAI:
         """
@@ -55,3 +62,12 @@ class OpenAIManager(BaseLLMManager):
             The initialized OpenAI instance.
         """
         return self._llm
+
+    def get_rate_limiter(self) -> RateLimiter:
+        """
+        Retrieve the rate limiter shared by all requests to OpenAI.
+
+        Returns:
+            The rate limiter of this manager.
+        """
+        return self._rate_limiter
@@ -0,0 +1,242 @@
+# Copyright 2025 TigerGraph Inc.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file or https://www.apache.org/licenses/LICENSE-2.0
+#
+# Permission is granted to use, copy, modify, and distribute this software
+# under the License. The software is provided "AS IS", without warranty.
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from tigergraphx.utils.retry_mixin import get_retry_after, is_rate_limit_error
+
+# Rate limit errors within this many seconds of a decrease belong to the same
+# burst, so the concurrency limit is only decreased once for them
+_DECREASE_COOLDOWN = 1.0
+
+
+class _TokenBucket:
+    """A bucket refilled continuously with a per-minute budget."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        self.level = min(self.capacity, self.level + elapsed * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        # Amounts above the capacity are served once the bucket is full
+        amount = min(amount, self.capacity)
+        return max(amount - self.level, 0.0) / self.rate
+
+
+class RequestLease:
+    """A request admitted by the rate limiter."""
+
+    def __init__(self, limiter: "RateLimiter", tokens: int):
+        self._limiter = limiter
+        self.tokens = tokens
+
+    def record_usage(self, tokens: Optional[int]) -> None:
+        """
+        Correct the token budget with the number of tokens the request actually
+        used, as reported by the API.
+
+        Args:
+            tokens: The number of tokens used, or None if unknown.
+        """
+        if not isinstance(tokens, int):
+            return
+        bucket = self._limiter._token_bucket
+        if bucket is not None:
+            bucket.refill(time.monotonic())
+            # The level may become negative, which delays the next requests
+            bucket.level -= tokens - self.tokens
+        self.tokens = tokens
+
+
+class RateLimiter:
+    """
+    Limiter shared by all requests sent through an LLM manager.
+
+    Requests wait for a concurrency slot and for enough request-per-minute and
+    token-per-minute budget before they are sent. The concurrency limit adapts
+    with additive increase and multiplicative decrease (AIMD): it grows by
+    about one slot per round of successful requests and is halved when the API
+    reports that a rate limit was exceeded. A `Retry-After` delay requested by
+    the API pauses all requests.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+    ):
+        """
+        Initialize the RateLimiter.
+
+        Args:
+            requests_per_minute: Maximum number of requests per minute, or None
+                for no limit.
+            tokens_per_minute: Maximum number of tokens per minute, or None for
+                no limit.
+            max_concurrency: Maximum number of concurrent requests.
+            min_concurrency: The concurrency limit is never decreased below this.
+
+        Raises:
+            ValueError: If a limit is not positive.
+        """
+        for name, value in [
+            ("requests_per_minute", requests_per_minute),
+            ("tokens_per_minute", tokens_per_minute),
+            ("max_concurrency", max_concurrency),
+            ("min_concurrency", min_concurrency),
+        ]:
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be positive, but got {value}.")
+        if min_concurrency > max_concurrency:
+            raise ValueError("min_concurrency must not exceed max_concurrency.")
+
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self._request_bucket = (
+            _TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self._token_bucket = (
+            _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        )
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def concurrency_limit(self) -> int:
+        """The current number of requests allowed to run concurrently."""
+        return max(self.min_concurrency, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently running."""
+        return self._in_flight
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        Estimate the number of tokens of a text without tokenizing it.
+
+        Args:
+            text: The text to estimate.
+
+        Returns:
+            About one token per four characters.
+        """
+        return (len(text) + 3) // 4
+
+    @asynccontextmanager
+    async def limit(self, tokens: int = 0) -> AsyncIterator[RequestLease]:
+        """
+        Wait until a request may be sent, and hold its concurrency slot while
+        the request runs.
+
+        Successful requests increase the concurrency limit, and rate limit
+        errors decrease it and pause all requests for the requested delay.
+
+        Args:
+            tokens: The estimated number of tokens of the request.
+
+        Yields:
+            A lease on which the actual token usage can be recorded.
+        """
+        await self._acquire(tokens)
+        try:
+            yield RequestLease(self, tokens)
+        except BaseException as e:
+            await self._release()
+            if is_rate_limit_error(e):
+                self.on_rate_limited(get_retry_after(e))
+            raise
+        else:
+            await self._release()
+            self.on_success()
+
+    def on_success(self) -> None:
+        """Increase the concurrency limit additively after a successful request."""
+        self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """
+        Decrease the concurrency limit multiplicatively, and pause all requests
+        for the delay requested by the API.
+
+        Args:
+            retry_after: The delay in seconds requested by the API, if any.
+        """
+        now = time.monotonic()
+        if now - self._last_decrease >= _DECREASE_COOLDOWN:
+            self._limit = max(float(self.min_concurrency), self._limit / 2)
+            self._last_decrease = now
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Asyncio primitives are bound to an event loop, and the limiter may be
+        # shared by code running in different loops
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self._in_flight = 0
+        return self._condition
+
+    async def _acquire(self, tokens: int) -> None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(
+                lambda: self._in_flight < self.concurrency_limit
+            )
+            self._in_flight += 1
+        try:
+            while (delay := self._reserve(tokens)) > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            await self._release()
+            raise
+
+    async def _release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight = max(self._in_flight - 1, 0)
+            condition.notify_all()
+
+    def _reserve(self, tokens: int) -> float:
+        """
+        Take the budget of a request, or return how long to wait for it.
+        """
+        now = time.monotonic()
+        delay = self._paused_until - now
+        for bucket, amount in [
+            (self._request_bucket, 1),
+            (self._token_bucket, tokens),
+        ]:
+            if bucket is not None:
+                bucket.refill(now)
+                delay = max(delay, bucket.wait_time(amount))
+        if delay > 0:
+            return delay
+        if self._request_bucket is not None:
+            self._request_bucket.level -= 1
+        if self._token_bucket is not None:
+            self._token_bucket.level -= min(tokens, self._token_bucket.capacity)
+        return 0.0
@@ -7,11 +7,19 @@
 
 from .decorators import safe_call
 from .logger import setup_logging
-from .retry_mixin import RetryMixin
+from .retry_mixin import (
+    RetryMixin,
+    is_retryable_error,
+    is_rate_limit_error,
+    get_retry_after,
+)
 
 
 __all__ = [
     "safe_call",
     "setup_logging",
     "RetryMixin",
+    "is_retryable_error",
+    "is_rate_limit_error",
+    "get_retry_after",
 ]
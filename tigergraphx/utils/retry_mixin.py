@@ -5,12 +5,104 @@
 # Permission is granted to use, copy, modify, and distribute this software
 # under the License. The software is provided "AS IS", without warranty.
 
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from openai import APIConnectionError, APIStatusError
 from tenacity import (
     AsyncRetrying,
+    RetryCallState,
     stop_after_attempt,
     wait_exponential_jitter,
-    retry_if_exception_type,
+    retry_if_exception,
 )
+from tenacity.wait import wait_base
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Check whether a failed request may succeed when it is sent again.
+
+    Connection errors, timeouts, rate limits, conflicts and server errors are
+    retryable; other errors, e.g. invalid requests or authentication failures,
+    are not.
+
+    Args:
+        error: The exception raised by the request.
+
+    Returns:
+        True if the request should be retried.
+    """
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return isinstance(
+        error, (APIConnectionError, asyncio.TimeoutError, ConnectionError)
+    )
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Check whether a request failed because a rate limit was exceeded.
+
+    Args:
+        error: The exception raised by the request.
+
+    Returns:
+        True if the response status is 429.
+    """
+    return isinstance(error, APIStatusError) and error.status_code == 429
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Read the delay requested by the `retry-after-ms` or `retry-after` response
+    header of a failed request.
+
+    Args:
+        error: The exception raised by the request.
+
+    Returns:
+        The delay in seconds, or None if the response does not specify one.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is None:
+        return None
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms is not None:
+            return max(float(retry_after_ms) / 1000, 0.0)
+        retry_after = headers.get("retry-after")
+        if retry_after is None:
+            return None
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            # The header may also be an HTTP date
+            retry_at = parsedate_to_datetime(retry_after).timestamp()
+            return max(retry_at - time.time(), 0.0)
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class wait_retry_after(wait_base):
+    """
+    Wait for the delay requested by the server, falling back to another wait
+    strategy if the response does not specify one.
+    """
+
+    def __init__(self, fallback: wait_base):
+        self.fallback = fallback
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        outcome = retry_state.outcome
+        error = outcome.exception() if outcome is not None else None
+        retry_after = get_retry_after(error) if error is not None else None
+        if retry_after is not None:
+            return retry_after
+        return self.fallback(retry_state)
 
 
 class RetryMixin:
@@ -22,6 +114,9 @@ class RetryMixin:
         """
         Initialize the retry mechanism with exponential backoff and jitter.
 
+        Only retryable errors are retried, and the `Retry-After` header of the
+        response takes precedence over the backoff.
+
         Args:
             max_retries: Maximum number of retry attempts.
             max_wait: Maximum wait time between retries in seconds.
@@ -31,7 +126,7 @@ class RetryMixin:
         """
         return AsyncRetrying(
             stop=stop_after_attempt(max_retries),
-            wait=wait_exponential_jitter(max=max_wait),
+            wait=wait_retry_after(wait_exponential_jitter(max=max_wait)),
             reraise=True,
-            retry=retry_if_exception_type(Exception),
+            retry=retry_if_exception(is_retryable_error),
         )
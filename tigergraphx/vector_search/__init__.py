@@ -5,25 +5,30 @@
 # Permission is granted to use, copy, modify, and distribute this software
 # under the License. The software is provided "AS IS", without warranty.
 
-from .embedding import BaseEmbedding, OpenAIEmbedding
+from .embedding import BaseEmbedding, OpenAIEmbedding, CachedEmbedding
 from .vector_db import (
     BaseVectorDB,
     NanoVectorDBManager,
+    MmapVectorDBManager,
     TigerVectorManager,
 )
 from .search import (
     BaseSearchEngine,
     TigerVectorSearchEngine,
     NanoVectorDBSearchEngine,
+    MmapVectorDBSearchEngine,
 )
 
 __all__ = [
     "BaseEmbedding",
     "OpenAIEmbedding",
+    "CachedEmbedding",
     "BaseVectorDB",
     "TigerVectorManager",
     "NanoVectorDBManager",
+    "MmapVectorDBManager",
     "BaseSearchEngine",
     "TigerVectorSearchEngine",
     "NanoVectorDBSearchEngine",
+    "MmapVectorDBSearchEngine",
 ]
@@ -7,8 +7,10 @@
 
 from .base_embedding import BaseEmbedding
 from .openai_embedding import OpenAIEmbedding
+from .cached_embedding import CachedEmbedding
 
 __all__ = [
     "BaseEmbedding",
     "OpenAIEmbedding",
+    "CachedEmbedding",
 ]
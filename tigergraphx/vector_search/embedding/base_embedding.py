@@ -7,6 +7,8 @@
 
 from abc import ABC, abstractmethod
 from typing import List
+import asyncio
+import numpy as np
 
 from tigergraphx.config import BaseEmbeddingConfig
 
@@ -35,3 +37,28 @@ class BaseEmbedding(ABC):
             A list of floats representing the text embedding.
         """
         pass
+
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Asynchronously generate embeddings for many texts.
+
+        The default implementation generates the embeddings concurrently, one
+        request per text; subclasses that can embed many texts in one request
+        override it.
+
+        Args:
+            texts: Input texts to generate embeddings.
+
+        Returns:
+            A float32 matrix with the embedding of every text in its rows, in the
+            same order. The rows of texts that could not be embedded are NaN.
+        """
+        embeddings = await asyncio.gather(
+            *[self.generate_embedding(text) for text in texts]
+        )
+        dimension = max((len(embedding) for embedding in embeddings), default=0)
+        matrix = np.full((len(texts), dimension), np.nan, dtype=np.float32)
+        for i, embedding in enumerate(embeddings):
+            if len(embedding) == dimension:
+                matrix[i] = embedding
+        return matrix
@@ -0,0 +1,242 @@
+# Copyright 2025 TigerGraph Inc.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file or https://www.apache.org/licenses/LICENSE-2.0
+#
+# Permission is granted to use, copy, modify, and distribute this software
+# under the License. The software is provided "AS IS", without warranty.
+
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+
+from .base_embedding import BaseEmbedding
+
+_INDEX_FILE = "embeddings.sqlite"
+_VECTORS_FILE = "embeddings.f32"
+
+# Config fields that do not change the generated embeddings
+_NON_GENERATION_FIELDS = {
+    "max_retries",
+    "max_inputs_per_request",
+    "max_tokens_per_request",
+}
+
+
+class CachedEmbedding(BaseEmbedding):
+    """
+    Embedding model wrapper that caches embeddings by text and the config fields
+    of the embedding model that affect them, such as the model, the encoding and
+    the truncation length.
+
+    Embeddings are kept in an in-memory LRU cache, backed by an optional
+    on-disk store that survives restarts: an SQLite index from cache key to the
+    position of the embedding in a memory-mapped float32 file.
+    """
+
+    def __init__(
+        self,
+        embedding_model: BaseEmbedding,
+        cache_dir: Optional[str | Path] = None,
+        max_memory_items: int = 10000,
+    ):
+        """
+        Initialize the CachedEmbedding wrapper.
+
+        Args:
+            embedding_model: The embedding model whose embeddings are cached.
+            cache_dir: Directory of the on-disk store. If None, embeddings are
+                only cached in memory.
+            max_memory_items: Maximum number of embeddings in the in-memory cache.
+        """
+        super().__init__(embedding_model.config)
+        self.embedding_model = embedding_model
+        self.max_memory_items = max_memory_items
+        self._memory_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._key_prefix = json.dumps(
+            self.config.model_dump(exclude=_NON_GENERATION_FIELDS),
+            sort_keys=True,
+            default=str,
+        )
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        self._connection: Optional[sqlite3.Connection] = None
+        self._vectors_path: Optional[Path] = None
+        self._vectors: np.ndarray = np.empty(0, dtype=np.float32)
+        if cache_dir is not None:
+            cache_path = Path(cache_dir)
+            cache_path.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                cache_path / _INDEX_FILE, check_same_thread=False
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, offset INTEGER, dimension INTEGER)"
+            )
+            self._vectors_path = cache_path / _VECTORS_FILE
+            self._vectors_path.touch()
+
+    async def generate_embedding(self, text: str) -> List[float]:
+        """
+        Return the cached embedding of the text, generating it on a miss.
+
+        Args:
+            text: Input text to generate an embedding.
+
+        Returns:
+            A list of floats representing the text embedding.
+        """
+        key = self._cache_key(text)
+        embedding = self._lookup([key]).get(key)
+        if embedding is not None:
+            return embedding.tolist()
+        generated = await self.embedding_model.generate_embedding(text)
+        if len(generated) > 0:
+            self._store({key: np.asarray(generated, dtype=np.float32)})
+        return generated
+
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Return the cached embeddings of the texts, generating all misses with a
+        single call to the wrapped model.
+
+        Args:
+            texts: Input texts to generate embeddings.
+
+        Returns:
+            A float32 matrix with the embedding of every text in its rows, in the
+            same order. The rows of texts that could not be embedded are NaN.
+        """
+        keys = [self._cache_key(text) for text in texts]
+        cached = self._lookup(keys)
+        missing_texts = {
+            key: text for key, text in zip(keys, texts) if key not in cached
+        }
+        if missing_texts:
+            generated = await self.embedding_model.generate_embeddings(
+                list(missing_texts.values())
+            )
+            new_embeddings = {
+                key: embedding
+                for key, embedding in zip(missing_texts, generated)
+                if embedding.size > 0 and np.all(np.isfinite(embedding))
+            }
+            self._store(new_embeddings)
+            cached.update(new_embeddings)
+
+        dimension = max((len(embedding) for embedding in cached.values()), default=0)
+        embeddings = np.full((len(texts), dimension), np.nan, dtype=np.float32)
+        for i, key in enumerate(keys):
+            embedding = cached.get(key)
+            if embedding is not None and len(embedding) == dimension:
+                embeddings[i] = embedding
+        return embeddings
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups served from either cache tier."""
+        hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+        total = hits + self._stats["misses"]
+        return hits / total if total else 0.0
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Return the number of hits per cache tier, misses and the hit rate.
+        """
+        return {**self._stats, "hit_rate": self.hit_rate}
+
+    def close(self) -> None:
+        """Close the on-disk store."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _cache_key(self, text: str) -> str:
+        return hashlib.sha256(
+            f"{self._key_prefix}\0{text}".encode("utf-8")
+        ).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up the keys in memory first and then on disk, counting hits and
+        misses per key.
+        """
+        found: Dict[str, np.ndarray] = {}
+        disk_keys = []
+        for key in keys:
+            embedding = self._memory_cache.get(key)
+            if embedding is not None:
+                self._memory_cache.move_to_end(key)
+                found[key] = embedding
+                self._stats["memory_hits"] += 1
+            else:
+                disk_keys.append(key)
+
+        disk_embeddings = self._read_from_disk(list(dict.fromkeys(disk_keys)))
+        for key in disk_keys:
+            if key in disk_embeddings:
+                self._stats["disk_hits"] += 1
+            else:
+                self._stats["misses"] += 1
+        self._remember(disk_embeddings)
+        found.update(disk_embeddings)
+        return found
+
+    def _store(self, embeddings: Dict[str, np.ndarray]) -> None:
+        if not embeddings:
+            return
+        self._remember(embeddings)
+        if self._connection is None or self._vectors_path is None:
+            return
+        offset = self._vectors_path.stat().st_size // np.dtype(np.float32).itemsize
+        rows = []
+        with open(self._vectors_path, "ab") as f:
+            for key, embedding in embeddings.items():
+                f.write(np.ascontiguousarray(embedding, dtype=np.float32).tobytes())
+                rows.append((key, offset, len(embedding)))
+                offset += len(embedding)
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, offset, dimension) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def _remember(self, embeddings: Dict[str, np.ndarray]) -> None:
+        """
+        Add embeddings to the in-memory cache, evicting the least recently used.
+        """
+        for key, embedding in embeddings.items():
+            self._memory_cache[key] = embedding
+            self._memory_cache.move_to_end(key)
+        while len(self._memory_cache) > self.max_memory_items:
+            self._memory_cache.popitem(last=False)
+
+    def _read_from_disk(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys or self._connection is None or self._vectors_path is None:
+            return {}
+        rows = []
+        # Stay well below SQLite's limit on the number of query parameters
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            rows.extend(
+                self._connection.execute(
+                    "SELECT key, offset, dimension FROM embeddings "
+                    f"WHERE key IN ({', '.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+            )
+        if not rows:
+            return {}
+        size = self._vectors_path.stat().st_size // np.dtype(np.float32).itemsize
+        if len(self._vectors) != size:
+            self._vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(size,)
+            )
+        return {
+            key: np.array(self._vectors[offset : offset + dimension])
+            for key, offset, dimension in rows
+        }
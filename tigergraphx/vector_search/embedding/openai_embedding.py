@@ -6,7 +6,7 @@
 # under the License. The software is provided "AS IS", without warranty.
 
 import logging
-from typing import List, Dict, Tuple, Generator
+from typing import List, Dict, Optional, Tuple, Generator, Union
 from pathlib import Path
 import numpy as np
 import asyncio
@@ -21,6 +21,8 @@ from tigergraphx.utils import RetryMixin
 
 logger = logging.getLogger(__name__)
 
+EmbeddingInput = Union[str, List[int]]
+
 
 class OpenAIEmbedding(BaseEmbedding, RetryMixin):
     """OpenAI Embedding model wrapper with async embedding generation and robust retries."""
@@ -42,6 +44,7 @@ class OpenAIEmbedding(BaseEmbedding, RetryMixin):
         config = OpenAIEmbeddingConfig.ensure_config(config)
         super().__init__(config)
         self.llm = llm_manager.get_llm()
+        self.rate_limiter = llm_manager.get_rate_limiter()
         self.token_encoder = tiktoken.get_encoding(config.encoding_name)
         self.retryer = self.initialize_retryer(self.config.max_retries, max_wait=10)
 
@@ -55,9 +58,12 @@ class OpenAIEmbedding(BaseEmbedding, RetryMixin):
         Returns:
             The normalized embedding vector.
         """
-        token_chunks = list(self._tokenize(text))
+        token_chunks = self._tokenize(text)
         embedding_results = await asyncio.gather(
-            *[self._generate_with_retry(chunk) for chunk in token_chunks]
+            *[
+                self._generate_with_retry(self._to_input(chunk), len(chunk))
+                for chunk in token_chunks
+            ]
         )
 
         embeddings, lengths = (
@@ -73,34 +79,159 @@ class OpenAIEmbedding(BaseEmbedding, RetryMixin):
         normalized_embedding = combined_embedding / np.linalg.norm(combined_embedding)
         return normalized_embedding.tolist()
 
-    async def _generate_with_retry(self, text: str) -> Tuple[List[float], int]:
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for many texts with as few requests as possible.
+
+        The token chunks of all texts are packed into requests bounded by
+        `max_inputs_per_request` and `max_tokens_per_request`, which are sent
+        concurrently. All texts are tokenized at once with the multithreaded
+        batch encoder. The embedding of each text is the normalized,
+        token-count-weighted average of the embeddings of its chunks, as in
+        `generate_embedding`.
+
+        Args:
+            texts: The input texts to generate embeddings for.
+
+        Returns:
+            A float32 matrix with the normalized embedding of every text in its
+            rows, in the same order. The rows of texts that could not be
+            embedded, e.g. empty texts or texts whose requests failed, are NaN.
+        """
+        chunks: List[EmbeddingInput] = []
+        chunk_token_counts: List[int] = []
+        chunk_counts = np.zeros(len(texts), dtype=np.int64)
+        for i, tokens in enumerate(self.token_encoder.encode_batch(texts)):
+            for token_batch in self._batch_tokens(tokens):
+                chunks.append(self._to_input(token_batch))
+                chunk_token_counts.append(len(token_batch))
+                chunk_counts[i] += 1
+
+        requests = self._pack_requests(chunk_token_counts)
+        request_results = await asyncio.gather(
+            *[
+                self._generate_batch_with_retry(
+                    chunks[start:end], sum(chunk_token_counts[start:end])
+                )
+                for start, end in requests
+            ]
+        )
+        dimension = next(
+            (len(result[0]) for result in request_results if result), 0
+        )
+        if dimension == 0:
+            return np.full((len(texts), 0), np.nan, dtype=np.float32)
+
+        # Failed chunks get zero weight, so that a text is only missing if all
+        # of its chunks failed
+        chunk_embeddings = np.zeros((len(chunks), dimension), dtype=np.float32)
+        weights = np.zeros(len(chunks), dtype=np.float32)
+        for (start, end), result in zip(requests, request_results):
+            if result:
+                chunk_embeddings[start:end] = result
+                weights[start:end] = chunk_token_counts[start:end]
+
+        embeddings = np.full((len(texts), dimension), np.nan, dtype=np.float32)
+        has_chunks = chunk_counts > 0
+        if not has_chunks.any():
+            return embeddings
+        starts = (np.cumsum(chunk_counts) - chunk_counts)[has_chunks]
+        weighted_sums = np.add.reduceat(
+            chunk_embeddings * weights[:, np.newaxis], starts, axis=0
+        )
+        norms = np.linalg.norm(weighted_sums, axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            embeddings[has_chunks] = np.where(
+                norms > 0, weighted_sums / norms, np.nan
+            )
+        return embeddings
+
+    def _pack_requests(self, chunk_token_counts: List[int]) -> List[Tuple[int, int]]:
+        """
+        Split consecutive chunks into requests within the input and token limits.
+
+        Args:
+            chunk_token_counts: The number of tokens of every chunk.
+
+        Returns:
+            The start and end index of the chunks of every request.
+        """
+        requests = []
+        start = 0
+        request_tokens = 0
+        for i, token_count in enumerate(chunk_token_counts):
+            if i > start and (
+                i - start >= self.config.max_inputs_per_request
+                or request_tokens + token_count > self.config.max_tokens_per_request
+            ):
+                requests.append((start, i))
+                start = i
+                request_tokens = 0
+            request_tokens += token_count
+        if start < len(chunk_token_counts):
+            requests.append((start, len(chunk_token_counts)))
+        return requests
+
+    async def _generate_batch_with_retry(
+        self, inputs: List[EmbeddingInput], token_count: int
+    ) -> Optional[List[List[float]]]:
+        """
+        Fetch the embeddings of many inputs in one request with retry.
+
+        Args:
+            inputs: The chunks to generate embeddings for, as text or token IDs.
+            token_count: The total number of tokens of the inputs.
+
+        Returns:
+            The embedding of every input in order, or None on failure.
+        """
+        try:
+            async for attempt in self.retryer:
+                with attempt:
+                    async with self.rate_limiter.limit(token_count):
+                        response = await self.llm.embeddings.create(
+                            input=inputs,
+                            model=self.config.model,
+                        )
+                    data = sorted(response.data, key=lambda item: item.index)
+                    return [item.embedding for item in data]
+        except Exception as e:
+            logger.error(
+                f"Error in _generate_batch_with_retry for {len(inputs)} inputs | {e}"
+            )
+        return None
+
+    async def _generate_with_retry(
+        self, chunk: EmbeddingInput, token_count: int
+    ) -> Tuple[List[float], int]:
         """
         Fetch embedding for a chunk with retry, returning empty list on failure.
 
         Args:
-            text: Text chunk to generate embeddings for.
+            chunk: Chunk to generate embeddings for, as text or token IDs.
+            token_count: The number of tokens of the chunk.
 
         Returns:
-            The embedding vector and the length of the chunk.
+            The embedding vector and the number of tokens of the chunk.
         """
         try:
             async for attempt in self.retryer:
                 with attempt:
-                    embedding = (
-                        await self.llm.embeddings.create(
-                            input=text,
+                    async with self.rate_limiter.limit(token_count):
+                        response = await self.llm.embeddings.create(
+                            input=chunk,
                             model=self.config.model,
                         )
-                    ).data[0].embedding or []
-                    return embedding, len(text)
+                    embedding = response.data[0].embedding or []
+                    return embedding, token_count
         except RetryError as e:
             logger.error(
-                f"RetryError in _generate_with_retry for text chunk: {text[:50]}... | {e}"
+                f"RetryError in _generate_with_retry for chunk: {chunk[:50]}... | {e}"
             )
 
         return [], 0
 
-    def _tokenize(self, text: str) -> List[str]:
+    def _tokenize(self, text: str) -> List[List[int]]:
         """
         Tokenize text into chunks based on token length.
 
@@ -108,12 +239,24 @@ class OpenAIEmbedding(BaseEmbedding, RetryMixin):
             text: The input text to tokenize.
 
         Returns:
-            List of tokenized text chunks.
+            List of chunks of token IDs.
+        """
+        return list(self._batch_tokens(self.token_encoder.encode(text)))
+
+    def _to_input(self, tokens: List[int]) -> EmbeddingInput:
+        """
+        Convert a chunk of token IDs into an API input, decoding it to text
+        only if the API does not accept token IDs.
+
+        Args:
+            tokens: List of token IDs.
+
+        Returns:
+            The token IDs, or the decoded text.
         """
-        tokens = self.token_encoder.encode(text)
-        return [
-            self.token_encoder.decode(chunk) for chunk in self._batch_tokens(tokens)
-        ]
+        if self.config.send_token_ids:
+            return tokens
+        return self.token_encoder.decode(tokens)
 
     def _batch_tokens(self, tokens: List[int]) -> Generator[List[int], None, None]:
         """
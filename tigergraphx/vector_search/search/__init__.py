@@ -8,9 +8,11 @@
 from .base_search_engine import BaseSearchEngine
 from .tigervector_search_engine import TigerVectorSearchEngine
 from .nano_vectordb_search_engine import NanoVectorDBSearchEngine
+from .mmap_vectordb_search_engine import MmapVectorDBSearchEngine
 
 __all__ = [
     "BaseSearchEngine",
     "TigerVectorSearchEngine",
     "NanoVectorDBSearchEngine",
+    "MmapVectorDBSearchEngine",
 ]
@@ -7,6 +7,7 @@
 
 from abc import ABC
 from typing import Any, List
+import numpy as np
 
 from tigergraphx.vector_search import BaseVectorDB, BaseEmbedding
 
@@ -38,5 +39,35 @@ class BaseSearchEngine(ABC):
             A list of IDs corresponding to the search results.
         """
         embedding = await self.embedding_model.generate_embedding(text)
-        results = self.vector_db.query(query_embedding=embedding, k=k, **kwargs)
+        results = await self.vector_db.aquery(query_embedding=embedding, k=k, **kwargs)
+        return results
+
+    async def search_many(self, texts: List[str], k: int = 10) -> List[List[str]]:
+        """
+        Convert many texts to embeddings and search for all of them at once.
+
+        The texts are embedded with one batched embedding call and searched with
+        one batched vector database query.
+
+        Args:
+            texts: The input texts to search.
+            k: The number of top results to return per text.
+
+        Returns:
+            The IDs of the search results of every text, in the same order. Texts
+            that could not be embedded have no results.
+        """
+        if not texts:
+            return []
+        embeddings = await self.embedding_model.generate_embeddings(texts)
+        if embeddings.shape[1] == 0:
+            return [[] for _ in texts]
+        embedded_indices = np.flatnonzero(np.isfinite(embeddings).all(axis=1))
+        results: List[List[str]] = [[] for _ in texts]
+        if len(embedded_indices):
+            batch_results = await self.vector_db.aquery_batch(
+                embeddings[embedded_indices], k=k
+            )
+            for i, result in zip(embedded_indices, batch_results):
+                results[i] = result
         return results
@@ -6,7 +6,9 @@
 # under the License. The software is provided "AS IS", without warranty.
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, List
+import asyncio
+import numpy as np
 import pandas as pd
 
 from tigergraphx.config import BaseVectorDBConfig
@@ -51,3 +53,72 @@ class BaseVectorDB(ABC):
             List of result IDs.
         """
         pass
+
+    def query_batch(
+        self,
+        query_embeddings: List[List[float]] | np.ndarray,
+        k: int = 10,
+    ) -> List[List[str]]:
+        """
+        Perform a similarity search for many query vectors.
+
+        The default implementation queries one vector at a time; subclasses that
+        can search many vectors at once override it.
+
+        Args:
+            query_embeddings: The vectors to search with.
+            k: Number of nearest neighbors to return per query.
+
+        Returns:
+            The list of result IDs of every query.
+        """
+        return [
+            self.query(list(query_embedding), k=k)
+            for query_embedding in query_embeddings
+        ]
+
+    async def ainsert_data(self, data: pd.DataFrame) -> None:
+        """
+        Insert data into the vector database without blocking the event loop.
+
+        Args:
+            data: The data to insert.
+        """
+        await asyncio.to_thread(self.insert_data, data)
+
+    async def aquery(
+        self,
+        query_embedding: List[float],
+        k: int = 10,
+        **kwargs: Any,
+    ) -> List[str]:
+        """
+        Perform a similarity search without blocking the event loop.
+
+        Args:
+            query_embedding: The vector to search with.
+            k: Number of nearest neighbors to return.
+            **kwargs: Additional arguments for `query`.
+
+        Returns:
+            List of result IDs.
+        """
+        return await asyncio.to_thread(self.query, query_embedding, k, **kwargs)
+
+    async def aquery_batch(
+        self,
+        query_embeddings: List[List[float]] | np.ndarray,
+        k: int = 10,
+    ) -> List[List[str]]:
+        """
+        Perform a similarity search for many query vectors without blocking the
+        event loop.
+
+        Args:
+            query_embeddings: The vectors to search with.
+            k: Number of nearest neighbors to return per query.
+
+        Returns:
+            The list of result IDs of every query.
+        """
+        return await asyncio.to_thread(self.query_batch, query_embeddings, k)
@@ -0,0 +1,496 @@
+# Copyright 2025 TigerGraph Inc.
+# Licensed under the Apache License, Version 2.0.
+# See the LICENSE file or https://www.apache.org/licenses/LICENSE-2.0
+#
+# Permission is granted to use, copy, modify, and distribute this software
+# under the License. The software is provided "AS IS", without warranty.
+
+"""
+Vector database backed by memory-mapped files.
+
+Every row is stored across flat, append-only files in the storage directory:
+
+- `vectors.f32`: the float32 vectors, `embedding_dim` values per row.
+- `ids.bin` and `id_offsets.i64`: the UTF-8 encoded IDs and the end offset of
+  each of them.
+- `id_hashes.u64`: a 64-bit hash of each ID, used to find replaced rows.
+- `live.u8`: 0 for rows that were replaced by a later insert, 1 otherwise.
+- `ivf_centroids.npy` and `ivf_assignments.i32`: the k-means centroids of the
+  optional IVF index and the partition of each row.
+
+The offsets file is written last, so its length is the number of committed
+rows. The files are only read through read-only memory maps, which lets any
+number of processes share the same pages of the operating system's cache.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from .base_vector_db import BaseVectorDB
+
+from tigergraphx.config import MmapVectorDBConfig
+
+_VECTORS_FILE = "vectors.f32"
+_IDS_FILE = "ids.bin"
+_ID_OFFSETS_FILE = "id_offsets.i64"
+_ID_HASHES_FILE = "id_hashes.u64"
+_LIVE_FILE = "live.u8"
+_CENTROIDS_FILE = "ivf_centroids.npy"
+_ASSIGNMENTS_FILE = "ivf_assignments.i32"
+_METADATA_FILE = "metadata.json"
+
+# Minimum number of vectors per partition before the IVF index is trained
+# automatically, below which k-means produces poorly balanced partitions
+_MIN_VECTORS_PER_PARTITION = 39
+
+_KMEANS_ITERATIONS = 20
+
+
+class MmapVectorDBManager(BaseVectorDB):
+    """
+    A vector database that keeps float32 vectors in memory-mapped files, with an
+    optional IVF index for searching tens of millions of vectors.
+
+    Inserts are appended to the files, and rows with an existing ID replace the
+    old ones. Only one process may insert at a time, while any number of
+    processes can search the same storage directory; call `refresh` to pick up
+    rows appended by another process.
+    """
+
+    config: MmapVectorDBConfig
+
+    def __init__(self, config: MmapVectorDBConfig | Dict | str | Path):
+        """
+        Initialize the MmapVectorDBManager.
+
+        Args:
+            config: Configuration for the memory-mapped vector database, given as a
+                config object, dictionary, string, or path to a configuration file.
+
+        Raises:
+            ValueError: If the storage directory was created with a different
+                embedding dimension or metric.
+        """
+        config = MmapVectorDBConfig.ensure_config(config)
+        super().__init__(config)
+        self._storage_dir = Path(config.storage_dir)
+        self._storage_dir.mkdir(parents=True, exist_ok=True)
+        self._check_metadata()
+        self._inverted_lists: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.refresh()
+
+    def __len__(self) -> int:
+        """Return the number of live vectors."""
+        return int(np.count_nonzero(self._live))
+
+    def refresh(self) -> None:
+        """
+        Re-map the storage files, picking up rows appended by other processes.
+
+        The files are only mapped, never written, so that readers do not race
+        with the process inserting into the same storage directory.
+        """
+        id_offsets_path = self._storage_dir / _ID_OFFSETS_FILE
+        count = (
+            id_offsets_path.stat().st_size // np.dtype(np.int64).itemsize
+            if id_offsets_path.exists()
+            else 0
+        )
+        self._count = count
+        self._id_offsets = self._map(_ID_OFFSETS_FILE, np.int64, (count,))
+        self._ids = self._map(
+            _IDS_FILE, np.uint8, (int(self._id_offsets[-1]) if count else 0,)
+        )
+        self._vectors = self._map(
+            _VECTORS_FILE, np.float32, (count, self.config.embedding_dim)
+        )
+        self._id_hashes = self._map(_ID_HASHES_FILE, np.uint64, (count,))
+        self._live = self._map(_LIVE_FILE, np.uint8, (count,))
+        self._inverted_lists = None
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments: Optional[np.ndarray] = None
+        centroids_path = self._storage_dir / _CENTROIDS_FILE
+        if self.config.index_type == "ivf" and centroids_path.exists():
+            self._centroids = np.load(centroids_path)
+            num_assigned = min(self._num_assigned(), count)
+            self._assignments = self._map(_ASSIGNMENTS_FILE, np.int32, (num_assigned,))
+            # Rows appended while the index was not in use have no partition in
+            # the file yet. They are assigned in memory until the next insert
+            # writes their partitions.
+            if num_assigned < count:
+                self._assignments = np.concatenate(
+                    [
+                        self._assignments,
+                        self._assign(self._vectors[num_assigned:], self._centroids),
+                    ]
+                )
+
+    def insert_data(self, data: pd.DataFrame) -> None:
+        """
+        Append data to the vector database, replacing rows with the same IDs.
+
+        Columns other than `__id__` and `__vector__` are not stored.
+
+        Args:
+            data: DataFrame with the columns `__id__` and `__vector__`.
+
+        Raises:
+            ValueError: If the vectors have the wrong dimension or contain
+                non-finite values.
+        """
+        if len(data) == 0:
+            return
+        data = data.drop_duplicates(subset="__id__", keep="last")
+        ids = data["__id__"].astype(str)
+        vectors = np.stack(data["__vector__"].to_numpy()).astype(np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.config.embedding_dim:
+            raise ValueError(
+                f"Expected vectors of dimension {self.config.embedding_dim}, "
+                f"but got an array of shape {vectors.shape}."
+            )
+        if not np.all(np.isfinite(vectors)):
+            raise ValueError("Vectors must not contain non-finite values.")
+        if self.config.metric == "cosine":
+            vectors = self._normalize(vectors)
+        id_hashes = pd.util.hash_pandas_object(ids, index=False).to_numpy(np.uint64)
+
+        # Discard anything left behind by an interrupted insert
+        count = self._count
+        self._truncate(count)
+        self._remove_existing(ids, id_hashes)
+
+        encoded_ids = [node_id.encode("utf-8") for node_id in ids]
+        start = int(self._id_offsets[-1]) if count else 0
+        id_offsets = start + np.cumsum(
+            [len(encoded_id) for encoded_id in encoded_ids], dtype=np.int64
+        )
+        self._append(_VECTORS_FILE, vectors)
+        self._append(_IDS_FILE, np.frombuffer(b"".join(encoded_ids), dtype=np.uint8))
+        self._append(_ID_HASHES_FILE, id_hashes)
+        self._append(_LIVE_FILE, np.ones(len(ids), dtype=np.uint8))
+        if self._centroids is not None:
+            assert self._assignments is not None
+            num_assigned = min(self._num_assigned(), count)
+            self._append(
+                _ASSIGNMENTS_FILE,
+                np.concatenate(
+                    [
+                        self._assignments[num_assigned:count],
+                        self._assign(vectors, self._centroids),
+                    ]
+                ),
+                truncate_to=num_assigned,
+            )
+        # Appending the offsets commits the rows
+        self._append(_ID_OFFSETS_FILE, id_offsets)
+        self.refresh()
+
+        if (
+            self.config.index_type == "ivf"
+            and self._centroids is None
+            and len(self) >= _MIN_VECTORS_PER_PARTITION * self.config.nlist
+        ):
+            self.build_index()
+
+    def build_index(self) -> None:
+        """
+        Train the IVF index with k-means on a sample of the live vectors and
+        assign every row to its nearest partition.
+
+        Until the index is trained, searches scan all vectors. It is trained
+        automatically once there are enough vectors per partition, but it can
+        also be trained or retrained explicitly.
+
+        Raises:
+            ValueError: If there are fewer live vectors than partitions.
+        """
+        live_rows = np.flatnonzero(self._live)
+        if len(live_rows) < self.config.nlist:
+            raise ValueError(
+                f"Training an IVF index with {self.config.nlist} partitions requires "
+                f"at least as many vectors, but only {len(live_rows)} are stored."
+            )
+        rng = np.random.default_rng(0)
+        sample_rows = np.sort(
+            rng.choice(
+                live_rows,
+                size=min(self.config.train_size, len(live_rows)),
+                replace=False,
+            )
+        )
+        centroids = self._kmeans(np.asarray(self._vectors[sample_rows]), rng)
+        assignments = self._assign(self._vectors, centroids)
+
+        # Write both files to temporary paths first, so that readers never see
+        # centroids that do not match the assignments
+        for name, write in [
+            (_ASSIGNMENTS_FILE, lambda path: assignments.tofile(path)),
+            (_CENTROIDS_FILE, lambda path: np.save(path, centroids)),
+        ]:
+            path = self._storage_dir / name
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        self.refresh()
+
+    def query(
+        self,
+        query_embedding: List[float],
+        k: int = 10,
+    ) -> List[str]:
+        """
+        Perform a similarity search and return the result IDs.
+
+        Args:
+            query_embedding: Embedding vector for search.
+            k: Number of top results to retrieve.
+
+        Returns:
+            List of IDs from the search results, most similar first.
+        """
+        return self.query_batch([query_embedding], k=k)[0]
+
+    def query_batch(
+        self,
+        query_embeddings: List[List[float]] | np.ndarray,
+        k: int = 10,
+    ) -> List[List[str]]:
+        """
+        Perform a similarity search for many query vectors at once.
+
+        Args:
+            query_embeddings: Embedding vectors for search.
+            k: Number of top results to retrieve per query.
+
+        Returns:
+            The list of result IDs of every query, most similar first.
+
+        Raises:
+            ValueError: If the query vectors have the wrong dimension.
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.size == 0:
+            return []
+        if queries.ndim != 2 or queries.shape[1] != self.config.embedding_dim:
+            raise ValueError(
+                f"Expected query vectors of dimension {self.config.embedding_dim}, "
+                f"but got an array of shape {queries.shape}."
+            )
+        if self._count == 0 or k <= 0:
+            return [[] for _ in range(len(queries))]
+        if self.config.metric == "cosine":
+            queries = self._normalize(queries)
+
+        if self._centroids is not None:
+            result_rows = self._search_ivf(queries, k)
+        else:
+            result_rows = self._search_flat(queries, k)
+        return [[self._decode_id(row) for row in rows] for rows in result_rows]
+
+    def _search_flat(self, queries: np.ndarray, k: int) -> List[np.ndarray]:
+        """
+        Score all vectors block by block, keeping the running top-k of each query.
+        """
+        num_queries = len(queries)
+        best_scores = np.full((num_queries, 0), -np.inf, dtype=np.float32)
+        best_rows = np.empty((num_queries, 0), dtype=np.int64)
+        for start in range(0, self._count, self.config.block_size):
+            end = min(start + self.config.block_size, self._count)
+            scores = queries @ np.asarray(self._vectors[start:end]).T
+            scores[:, self._live[start:end] == 0] = -np.inf
+            candidate_scores = np.concatenate([best_scores, scores], axis=1)
+            candidate_rows = np.concatenate(
+                [
+                    best_rows,
+                    np.broadcast_to(np.arange(start, end), (num_queries, end - start)),
+                ],
+                axis=1,
+            )
+            top = self._top_k(candidate_scores, k)
+            best_scores = np.take_along_axis(candidate_scores, top, axis=1)
+            best_rows = np.take_along_axis(candidate_rows, top, axis=1)
+        return [
+            rows[np.isfinite(scores)] for rows, scores in zip(best_rows, best_scores)
+        ]
+
+    def _search_ivf(self, queries: np.ndarray, k: int) -> List[np.ndarray]:
+        """
+        Score only the vectors in the `nprobe` partitions nearest to each query.
+        """
+        assert self._centroids is not None
+        order, offsets = self._get_inverted_lists()
+        probes = self._top_k(queries @ self._centroids.T, self.config.nprobe)
+        result_rows = []
+        for query, query_probes in zip(queries, probes):
+            rows = np.sort(
+                np.concatenate(
+                    [order[offsets[probe] : offsets[probe + 1]] for probe in query_probes]
+                )
+            )
+            rows = rows[self._live[rows] == 1]
+            if len(rows) == 0:
+                result_rows.append(rows)
+                continue
+            scores = np.asarray(self._vectors[rows]) @ query
+            result_rows.append(rows[self._top_k(scores[np.newaxis, :], k)[0]])
+        return result_rows
+
+    def _get_inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the rows sorted by partition and the start offset of each partition.
+        """
+        if self._inverted_lists is None:
+            assert self._centroids is not None and self._assignments is not None
+            assignments = np.asarray(self._assignments)
+            order = np.argsort(assignments, kind="stable")
+            counts = np.bincount(assignments, minlength=len(self._centroids))
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            self._inverted_lists = (order, offsets)
+        return self._inverted_lists
+
+    def _kmeans(self, sample: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Cluster the sample into `nlist` partitions. With the cosine metric the
+        centroids are normalized, i.e. this is spherical k-means.
+        """
+        centroids = sample[
+            rng.choice(len(sample), size=self.config.nlist, replace=False)
+        ].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            labels = self._assign(sample, centroids)
+            order = np.argsort(labels, kind="stable")
+            sorted_labels = labels[order]
+            starts = np.flatnonzero(
+                np.concatenate([[True], sorted_labels[1:] != sorted_labels[:-1]])
+            )
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            counts = np.diff(np.concatenate([starts, [len(sample)]]))
+            # Empty partitions keep their previous centroid
+            centroids[sorted_labels[starts]] = sums / counts[:, np.newaxis]
+            if self.config.metric == "cosine":
+                centroids = self._normalize(centroids)
+        return centroids
+
+    def _assign(self, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """
+        Return the index of the most similar centroid of every vector.
+        """
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), self.config.block_size):
+            block = np.asarray(vectors[start : start + self.config.block_size])
+            assignments[start : start + len(block)] = np.argmax(
+                block @ centroids.T, axis=1
+            )
+        return assignments
+
+    def _remove_existing(self, ids: pd.Series, id_hashes: np.ndarray) -> None:
+        """
+        Mark the live rows with any of the given IDs as replaced.
+        """
+        if self._count == 0:
+            return
+        candidate_rows = np.flatnonzero(
+            np.isin(self._id_hashes, id_hashes) & (self._live == 1)
+        )
+        # Compare the IDs themselves, in case of hash collisions
+        new_ids = set(ids)
+        stale_rows = [row for row in candidate_rows if self._decode_id(row) in new_ids]
+        if not stale_rows:
+            return
+        live = np.memmap(
+            self._storage_dir / _LIVE_FILE, dtype=np.uint8, mode="r+", shape=(self._count,)
+        )
+        live[stale_rows] = 0
+        live.flush()
+        del live
+
+    def _num_assigned(self) -> int:
+        """
+        Return the number of rows whose partition is stored in the assignments
+        file.
+        """
+        path = self._storage_dir / _ASSIGNMENTS_FILE
+        if not path.exists():
+            return 0
+        return path.stat().st_size // np.dtype(np.int32).itemsize
+
+    def _decode_id(self, row: int) -> str:
+        start = int(self._id_offsets[row - 1]) if row > 0 else 0
+        return bytes(self._ids[start : int(self._id_offsets[row])]).decode("utf-8")
+
+    def _check_metadata(self) -> None:
+        """
+        Make sure the storage directory matches the configuration, recording the
+        configuration on first use.
+        """
+        metadata = {
+            "embedding_dim": self.config.embedding_dim,
+            "metric": self.config.metric,
+        }
+        path = self._storage_dir / _METADATA_FILE
+        if not path.exists():
+            path.write_text(json.dumps(metadata))
+            return
+        stored_metadata = json.loads(path.read_text())
+        if stored_metadata != metadata:
+            raise ValueError(
+                f"Storage directory {self._storage_dir} was created with "
+                f"{stored_metadata}, which does not match {metadata}."
+            )
+
+    def _map(self, name: str, dtype: type, shape: Tuple[int, ...]) -> np.ndarray:
+        if shape[0] == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self._storage_dir / name, dtype=dtype, mode="r", shape=shape)
+
+    def _append(
+        self, name: str, array: np.ndarray, truncate_to: Optional[int] = None
+    ) -> None:
+        path = self._storage_dir / name
+        with open(path, "ab") as f:
+            if truncate_to is not None:
+                f.truncate(truncate_to * array.dtype.itemsize)
+            f.write(np.ascontiguousarray(array).tobytes())
+
+    def _truncate(self, count: int) -> None:
+        """
+        Truncate every file to the given number of committed rows.
+        """
+        row_sizes = {
+            _VECTORS_FILE: 4 * self.config.embedding_dim,
+            _ID_HASHES_FILE: 8,
+            _LIVE_FILE: 1,
+        }
+        if self._centroids is not None:
+            row_sizes[_ASSIGNMENTS_FILE] = 4
+        sizes = {name: count * row_size for name, row_size in row_sizes.items()}
+        sizes[_IDS_FILE] = int(self._id_offsets[-1]) if count else 0
+        for name, size in sizes.items():
+            path = self._storage_dir / name
+            if path.exists() and path.stat().st_size > size:
+                os.truncate(path, size)
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Return the column indices of the k highest scores of every row, highest
+        first.
+        """
+        k = min(k, scores.shape[1])
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind="stable")
+        return np.take_along_axis(top, order, axis=1)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
@@ -5,7 +5,7 @@
 # Permission is granted to use, copy, modify, and distribute this software
 # under the License. The software is provided "AS IS", without warranty.
 
-from typing import List
+from typing import Any, Dict, List, Optional
 import pandas as pd
 import numpy as np
 from nano_vectordb import NanoVectorDB
@@ -14,6 +14,9 @@ from .base_vector_db import BaseVectorDB
 
 from tigergraphx.config import NanoVectorDBConfig
 
+# Upper bound on the number of similarity scores computed at once by query_batch
+_MAX_SCORES_PER_CHUNK = 1 << 24
+
 
 class NanoVectorDBManager(BaseVectorDB):
     """A wrapper class for NanoVectorDB that implements BaseVectorDB."""
@@ -37,20 +40,31 @@ class NanoVectorDBManager(BaseVectorDB):
 
     def insert_data(self, data: pd.DataFrame) -> None:
         """
-        Insert data into NanoVectorDB.
+        Insert data into NanoVectorDB, replacing records with the same IDs.
+
+        The vectors are stacked into a single matrix to validate their dimension,
+        and all records go through a single call to NanoVectorDB's upsert, which
+        normalizes them for the cosine metric.
 
         Args:
             data: DataFrame with data to insert.
-        """
-        records = []
-        for _, row in data.iterrows():
-            record = {"__id__": row["__id__"], "__vector__": row["__vector__"]}
-            for col in data.columns:
-                if col not in ["__id__", "__vector__"]:
-                    record[col] = row[col]
-            records.append(record)
 
-        self._db.upsert(records)
+        Raises:
+            ValueError: If the vectors do not match the embedding dimension.
+        """
+        if len(data) == 0:
+            return
+        data = data.drop_duplicates(subset="__id__", keep="last")
+        vectors = np.stack(data["__vector__"].to_numpy()).astype(np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.config.embedding_dim:
+            raise ValueError(
+                f"Expected vectors of dimension {self.config.embedding_dim}, "
+                f"but got an array of shape {vectors.shape}."
+            )
+        records = data.drop(columns="__vector__").to_dict(orient="records")
+        for record, vector in zip(records, vectors):
+            record["__vector__"] = vector
+        self._db.upsert(datas=records)
 
     def query(
         self,
@@ -69,3 +83,76 @@ class NanoVectorDBManager(BaseVectorDB):
         """
         results = self._db.query(query=np.array(query_embedding), top_k=k)
         return [result["__id__"] for result in results]
+
+    def query_batch(
+        self,
+        query_embeddings: List[List[float]] | np.ndarray,
+        k: int = 10,
+    ) -> List[List[str]]:
+        """
+        Perform a similarity search for many query vectors at once.
+
+        All queries are scored with one matrix product, split into chunks of
+        queries to bound memory use, and the top-k of each query is selected
+        with `argpartition`. If the vector matrix of NanoVectorDB cannot be
+        read, the queries are run one by one.
+
+        Args:
+            query_embeddings: Embedding vectors for search.
+            k: Number of top results to retrieve per query.
+
+        Returns:
+            The list of result IDs of every query, most similar first.
+
+        Raises:
+            ValueError: If the query vectors do not match the embedding dimension.
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.size == 0:
+            return []
+        if queries.ndim != 2 or queries.shape[1] != self.config.embedding_dim:
+            raise ValueError(
+                f"Expected query vectors of dimension {self.config.embedding_dim}, "
+                f"but got an array of shape {queries.shape}."
+            )
+        storage = self._storage
+        if storage is None:
+            return [self.query(query.tolist(), k) for query in queries]
+        matrix = storage["matrix"]
+        k = min(k, len(matrix))
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+        if self._db.metric == "cosine":
+            queries = self._normalize(queries)
+
+        results: List[List[str]] = []
+        chunk_size = max(1, _MAX_SCORES_PER_CHUNK // len(matrix))
+        for start in range(0, len(queries), chunk_size):
+            scores = queries[start : start + chunk_size] @ matrix.T
+            if k < scores.shape[1]:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            results.extend(
+                [storage["data"][row]["__id__"] for row in rows] for rows in top
+            )
+        return results
+
+    @property
+    def _storage(self) -> Optional[Dict[str, Any]]:
+        """
+        The records and the vector matrix of NanoVectorDB, which it keeps in a
+        private attribute. It is only read, and is None if another version of
+        NanoVectorDB stores them differently.
+        """
+        storage = getattr(self._db, "_NanoVectorDB__storage", None)
+        if not isinstance(storage, dict) or not {"data", "matrix"} <= storage.keys():
+            return None
+        return storage
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
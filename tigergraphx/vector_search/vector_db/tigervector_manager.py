@@ -8,11 +8,12 @@
 from typing import Dict, List
 from pathlib import Path
 import logging
+import numpy as np
 import pandas as pd
 
 from .base_vector_db import BaseVectorDB
 
-from tigergraphx.config import TigerVectorConfig
+from tigergraphx.config import TigerVectorConfig, ExpansionSpec
 from tigergraphx.core import Graph
 
 logger = logging.getLogger(__name__)
@@ -43,20 +44,14 @@ class TigerVectorManager(BaseVectorDB):
         Args:
             data: DataFrame containing data to be inserted.
         """
-        nodes_for_adding = []
-        for _, row in data.iterrows():
-            # Create a dictionary for node attributes
-            node_attributes = {
-                self.config.vector_attribute_name: row["__vector__"],
-            }
-
-            # Add the node ID as the first element in the tuple
-            nodes_for_adding.append((row["__id__"], node_attributes))
-
-        # Call the add_nodes_from method to add nodes to the graph
-        if len(nodes_for_adding) > 0:
-            self._graph.add_nodes_from(
-                nodes_for_adding=nodes_for_adding, node_type=self.config.node_type
+        if len(data) > 0:
+            self._graph.add_nodes_from_dataframe(
+                data,
+                node_type=self.config.node_type,
+                id_column="__id__",
+                attribute_column_mappings={
+                    self.config.vector_attribute_name: "__vector__"
+                },
             )
 
     def query(self, query_embedding: List[float], k: int = 10) -> List[str]:
@@ -80,3 +75,54 @@ class TigerVectorManager(BaseVectorDB):
 
         # Extract the node ids
         return [result["id"] for result in search_results]
+
+    def query_batch(
+        self,
+        query_embeddings: List[List[float]] | np.ndarray,
+        k: int = 10,
+    ) -> List[List[str]]:
+        """
+        Perform k-NN search for many query embeddings in a single request.
+
+        Args:
+            query_embeddings: The query embedding vectors.
+            k: The number of nearest neighbors to return per query.
+
+        Returns:
+            The list of identifiers of every query's search results.
+        """
+        if len(query_embeddings) == 0:
+            return []
+        search_results = self._graph.search_batch(
+            data=query_embeddings,
+            vector_attribute_name=self.config.vector_attribute_name,
+            node_type=self.config.node_type,
+            limit=k,
+        )
+        return [[result["id"] for result in results] for results in search_results]
+
+    def query_and_expand(
+        self,
+        query_embedding: List[float],
+        expansions: List[ExpansionSpec | Dict],
+        k: int = 10,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Perform k-NN search and expand the neighborhoods of the results in one query.
+
+        Args:
+            query_embedding: The query embedding vector.
+            expansions: The neighborhoods to expand from the search results.
+            k: The number of nearest neighbors to expand from.
+
+        Returns:
+            The search results under the key "seeds" and the nodes of every
+            expansion under its name.
+        """
+        return self._graph.search_and_expand(
+            data=query_embedding,
+            vector_attribute_name=self.config.vector_attribute_name,
+            expansions=expansions,
+            node_type=self.config.node_type,
+            limit=k,
+        )